@@ -1,6 +1,7 @@
 import requests
 import os
-import base64
+from ai.utils.concurrency import provider_slot
+from ai.llms.image_cache import ImageGenerationError, cached_image
 
 HF_API_KEY = os.getenv("HF_API_KEY")  # free key from huggingface
 
@@ -23,16 +24,24 @@ class ImageAgent:
             "options": {"wait_for_model": True}
         }
 
-        response = requests.post(url, headers=headers, json=payload)
-
-        if response.status_code != 200:
-            return {"error": response.text}
-
-        # HF returns raw bytes of image
-        image_bytes = response.content  
-        base64_img = base64.b64encode(image_bytes).decode("utf-8")
+        def fetch():
+            with provider_slot("huggingface"):
+                response = requests.post(url, headers=headers, json=payload)
+            if response.status_code != 200:
+                raise ImageGenerationError(response.text)
+            return response.content
+
+        # HF returns raw bytes of image; they are kept on disk and only the
+        # URL goes in the slide JSON. Identical prompts (e.g. regenerating a
+        # deck) reuse the image stored the first time.
+        try:
+            stored = cached_image(model_id, prompt, payload["options"], fetch)
+        except ImageGenerationError as e:
+            return {"error": str(e)}
 
         return {
-            "image_base64": base64_img,
+            "image_url": stored["url"],
+            "thumbnail_url": stored["thumbnail_url"],
+            "sha256": stored["sha256"],
             "model": model_id
         }
@@ -61,13 +61,19 @@
 #         }
 
 
+import asyncio
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from ai.agents.planner import PlannerAgent
 from ai.agents.research import ResearcherAgent
 from ai.agents.writer import WriterAgent
 from ai.agents.slide_designer import DesignerAgent
 from ai.agents.image_generator import ImageAgent
+from ai.utils.concurrency import provider_slot
+from ai.utils.task_graph import TaskGraph
 from app.services.rag_services import RAGService
+from app.core.config import settings
+from app.core.logger import logger
 
 
 class SlideOrchestrator:
@@ -93,28 +99,15 @@ class SlideOrchestrator:
             return str(value)
         return str(value)
 
-    def generate_presentation(self, topic, document_id=None, style="corporate", detail="medium"):
-
-        # -----------------------------
-        # 1) SAFE OUTLINE GENERATION
-        # -----------------------------
-        try:
-            if document_id:
-                doc_hits = self.rag.query_document(document_id, topic, top_k=8)
-                doc_texts = [h.get("text", "") for h in doc_hits if h]
-                context_doc = "\n\n".join(doc_texts)
-
-                outline = self.planner.plan_from_document(
-                    context=context_doc,
-                    detail=detail,
-                    num_slides=2
-                )
-            else:
-                outline = self.planner.plan(topic, detail, 2)
-
-        except Exception:
-            outline = {"slides": []}
+    # -----------------------------
+    # OUTLINE
+    # -----------------------------
+    def _document_context(self, document_id, topic):
+        doc_hits = self.rag.query_document(document_id, topic, top_k=8)
+        doc_texts = [h.get("text", "") for h in doc_hits if h]
+        return "\n\n".join(doc_texts)
 
+    def _outline_slides(self, topic, outline):
         # Hard fallback
         slides_list = outline.get("slides") if isinstance(outline, dict) else None
         if not slides_list:
@@ -123,60 +116,346 @@ class SlideOrchestrator:
                 {"title": f"{topic} - Concepts", "points": ["Concept 1", "Concept 2"]},
                 {"title": f"{topic} - Summary", "points": ["Takeaways"]},
             ]
+        return [s for s in slides_list if isinstance(s, dict)]
 
-        slides_output = []
-
-        # -----------------------------
-        # 2) PROCESS EACH SLIDE SAFELY
-        # -----------------------------
-        for raw_slide in slides_list:
-            if not isinstance(raw_slide, dict):
-                continue
+    def create_outline(self, topic, document_id=None, detail="medium"):
+        try:
+            if document_id:
+                return self.planner.plan_from_document(
+                    context=self._document_context(document_id, topic),
+                    detail=detail,
+                    num_slides=2
+                )
+            return self.planner.plan(topic, detail, 2)
+        except Exception:
+            return {"slides": []}
 
-            title = raw_slide.get("title") or "Untitled Slide"
-            subtopics = self.safe_list(raw_slide.get("points"))
+    async def acreate_outline(self, topic, document_id=None, detail="medium"):
+        try:
+            if document_id:
+                context = await asyncio.to_thread(self._document_context, document_id, topic)
+                return await self.planner.aplan_from_document(
+                    context=context,
+                    detail=detail,
+                    num_slides=2
+                )
+            return await self.planner.aplan(topic, detail, 2)
+        except Exception:
+            return {"slides": []}
 
-            # -------- RAG SAFE --------
+    # -----------------------------
+    # PER-SLIDE PIPELINE
+    # -----------------------------
+    def _rag_context(self, title):
+        with provider_slot("rag"):
             rag_hits = self.rag.query_global(title, top_k=5)
-            rag_context = "\n\n".join([h.get("text", "") for h in rag_hits if h])
-
-            # -------- Research SAFE --------
-            agent_research = self.safe_text(self.researcher.research(title, subtopics))
+        return "\n\n".join([h.get("text", "") for h in rag_hits if h])
 
-            final_context = rag_context + "\n\n" + agent_research
-
-            # -------- Writer SAFE --------
-            raw_content = self.writer.write_slide(title, final_context)
-            if not isinstance(raw_content, dict):
-                raw_content = {"title": title, "bullets": subtopics, "notes": ""}
+    def _rag_contexts(self, slides):
+        """RAG context for every outline slide: one embedding batch and one index query."""
+        titles = [self._slide_inputs(s)[0] for s in slides]
+        if not titles:
+            return []
+        with provider_slot("rag"):
+            all_hits = self.rag.query_global_many(titles, top_k=5)
+        return ["\n\n".join([h.get("text", "") for h in hits if h]) for hits in all_hits]
 
-            content = {
-                "title": raw_content.get("title", title),
-                "bullets": self.safe_list(raw_content.get("bullets")),
-                "notes": self.safe_text(raw_content.get("notes")),
-            }
+    def _normalize_content(self, raw_content, title, subtopics):
+        if not isinstance(raw_content, dict):
+            raw_content = {"title": title, "bullets": subtopics, "notes": ""}
 
-            # -------- Designer SAFE --------
-            design = self.designer.apply_design(content, style)
-            if not isinstance(design, dict):
-                design = {"layout": "title_and_body", "theme": style}
+        return {
+            "title": raw_content.get("title", title),
+            "bullets": self.safe_list(raw_content.get("bullets")),
+            "notes": self.safe_text(raw_content.get("notes")),
+        }
 
-            # -------- Image SAFE --------
+    def _normalize_design(self, design, style):
+        if not isinstance(design, dict):
+            design = {"layout": "title_and_body", "theme": style}
+        return design
+
+    def _slide_inputs(self, raw_slide: dict):
+        return raw_slide.get("title") or "Untitled Slide", self.safe_list(raw_slide.get("points"))
+
+    def _add_context_nodes(self, graph: TaskGraph, raw_slide: dict, use_async: bool = False, rag_context: str = None):
+        """rag + research -> context; `rag_context` skips the per-slide retrieval when prefetched."""
+        title, subtopics = self._slide_inputs(raw_slide)
+
+        if use_async:
+            async def research_step():
+                return self.safe_text(await self.researcher.aresearch(title, subtopics))
+        else:
+            def research_step():
+                return self.safe_text(self.researcher.research(title, subtopics))
+
+        return (
+            graph
+            .add("rag", (lambda: rag_context) if rag_context is not None else (lambda: self._rag_context(title)))
+            .add("research", research_step)
+            .add("context", lambda rag_context, agent_research: rag_context + "\n\n" + agent_research,
+                 deps=("rag", "research"))
+        )
+
+    def _slide_graph(self, raw_slide: dict, style: str, use_async: bool = False, content: dict = None,
+                     rag_context: str = None):
+        """
+        Per-slide pipeline as a dependency graph:
+
+            rag -------+
+                       +--> context --> writer --+--> design
+            research --+                         +--> image
+
+        With `use_async` the LLM-backed nodes are coroutines (for `TaskGraph.arun`).
+        When `content` is already written (batched writer), the graph starts at writer.
+        """
+        title, subtopics = self._slide_inputs(raw_slide)
+
+        def image_step(content):
             img_prompt = self.designer.generate_image_prompt(content)
-            image_data = self.image.generate_image(img_prompt)
-
-            slides_output.append({
-                "id": str(uuid.uuid4()),
-                "title": content["title"],
-                "bullets": content["bullets"],
-                "notes": content["notes"],
-                "design": design,
-                "image": image_data
-            })
+            return self.image.generate_image(img_prompt)
+
+        if use_async:
+            async def writer_step(context):
+                raw = await self.writer.awrite_slide(title, context)
+                return self._normalize_content(raw, title, subtopics)
+
+            async def design_step(content):
+                return self._normalize_design(await self.designer.aapply_design(content, style), style)
+        else:
+            def writer_step(context):
+                raw = self.writer.write_slide(title, context)
+                return self._normalize_content(raw, title, subtopics)
+
+            def design_step(content):
+                return self._normalize_design(self.designer.apply_design(content, style), style)
+
+        graph = TaskGraph()
+        if content is None:
+            self._add_context_nodes(graph, raw_slide, use_async, rag_context)
+            graph.add("writer", writer_step, deps=("context",))
+        else:
+            graph.add("writer", lambda: content)
+
+        return (
+            graph
+            .add("design", design_step, deps=("writer",))
+            .add("image", image_step, deps=("writer",))
+        )
+
+    def _slide_json(self, slide_id, content, design, image):
+        return {
+            "id": slide_id,
+            "title": content["title"],
+            "bullets": content["bullets"],
+            "notes": content["notes"],
+            "design": design,
+            "image": image
+        }
 
+    def _package_slide(self, graph: TaskGraph, slide_id: str = None):
+        content = graph.results["writer"]
+        logger.info(f"[Orchestrator] Slide '{content['title']}' timings (ms): {graph.timings}")
+        slide = self._slide_json(
+            slide_id or str(uuid.uuid4()),
+            content,
+            graph.results["design"],
+            graph.results["image"],
+        )
+        return slide, graph.timings
+
+    def build_slide(self, raw_slide: dict, style: str = "corporate", content: dict = None, rag_context: str = None):
+        """Run the agent pipeline for one outline entry. Returns (slide_json, timings)."""
+        graph = self._slide_graph(raw_slide, style, content=content, rag_context=rag_context)
+        graph.run()
+        return self._package_slide(graph)
+
+    async def abuild_slide(self, raw_slide: dict, style: str = "corporate", content: dict = None, rag_context: str = None):
+        graph = self._slide_graph(raw_slide, style, use_async=True, content=content, rag_context=rag_context)
+        await graph.arun()
+        return self._package_slide(graph)
+
+    # -----------------------------
+    # BATCHED WRITER
+    # -----------------------------
+    def write_batched(self, slides, workers: int = 1, rag_contexts=None):
+        """
+        Gather context for every slide, then write them all through
+        `WriterAgent.write_slides` (several slides per LLM call).
+        """
+        rag_contexts = rag_contexts or [None] * len(slides)
+
+        def context_for(args):
+            raw_slide, rag_context = args
+            return self._add_context_nodes(TaskGraph(), raw_slide, rag_context=rag_context).run()["context"]
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="context") as pool:
+            contexts = list(pool.map(context_for, zip(slides, rag_contexts)))
+
+        items = [(self._slide_inputs(s)[0], c) for s, c in zip(slides, contexts)]
+        written = self.writer.write_slides(items)
+        return [self._normalize_content(w, *self._slide_inputs(s)) for s, w in zip(slides, written)]
+
+    async def awrite_batched(self, slides, workers: int = 1, rag_contexts=None):
+        gate = asyncio.Semaphore(workers)
+        rag_contexts = rag_contexts or [None] * len(slides)
+
+        async def context_for(raw_slide, rag_context):
+            async with gate:
+                graph = self._add_context_nodes(TaskGraph(), raw_slide, use_async=True, rag_context=rag_context)
+                results = await graph.arun()
+            return results["context"]
+
+        contexts = await asyncio.gather(*(context_for(s, r) for s, r in zip(slides, rag_contexts)))
+        items = [(self._slide_inputs(s)[0], c) for s, c in zip(slides, contexts)]
+        written = await self.writer.awrite_slides(items)
+        return [self._normalize_content(w, *self._slide_inputs(s)) for s, w in zip(slides, written)]
+
+    def _result(self, topic, style, built):
+        slides_output = [slide for slide, _ in built]
         return {
             "topic": topic,
             "style": style,
             "slides": slides_output,
-            "total_slides": len(slides_output)
+            "total_slides": len(slides_output),
+            "timings": [timings for _, timings in built]
         }
+
+    def _worker_count(self, max_workers, num_slides):
+        workers = max_workers or settings.ORCHESTRATOR_MAX_WORKERS
+        return max(1, min(workers, num_slides or 1))
+
+    # -----------------------------
+    # FULL PRESENTATION
+    # -----------------------------
+    def generate_presentation(self, topic, document_id=None, style="corporate", detail="medium",
+                              max_workers=None, batch_writer=None):
+        # 1) SAFE OUTLINE GENERATION
+        slides = self._outline_slides(topic, self.create_outline(topic, document_id, detail))
+        workers = self._worker_count(max_workers, len(slides))
+
+        # 1a) RAG CONTEXT FOR THE WHOLE OUTLINE IN ONE RETRIEVAL
+        rag_contexts = self._rag_contexts(slides)
+
+        # 1b) OPTIONAL: WRITE ALL SLIDES IN A FEW BATCHED LLM CALLS
+        if settings.WRITER_BATCH_ENABLED if batch_writer is None else batch_writer:
+            contents = self.write_batched(slides, workers, rag_contexts)
+        else:
+            contents = [None] * len(slides)
+
+        # 2) PROCESS SLIDES (PARALLEL, ORDER PRESERVED)
+        jobs = list(zip(slides, contents, rag_contexts))
+        if workers == 1:
+            built = [self.build_slide(s, style, c, r) for s, c, r in jobs]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="slide") as pool:
+                built = list(pool.map(lambda scr: self.build_slide(scr[0], style, scr[1], scr[2]), jobs))
+
+        return self._result(topic, style, built)
+
+    async def agenerate_presentation(self, topic, document_id=None, style="corporate", detail="medium",
+                                     max_workers=None, batch_writer=None):
+        """Event-loop version of `generate_presentation`; no worker thread is pinned per request."""
+        slides = self._outline_slides(topic, await self.acreate_outline(topic, document_id, detail))
+        workers = self._worker_count(max_workers, len(slides))
+        rag_contexts = await asyncio.to_thread(self._rag_contexts, slides)
+
+        if settings.WRITER_BATCH_ENABLED if batch_writer is None else batch_writer:
+            contents = await self.awrite_batched(slides, workers, rag_contexts)
+        else:
+            contents = [None] * len(slides)
+
+        gate = asyncio.Semaphore(workers)
+
+        async def bounded(raw_slide, content, rag_context):
+            async with gate:
+                return await self.abuild_slide(raw_slide, style, content, rag_context)
+
+        tasks = [asyncio.create_task(bounded(s, c, r)) for s, c, r in zip(slides, contents, rag_contexts)]
+        try:
+            built = await asyncio.gather(*tasks)
+        finally:
+            # one slide failed (or the caller went away): stop the rest
+            for t in tasks:
+                t.cancel()
+        return self._result(topic, style, built)
+
+    async def astream_presentation(self, topic, document_id=None, style="corporate", detail="medium",
+                                   max_workers=None, batch_writer=None):
+        """
+        Async generator of (event, data) pairs, emitted as soon as each piece is ready:
+
+            outline -> slide (text + design, image pending) -> image -> ... -> done
+
+        Slides arrive in completion order and carry their outline `index`.
+        With the batched writer (WRITER_BATCH_ENABLED or `batch_writer`) all
+        slide text is written up front in a few LLM calls, so the first slide
+        event comes later but the deck costs fewer calls; design and images
+        still stream per slide.
+        """
+        outline = await self.acreate_outline(topic, document_id, detail)
+        slides = self._outline_slides(topic, outline)
+        yield "outline", {
+            "topic": topic,
+            "style": style,
+            "slides": [
+                {"index": i, "title": s.get("title") or "Untitled Slide", "points": self.safe_list(s.get("points"))}
+                for i, s in enumerate(slides)
+            ],
+        }
+
+        workers = self._worker_count(max_workers, len(slides))
+        rag_contexts = await asyncio.to_thread(self._rag_contexts, slides)
+
+        if settings.WRITER_BATCH_ENABLED if batch_writer is None else batch_writer:
+            contents = await self.awrite_batched(slides, workers, rag_contexts)
+        else:
+            contents = [None] * len(slides)
+
+        queue = asyncio.Queue()
+        gate = asyncio.Semaphore(workers)
+
+        async def run_slide(index, raw_slide):
+            slide_id = str(uuid.uuid4())
+            graph = self._slide_graph(
+                raw_slide, style, use_async=True, content=contents[index], rag_context=rag_contexts[index]
+            )
+
+            def on_done(name, result):
+                # design depends on writer, so both are ready once design finishes
+                if name == "design":
+                    slide = self._slide_json(slide_id, graph.results["writer"], result, None)
+                    queue.put_nowait(("slide", {"index": index, "slide": slide}))
+                elif name == "image":
+                    queue.put_nowait(("image", {"index": index, "slide_id": slide_id, "image": result}))
+
+            async with gate:
+                await graph.arun(on_done=on_done)
+            return self._package_slide(graph, slide_id)
+
+        tasks = [asyncio.create_task(run_slide(i, s)) for i, s in enumerate(slides)]
+        finished = asyncio.create_task(asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION))
+
+        try:
+            while True:
+                getter = asyncio.create_task(queue.get())
+                await asyncio.wait({getter, finished}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield getter.result()
+                    continue
+
+                getter.cancel()
+                while not queue.empty():
+                    yield queue.get_nowait()
+                break
+
+            for t in tasks:
+                if t.done() and t.exception():
+                    raise t.exception()
+            built = [t.result() for t in tasks]
+        finally:
+            for t in tasks:
+                t.cancel()
+            finished.cancel()
+
+        yield "done", self._result(topic, style, built)
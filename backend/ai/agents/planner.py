@@ -125,25 +125,37 @@ class PlannerAgent(BaseAgent):
 
         return {"slides": []}
 
+    def _valid_outline(self, text: str) -> bool:
+        """Only outlines with slides are worth caching."""
+        result = self._extract_json(text)
+        slides = result.get("slides") if isinstance(result, dict) else None
+        return isinstance(slides, list) and bool(slides)
+
     # ------------------------------------
     #  TOPIC-BASED OUTLINE
     # ------------------------------------
-    def plan(self, topic: str, detail: str = "medium", num_slides: int = 10):
-        prompt = f"""
+    def _topic_prompt(self, topic: str, detail: str, num_slides: int):
+        return f"""
 Topic: {topic}
 Detail Level: {detail}
 Number of slides: {num_slides}
 Create a structured outline.
 Return ONLY JSON.
 """
-        raw = self.run(prompt)
+
+    def plan(self, topic: str, detail: str = "medium", num_slides: int = 10):
+        raw = self.run(self._topic_prompt(topic, detail, num_slides), validate=self._valid_outline)
+        return self._extract_json(raw)
+
+    async def aplan(self, topic: str, detail: str = "medium", num_slides: int = 10):
+        raw = await self.arun(self._topic_prompt(topic, detail, num_slides), validate=self._valid_outline)
         return self._extract_json(raw)
 
     # ------------------------------------
     #  DOCUMENT-BASED OUTLINE
     # ------------------------------------
-    def plan_from_document(self, context: str, detail: str = "medium", num_slides: int = 10):
-        prompt = f"""
+    def _document_prompt(self, context: str, detail: str, num_slides: int):
+        return f"""
 Document Context:
 {context}
 
@@ -152,7 +164,13 @@ Number of slides: {num_slides}
 Create a structured outline.
 Return ONLY JSON.
 """
-        raw = self.run(prompt)
+
+    def plan_from_document(self, context: str, detail: str = "medium", num_slides: int = 10):
+        raw = self.run(self._document_prompt(context, detail, num_slides), validate=self._valid_outline)
+        return self._extract_json(raw)
+
+    async def aplan_from_document(self, context: str, detail: str = "medium", num_slides: int = 10):
+        raw = await self.arun(self._document_prompt(context, detail, num_slides), validate=self._valid_outline)
         return self._extract_json(raw)
 
     # ------------------------------------
@@ -1,4 +1,7 @@
-from ai.utils.agents_utils import BaseAgent
+from ai.utils.agents_utils import BaseAgent, is_json
+from ai.utils.concurrency import provider_slot
+import asyncio
+import json
 import requests
 import os
 
@@ -30,33 +33,54 @@ class ResearcherAgent(BaseAgent):
     def web_search(self, query):
         url = "https://api.tavily.com/search"
         payload = {"api_key": TAVILY_API_KEY, "query": query}
-        res = requests.post(url, json=payload).json()
+        with provider_slot("tavily"):
+            res = requests.post(url, json=payload).json()
         return res.get("results", [])
 
-    def research(self, topic: str = None, subtopics: list = None, outline_json: str = None):
-        """Perform research for a topic/subtopics or outline"""
+    def _research_prompt(self, topic: str = None, subtopics: list = None, outline_json: str = None, search_results=None):
         if outline_json:
-            prompt = f"Perform research for: {outline_json}\nUse structured facts."
-        else:
-            query = topic or ""
-            if subtopics:
-                query += f" - {', '.join(subtopics)}"
-            
-            # Try web search first if API key available
-            search_results = []
-            if TAVILY_API_KEY:
-                try:
-                    search_results = self.web_search(query)
-                except (requests.RequestException, ValueError, KeyError):
-                    pass
-            
-            # Combine search results with LLM research
-            context = "\n".join([r.get("content", "") for r in search_results[:3]]) if search_results else ""
-            prompt = f"Topic: {query}\n\nSearch Results:\n{context}\n\nExtract key facts, statistics, and insights. Return structured research data."
-        
-        result = self.run(prompt)
-        import json
+            return f"Perform research for: {outline_json}\nUse structured facts."
+
+        query = self._query(topic, subtopics)
+        # Combine search results with LLM research
+        context = "\n".join([r.get("content", "") for r in search_results[:3]]) if search_results else ""
+        return f"Topic: {query}\n\nSearch Results:\n{context}\n\nExtract key facts, statistics, and insights. Return structured research data."
+
+    def _query(self, topic: str = None, subtopics: list = None):
+        query = topic or ""
+        if subtopics:
+            query += f" - {', '.join(subtopics)}"
+        return query
+
+    def _safe_search(self, query):
+        # Try web search first if API key available
+        if not TAVILY_API_KEY:
+            return []
+        try:
+            return self.web_search(query)
+        except (requests.RequestException, ValueError, KeyError):
+            return []
+
+    def _parse(self, result):
         try:
             return json.loads(result)
         except (json.JSONDecodeError, ValueError, TypeError):
             return {"research": [], "facts": [], "statistics": []}
+
+    def research(self, topic: str = None, subtopics: list = None, outline_json: str = None):
+        """Perform research for a topic/subtopics or outline"""
+        search_results = None
+        if not outline_json:
+            search_results = self._safe_search(self._query(topic, subtopics))
+
+        prompt = self._research_prompt(topic, subtopics, outline_json, search_results)
+        return self._parse(self.run(prompt, validate=is_json))
+
+    async def aresearch(self, topic: str = None, subtopics: list = None, outline_json: str = None):
+        """Async `research`: the Tavily call runs off-loop, the LLM call is native async."""
+        search_results = None
+        if not outline_json:
+            search_results = await asyncio.to_thread(self._safe_search, self._query(topic, subtopics))
+
+        prompt = self._research_prompt(topic, subtopics, outline_json, search_results)
+        return self._parse(await self.arun(prompt, validate=is_json))
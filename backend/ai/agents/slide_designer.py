@@ -1,4 +1,4 @@
-from ai.utils.agents_utils import BaseAgent
+from ai.utils.agents_utils import BaseAgent, is_json
 
 DESIGN_SYSTEM_PROMPT = """
 You are Slide Design Agent.
@@ -30,17 +30,17 @@ class DesignerAgent(BaseAgent):
 
     def design(self, slides_json):
         """Apply design to slides"""
-        result = self.run(slides_json)
+        result = self.run(slides_json, validate=is_json)
         import json
         try:
             return json.loads(result)
         except (json.JSONDecodeError, ValueError, TypeError):
             return {"design": {"layout": "centered", "icon": "", "image_prompt": ""}}
     
-    def apply_design(self, content: dict, style: str = "corporate"):
-        """Apply design theme to slide content (for orchestrator)"""
-        prompt = f"Slide Content: {content}\nStyle: {style}\n\nApply design theme and return design object."
-        result = self.run(prompt)
+    def _design_prompt(self, content: dict, style: str):
+        return f"Slide Content: {content}\nStyle: {style}\n\nApply design theme and return design object."
+
+    def _parse_design(self, result):
         import json
         try:
             parsed = json.loads(result)
@@ -49,6 +49,13 @@ class DesignerAgent(BaseAgent):
             return parsed
         except (json.JSONDecodeError, ValueError, TypeError):
             return {"layout": "centered", "icon": "", "image_prompt": ""}
+
+    def apply_design(self, content: dict, style: str = "corporate"):
+        """Apply design theme to slide content (for orchestrator)"""
+        return self._parse_design(self.run(self._design_prompt(content, style), validate=is_json))
+
+    async def aapply_design(self, content: dict, style: str = "corporate"):
+        return self._parse_design(await self.arun(self._design_prompt(content, style), validate=is_json))
     
     def generate_image_prompt(self, content: dict):
         """Generate image prompt from slide content"""
@@ -1,4 +1,6 @@
 from ai.utils.agents_utils import BaseAgent
+from app.core.config import settings
+import asyncio
 import json
 import re
 
@@ -17,6 +19,27 @@ Return ONLY JSON in this format:
 }
 """
 
+# batches get their own system prompt: the single-slide schema above
+# would contradict BATCH_FORMAT and every batch reply would fail to parse
+BATCH_WRITER_SYSTEM_PROMPT = """
+You are a Slide Content Writing Agent.
+You are given several slide entries, each with a title and research.
+Write full slide content for every entry, in one reply.
+
+Return ONLY JSON with a "slides" list, one object per entry, each keeping
+the entry's "index".
+"""
+
+BATCH_FORMAT = """
+Write one slide for EACH entry above.
+Return ONLY JSON in this format (keep every "index" exactly as given):
+{
+  "slides": [
+     {"index": 0, "heading": "Slide title", "bullets": ["point 1", "point 2"], "notes": "speaker notes"}
+  ]
+}
+"""
+
 class WriterAgent(BaseAgent):
     def __init__(self):
         super().__init__(WRITER_SYSTEM_PROMPT)
@@ -47,6 +70,14 @@ class WriterAgent(BaseAgent):
             }
         }
 
+    def _valid_slide(self, text: str) -> bool:
+        """A reply worth caching: one slide with at least one bullet."""
+        result = self._extract_json(text)
+        if not isinstance(result, dict):
+            return False
+        slide = result.get("slide") or (result.get("slides") or [{}])[0]
+        return isinstance(slide, dict) and isinstance(slide.get("bullets"), list) and bool(slide["bullets"])
+
     def write(self, enriched_outline, context: str = None):
         """Write slide using outline + extra RAG context."""
         prompt = f"""
@@ -59,7 +90,7 @@ Context:
 Write ONLY JSON for one slide.
 """
 
-        raw = self.run(prompt)
+        raw = self.run(prompt, validate=self._valid_slide)
         result = self._extract_json(raw)
 
         # Normalize output
@@ -72,15 +103,15 @@ Write ONLY JSON for one slide.
             "notes": slide.get("notes", "")
         }
 
-    def write_slide(self, title: str, research_data: dict):
-        """Write slide from title + research data only."""
-        prompt = f"""
+    def _slide_prompt(self, title: str, research_data):
+        return f"""
 Title: {title}
 Research: {research_data}
 
 Write ONLY JSON for one slide.
 """
-        raw = self.run(prompt)
+
+    def _parse_slide(self, raw: str, title: str):
         result = self._extract_json(raw)
 
         slide = result.get("slide") or result.get("slides", [{}])[0]
@@ -90,3 +121,134 @@ Write ONLY JSON for one slide.
             "bullets": slide.get("bullets", []),
             "notes": slide.get("notes", "")
         }
+
+    def write_slide(self, title: str, research_data: dict):
+        """Write slide from title + research data only."""
+        raw = self.run(self._slide_prompt(title, research_data), validate=self._valid_slide)
+        return self._parse_slide(raw, title)
+
+    async def awrite_slide(self, title: str, research_data: dict):
+        raw = await self.arun(self._slide_prompt(title, research_data), validate=self._valid_slide)
+        return self._parse_slide(raw, title)
+
+    # ------------------------------------
+    #  BATCHED WRITING (several slides per LLM call)
+    # ------------------------------------
+    def _plan_batches(self, items, max_chars: int = None, max_slides: int = None):
+        """
+        Greedily pack (index, title, context) entries into batches whose
+        combined prompt stays under `max_chars`. Oversized entries go alone.
+        """
+        max_chars = max_chars or settings.WRITER_BATCH_MAX_CHARS
+        max_slides = max_slides or settings.WRITER_BATCH_MAX_SLIDES
+
+        batches, current, size = [], [], 0
+        for entry in items:
+            entry_size = len(entry[1]) + len(str(entry[2]))
+            if current and (size + entry_size > max_chars or len(current) >= max_slides):
+                batches.append(current)
+                current, size = [], 0
+            current.append(entry)
+            size += entry_size
+        if current:
+            batches.append(current)
+        return batches
+
+    def _batch_prompt(self, batch):
+        parts = [
+            f"--- Slide index {idx} ---\nTitle: {title}\nResearch: {context}\n"
+            for idx, title, context in batch
+        ]
+        return "\n".join(parts) + BATCH_FORMAT
+
+    def _parse_batch(self, raw: str, batch):
+        """Return {index: slide} for every entry that came back well-formed."""
+        try:
+            slides = self._extract_json(raw).get("slides")
+        except AttributeError:
+            return {}
+        if not isinstance(slides, list):
+            return {}
+
+        expected = [idx for idx, _, _ in batch]
+        parsed = {}
+        for pos, slide in enumerate(slides):
+            if not isinstance(slide, dict):
+                continue
+            idx = slide.get("index")
+            if idx not in expected:
+                # tolerate a dropped "index" when the order is intact
+                if idx is None and len(slides) == len(batch):
+                    idx = expected[pos]
+                else:
+                    continue
+            bullets = slide.get("bullets")
+            if not isinstance(bullets, list) or not bullets:
+                continue
+            parsed[idx] = slide
+        return parsed
+
+    def _valid_batch(self, batch):
+        """Cache a batch reply only when every slide in it came back well-formed."""
+        return lambda text: len(self._parse_batch(text, batch)) == len(batch)
+
+    def _normalize_batch_slide(self, slide: dict, title: str):
+        return {
+            "title": slide.get("heading") or slide.get("title") or title,
+            "bullets": slide.get("bullets", []),
+            "notes": slide.get("notes", "")
+        }
+
+    def write_slides(self, items):
+        """
+        Write several slides with as few LLM calls as possible.
+
+        `items` is a list of (title, research_data). Slides are packed into
+        batches sized by context length; any slide that fails to parse is
+        re-requested on its own. Output order matches `items`.
+        """
+        entries = [(i, title, context) for i, (title, context) in enumerate(items)]
+        results = [None] * len(entries)
+
+        for batch in self._plan_batches(entries):
+            parsed = {}
+            if len(batch) > 1:
+                raw = self.run(
+                    self._batch_prompt(batch),
+                    system_prompt=BATCH_WRITER_SYSTEM_PROMPT,
+                    validate=self._valid_batch(batch),
+                )
+                parsed = self._parse_batch(raw, batch)
+            for idx, title, context in batch:
+                if idx in parsed:
+                    results[idx] = self._normalize_batch_slide(parsed[idx], title)
+                else:
+                    results[idx] = self.write_slide(title, context)
+        return results
+
+    async def awrite_slides(self, items):
+        """Async `write_slides`; batches are sent concurrently."""
+        entries = [(i, title, context) for i, (title, context) in enumerate(items)]
+        results = [None] * len(entries)
+
+        async def write_batch(batch):
+            parsed = {}
+            if len(batch) > 1:
+                raw = await self.arun(
+                    self._batch_prompt(batch),
+                    system_prompt=BATCH_WRITER_SYSTEM_PROMPT,
+                    validate=self._valid_batch(batch),
+                )
+                parsed = self._parse_batch(raw, batch)
+            retries = []
+            for idx, title, context in batch:
+                if idx in parsed:
+                    results[idx] = self._normalize_batch_slide(parsed[idx], title)
+                else:
+                    retries.append((idx, title, context))
+            rewritten = await asyncio.gather(*(self.awrite_slide(t, c) for _, t, c in retries))
+            for (idx, _, _), slide in zip(retries, rewritten):
+                results[idx] = slide
+
+        await asyncio.gather(*(write_batch(b) for b in self._plan_batches(entries)))
+        return results
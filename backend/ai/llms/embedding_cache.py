@@ -0,0 +1,222 @@
+# ai/llms/embedding_cache.py
+import hashlib
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from app.core.config import settings
+from app.core.logger import logger
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@contextmanager
+def _file_lock(path: Path):
+    """Exclusive lock across processes (uvicorn workers share the cache dir)."""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class EmbeddingCache:
+    """
+    On-disk embedding cache for one model, keyed by chunk content hash.
+
+    Layout under `root/<model>/`:
+      vectors.f32  - float32 rows, appended, read through np.memmap
+      index.tsv    - one "<sha256>\\t<row>" line per cached vector
+      meta.json    - model name and vector dimension
+      .lock        - held while appending, so several processes can share it
+
+    Appends happen under the file lock and take their row number from the
+    real size of vectors.f32 at that moment, never from a counter kept in
+    memory. Vector bytes are flushed before their index lines are written,
+    so a crash can only leave unreferenced rows behind; a partial trailing
+    row or index line is cut off before the next append or load. Index
+    lines written by other processes are picked up incrementally.
+    """
+
+    def __init__(self, root: str, model_name: str):
+        self.model_name = model_name
+        safe = re.sub(r"[^A-Za-z0-9_.-]+", "__", model_name)
+        self.dir = Path(root) / safe
+        self.dir.mkdir(parents=True, exist_ok=True)
+
+        self._vectors_path = self.dir / "vectors.f32"
+        self._index_path = self.dir / "index.tsv"
+        self._meta_path = self.dir / "meta.json"
+        self._lock_path = self.dir / ".lock"
+
+        self._lock = threading.Lock()
+        self._index: Dict[str, int] = {}
+        self._index_pos = 0  # bytes of index.tsv already read
+        self._rows = 0
+        self._mmap: Optional[np.memmap] = None
+        self.dim: Optional[int] = None
+
+        with self._lock, _file_lock(self._lock_path):
+            self._read_meta()
+            self._trim_partial_row()
+            self._trim_partial_line()
+            self._refresh_index()
+
+        if self._index:
+            logger.info(f"[EmbedCache] {self.model_name}: {len(self._index)} cached vectors")
+
+    # ---------- file state (callers hold self._lock) ----------
+    def _row_bytes(self) -> int:
+        return 4 * self.dim
+
+    def _read_meta(self):
+        if self.dim is None and self._meta_path.exists():
+            meta = json.loads(self._meta_path.read_text())
+            self.dim = int(meta["dim"])
+
+    def _trim_partial_row(self):
+        """Cut a torn trailing row back to whole rows; needs the file lock."""
+        if self.dim is None or not self._vectors_path.exists():
+            return
+        size = self._vectors_path.stat().st_size
+        whole = size - size % self._row_bytes()
+        if whole != size:
+            logger.warning(f"[EmbedCache] {self.model_name}: dropping partial row ({size - whole} bytes)")
+            with open(self._vectors_path, "r+b") as f:
+                f.truncate(whole)
+
+    def _trim_partial_line(self):
+        """Drop a torn last index line so it can never be completed by the next append."""
+        if not self._index_path.exists():
+            return
+        with open(self._index_path, "r+b") as f:
+            size = f.seek(0, os.SEEK_END)
+            if not size:
+                return
+            f.seek(max(0, size - 4096))
+            tail = f.read()
+            if tail.endswith(b"\n"):
+                return
+            cut = tail.rfind(b"\n")
+            if cut < 0 and size > len(tail):
+                return  # one very long line; leave it, the row check rejects it
+            f.truncate(size - len(tail) + cut + 1)
+
+    def _refresh_index(self):
+        """Read index lines appended since the last call (by any process)."""
+        if self.dim is None or not self._index_path.exists():
+            return
+        rows = self._vectors_path.stat().st_size // self._row_bytes() if self._vectors_path.exists() else 0
+        with open(self._index_path, "rb") as f:
+            f.seek(self._index_pos)
+            data = f.read()
+        end = data.rfind(b"\n") + 1  # a line still being written is read next time
+        for line in data[:end].decode("utf-8", errors="replace").splitlines():
+            key, _, row = line.partition("\t")
+            if row.isdigit() and int(row) < rows:
+                self._index[key] = int(row)
+        self._index_pos += end
+        self._rows = max(self._rows, rows)
+
+    def _view(self) -> np.ndarray:
+        # re-map only when rows were appended since the last map
+        if self._mmap is None or self._mmap.shape[0] < self._rows:
+            self._mmap = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(self._rows, self.dim))
+        return self._mmap
+
+    # ---------- public ----------
+    def __len__(self):
+        return len(self._index)
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Cached vectors for whichever of `keys` are present."""
+        with self._lock:
+            self._read_meta()
+            if any(k not in self._index for k in keys):
+                self._refresh_index()
+            found = {k: self._index[k] for k in keys if k in self._index}
+            if not found:
+                return {}
+            # one gather copies every hit out of the map at once
+            block = self._view()[list(found.values())]
+            return dict(zip(found.keys(), block))
+
+    def put_many(self, keys: Iterable[str], vectors: np.ndarray):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or not len(vectors):
+            return
+
+        with self._lock, _file_lock(self._lock_path):
+            self._read_meta()
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                self._meta_path.write_text(json.dumps({"model": self.model_name, "dim": self.dim}))
+            elif vectors.shape[1] != self.dim:
+                logger.warning(f"[EmbedCache] dim mismatch for {self.model_name}: {vectors.shape[1]} != {self.dim}")
+                return
+
+            # catch up with other writers, then skip keys they already stored
+            self._trim_partial_row()
+            self._trim_partial_line()
+            self._refresh_index()
+            new = {}
+            for k, v in zip(keys, vectors):
+                if k not in self._index and k not in new:
+                    new[k] = v
+            if not new:
+                return
+
+            with open(self._vectors_path, "ab") as f:
+                start = f.seek(0, os.SEEK_END) // self._row_bytes()
+                f.write(np.stack(list(new.values())).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+            lines = [f"{key}\t{start + offset}\n" for offset, key in enumerate(new)]
+            with open(self._index_path, "ab") as f:
+                f.write("".join(lines).encode("utf-8"))
+                f.flush()
+
+            # our lines are now the tail of the file; read them back like anyone else's
+            self._refresh_index()
+
+
+_caches: Dict[str, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(model_name: str) -> Optional[EmbeddingCache]:
+    """Shared per-model cache; None when disabled or the cache dir is unusable."""
+    if not settings.EMBEDDINGS_CACHE_ENABLED:
+        return None
+    with _caches_lock:
+        if model_name not in _caches:
+            try:
+                _caches[model_name] = EmbeddingCache(settings.EMBEDDINGS_CACHE_DIR, model_name)
+            except Exception as e:
+                logger.warning(f"[EmbedCache] Disabled for {model_name}: {e}")
+                _caches[model_name] = None
+        return _caches[model_name]
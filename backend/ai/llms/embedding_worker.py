@@ -0,0 +1,264 @@
+# ai/llms/embedding_worker.py
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.logger import logger
+
+
+class EmbeddingQueueFull(Exception):
+    """The embedding queue stayed full for longer than the submit timeout."""
+
+
+# ---------------------------------------------------------
+# Worker process side
+# ---------------------------------------------------------
+_worker_model = None
+
+
+def _init_worker(model_name: str, torch_threads: int):
+    # one model per process, loaded once; keep each process to its share of cores
+    global _worker_model
+    try:
+        import torch
+        torch.set_num_threads(torch_threads)
+    except ImportError:
+        pass
+    from sentence_transformers import SentenceTransformer
+    _worker_model = SentenceTransformer(model_name)
+
+
+def _encode_in_worker(texts: List[str]) -> np.ndarray:
+    vectors = _worker_model.encode(texts, show_progress_bar=False, convert_to_numpy=True)
+    return np.ascontiguousarray(vectors, dtype=np.float32)
+
+
+# ---------------------------------------------------------
+# API process side
+# ---------------------------------------------------------
+class _Request:
+    __slots__ = ("texts", "future")
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.future: Future = Future()
+
+
+class EmbeddingWorkerPool:
+    """
+    Runs SentenceTransformer in separate processes so encoding never competes
+    with request handling for the API process's GIL.
+
+    Callers put requests on a bounded queue. A dispatcher thread merges
+    whatever is waiting (up to `max_batch` texts, waiting at most
+    `max_wait_ms` for more) into one batch, so several concurrent uploads
+    share model calls. At most one batch per worker is in flight. When the
+    queue is full, `encode` blocks for up to `submit_timeout` seconds and
+    then raises EmbeddingQueueFull.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        workers: int,
+        max_batch: int = 64,
+        max_wait_ms: int = 5,
+        max_queue: int = 256,
+        submit_timeout: float = 30.0,
+        result_timeout: float = 300.0,
+    ):
+        self.model_name = model_name
+        self.workers = workers
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.submit_timeout = submit_timeout
+        self.result_timeout = result_timeout
+
+        torch_threads = max(1, (os.cpu_count() or 1) // workers)
+        # spawn: never fork a process that already holds threads / torch state
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_name, torch_threads),
+        )
+        self._queue: "queue.Queue[_Request]" = queue.Queue(maxsize=max_queue)
+        self._slots = threading.Semaphore(workers)
+        self._closed = False
+
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="embedding-dispatcher", daemon=True)
+        self._dispatcher.start()
+        logger.info(f"[EmbedPool] {workers} worker(s) for {model_name}")
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode through the workers. Raises BrokenProcessPool once the pool
+        is shut down, or when no result arrives within `result_timeout`, so
+        callers can fall back to encoding in-process.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        if self._closed:
+            raise BrokenProcessPool("Embedding pool is shut down")
+        req = _Request(list(texts))
+        try:
+            self._queue.put(req, timeout=self.submit_timeout)
+        except queue.Full:
+            raise EmbeddingQueueFull(f"Embedding queue full ({self._queue.maxsize} requests waiting)")
+        if self._closed:
+            # shut down while we were queueing; shutdown() may have drained already
+            self._drain()
+        try:
+            return req.future.result(timeout=self.result_timeout)
+        except FutureTimeout:
+            raise BrokenProcessPool(f"No embedding result within {self.result_timeout}s")
+
+    # ---------- dispatcher ----------
+    def _collect(self) -> List[_Request]:
+        while True:
+            try:
+                first = self._queue.get(timeout=0.5)
+                break
+            except queue.Empty:
+                if self._closed:
+                    return []
+        if first is None:
+            return []
+        batch, size = [first], len(first.texts)
+        deadline = time.monotonic() + self.max_wait
+
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                req = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if req is None:
+                self._closed = True
+                break
+            batch.append(req)
+            size += len(req.texts)
+        return batch
+
+    def _dispatch_loop(self):
+        while not self._closed:
+            batch = self._collect()
+            if not batch:
+                break
+
+            texts = [t for req in batch for t in req.texts]
+            self._slots.acquire()
+            if self._closed:
+                self._slots.release()
+                self._fail(batch, BrokenProcessPool("Embedding pool is shut down"))
+                break
+            try:
+                fut = self._executor.submit(_encode_in_worker, texts)
+            except Exception as e:
+                self._slots.release()
+                self._fail(batch, e)
+                continue
+            fut.add_done_callback(lambda f, b=batch: self._scatter(f, b))
+
+    def _scatter(self, fut: Future, batch: List[_Request]):
+        self._slots.release()
+        try:
+            vectors = fut.result()
+        except CancelledError:
+            # cancelled by shutdown()
+            self._fail(batch, BrokenProcessPool("Embedding pool is shut down"))
+            return
+        except Exception as e:
+            self._fail(batch, e)
+            return
+
+        start = 0
+        for req in batch:
+            end = start + len(req.texts)
+            req.future.set_result(vectors[start:end])
+            start = end
+
+    @staticmethod
+    def _fail(batch: List[_Request], error: Exception):
+        for req in batch:
+            if not req.future.done():
+                req.future.set_exception(error)
+
+    def _drain(self):
+        """Fail every request still queued; nothing will dispatch them."""
+        pending = []
+        while True:
+            try:
+                req = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if req is not None:
+                pending.append(req)
+        self._fail(pending, BrokenProcessPool("Embedding pool is shut down"))
+
+    def shutdown(self):
+        self._closed = True
+        self._drain()
+        try:
+            self._queue.put_nowait(None)  # wake the dispatcher
+        except queue.Full:
+            pass
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pools: Dict[str, Optional[EmbeddingWorkerPool]] = {}
+_pools_lock = threading.Lock()
+
+
+def embedding_worker_count() -> int:
+    """
+    EMBEDDINGS_WORKERS capped so one core stays with the API process;
+    0 on a single-core host. PDF extraction sizes itself from what is left.
+    """
+    return max(0, min(settings.EMBEDDINGS_WORKERS, (os.cpu_count() or 1) - 1))
+
+
+def drop_embedding_pool(model_name: str):
+    """
+    Retire a broken pool (e.g. its workers failed to load the model); the
+    model is encoded in-process from then on.
+    """
+    with _pools_lock:
+        pool = _pools.get(model_name)
+        _pools[model_name] = None
+    if pool is not None:
+        pool.shutdown()
+
+
+def get_embedding_pool(model_name: str) -> Optional[EmbeddingWorkerPool]:
+    """Shared pool per model; None when there are no workers to run or it cannot start."""
+    workers = embedding_worker_count()
+    if workers <= 0:
+        return None
+    with _pools_lock:
+        if model_name not in _pools:
+            try:
+                _pools[model_name] = EmbeddingWorkerPool(
+                    model_name,
+                    workers=workers,
+                    max_batch=settings.EMBEDDINGS_MAX_BATCH,
+                    max_wait_ms=settings.EMBEDDINGS_MAX_WAIT_MS,
+                    max_queue=settings.EMBEDDINGS_QUEUE_SIZE,
+                    submit_timeout=settings.EMBEDDINGS_SUBMIT_TIMEOUT,
+                    result_timeout=settings.EMBEDDINGS_RESULT_TIMEOUT,
+                )
+            except Exception as e:
+                logger.warning(f"[EmbedPool] Falling back to in-process encoding: {e}")
+                _pools[model_name] = None
+        return _pools[model_name]
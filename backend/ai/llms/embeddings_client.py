@@ -25,26 +25,117 @@
 
 
 # ai/rag/embeddings_client.py
+import json
+import os
+import threading
 import numpy as np
-from typing import List
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, List, Optional, Tuple
+from ai.llms.embedding_cache import content_hash, get_embedding_cache
+from ai.llms.embedding_worker import drop_embedding_pool, get_embedding_pool
+from app.core.config import settings
+from app.core.logger import logger
+
+def _max_seq_length(repo: str) -> Optional[int]:
+    # SentenceTransformer reads its limit from sentence_bert_config.json, not the tokenizer
+    try:
+        if os.path.isdir(repo):
+            path = os.path.join(repo, "sentence_bert_config.json")
+        else:
+            from huggingface_hub import hf_hub_download
+            path = hf_hub_download(repo, "sentence_bert_config.json")
+        with open(path, "r", encoding="utf-8") as f:
+            return int(json.load(f)["max_seq_length"])
+    except Exception:
+        return None
+
 
 class EmbeddingsClient:
     def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
         self.model_name = model_name
         self.model = None   # Lazy load
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def get_model(self):
         if self.model is None:
-            from sentence_transformers import SentenceTransformer
-            self.model = SentenceTransformer(self.model_name)
+            with self._lock:
+                if self.model is None:
+                    from sentence_transformers import SentenceTransformer
+                    self.model = SentenceTransformer(self.model_name)
         return self.model
 
-    def embed_texts(self, texts: List[str]) -> List[List[float]]:
-        if not texts:
-            return []
+    def get_tokenizer(self) -> Tuple[Any, int]:
+        """
+        (fast tokenizer, max tokens the model embeds per text, excluding
+        special tokens). Uses the loaded model when there is one; otherwise
+        only the tokenizer files are fetched, not the weights.
+        """
+        if self.model is not None:
+            tokenizer, max_length = self.model.tokenizer, self.model.max_seq_length
+        else:
+            from transformers import AutoTokenizer
+            repo = self.model_name if "/" in self.model_name else f"sentence-transformers/{self.model_name}"
+            tokenizer = AutoTokenizer.from_pretrained(repo, use_fast=True)
+            max_length = _max_seq_length(repo) or tokenizer.model_max_length
+        if not getattr(tokenizer, "is_fast", False):
+            raise ValueError(f"{self.model_name} has no fast tokenizer (offsets are required)")
+        special = tokenizer.num_special_tokens_to_add(pair=False)
+        return tokenizer, max_length - special
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        # prefer the worker processes so encoding stays off the API process
+        pool = get_embedding_pool(self.model_name)
+        if pool is not None:
+            try:
+                return pool.encode(texts)
+            except BrokenProcessPool as e:
+                logger.warning(f"[Embeddings] Worker pool broken, encoding in-process: {e}")
+                drop_embedding_pool(self.model_name)
         model = self.get_model()
-        vectors = model.encode(texts, show_progress_bar=False, convert_to_numpy=True)
-        return [vec.tolist() for vec in vectors]
+        return model.encode(texts, show_progress_bar=False, convert_to_numpy=True)
+
+    def embed_texts(self, texts: List[str], use_cache: bool = True, dtype=None) -> np.ndarray:
+        """
+        Embed `texts` into one contiguous (len(texts), dim) matrix.
+
+        `dtype` defaults to settings.EMBEDDINGS_DTYPE (float32; float16 halves
+        the memory held per batch). With the cache on, only texts whose content
+        hash is not cached yet reach the model; a fully cached batch never
+        loads it.
+        """
+        dtype = np.dtype(dtype or settings.EMBEDDINGS_DTYPE)
+        if not texts:
+            return np.empty((0, 0), dtype=dtype)
+
+        cache = get_embedding_cache(self.model_name) if use_cache else None
+        if cache is None:
+            return np.ascontiguousarray(self._encode(texts), dtype=dtype)
+
+        keys = [content_hash(t) for t in texts]
+        found = cache.get_many(keys)
+
+        # encode each distinct missing text once
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+
+        if missing:
+            vectors = self._encode(list(missing.values()))
+            cache.put_many(list(missing.keys()), vectors)
+            found.update(zip(missing.keys(), vectors))
+
+        self.cache_hits += len(texts) - len(missing)
+        self.cache_misses += len(missing)
+
+        dim = len(next(iter(found.values())))
+        out = np.empty((len(texts), dim), dtype=dtype)
+        for i, key in enumerate(keys):
+            out[i] = found[key]
+        return out
 
-    def embed_text(self, text: str) -> List[float]:
-        return self.embed_texts([text])[0]
+    def embed_text(self, text: str) -> np.ndarray:
+        # queries are one-off; keep them out of the chunk cache
+        return self.embed_texts([text], use_cache=False)[0]
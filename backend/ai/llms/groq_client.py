@@ -1,16 +1,83 @@
-from groq import Groq
+from groq import Groq, AsyncGroq, DefaultHttpxClient, DefaultAsyncHttpxClient
+import asyncio
+import importlib.util
 import os
+import threading
+import weakref
+import httpx
+from ai.utils.concurrency import provider_slot, provider_aslot
+from app.core.config import settings
+
+# Shared clients: every agent reuses one connection pool instead of
+# opening its own HTTP client. An async pool belongs to the loop it was
+# first used on, so there is one async client per running loop.
+_client = None
+_async_clients = weakref.WeakKeyDictionary()  # event loop -> AsyncGroq
+_client_lock = threading.Lock()
+
+
+def _http_options():
+    # HTTP/2 needs the optional `h2` package (httpx[http2])
+    http2 = settings.GROQ_HTTP2 and importlib.util.find_spec("h2") is not None
+    limits = httpx.Limits(
+        max_connections=settings.GROQ_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.GROQ_HTTP_MAX_CONNECTIONS,
+    )
+    return {"http2": http2, "limits": limits}
+
+
+def get_groq_client() -> Groq:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = Groq(
+                    api_key=os.getenv("GROQ_API_KEY"),
+                    http_client=DefaultHttpxClient(**_http_options()),
+                )
+    return _client
+
+
+def get_async_groq_client() -> AsyncGroq:
+    """
+    Async client for the running event loop. The uvicorn loop gets one
+    long-lived client; loops started elsewhere (asyncio.run in a worker
+    thread, tests) get their own instead of reusing a foreign pool.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        with _client_lock:
+            client = _async_clients.get(loop)
+            if client is None:
+                client = _async_clients[loop] = AsyncGroq(
+                    api_key=os.getenv("GROQ_API_KEY"),
+                    http_client=DefaultAsyncHttpxClient(**_http_options()),
+                )
+    return client
+
 
 class GroqLLM:
     def __init__(self, model="llama-3.1-8b-instant"):
-        self.client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+        self.client = get_groq_client()
         self.model = model
 
     def generate(self, prompt: str, temperature=0.2):
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=temperature,
-        )
+        with provider_slot("groq"):
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+            )
         # FIX: new response format
         return response.choices[0].message.content
+
+    async def agenerate(self, prompt: str, temperature=0.2):
+        client = get_async_groq_client()
+        async with provider_aslot("groq"):
+            response = await client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+            )
+        return response.choices[0].message.content
@@ -0,0 +1,232 @@
+# ai/llms/image_cache.py
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.image_service import ImageService
+from app.services.image_store import ImageStore, get_image_store
+
+
+class ImageGenerationError(Exception):
+    """Upstream image model returned an error; never cached."""
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[Dict[str, str]] = None
+        self.error: Optional[BaseException] = None
+
+
+class ImageCache:
+    """
+    Persistent index from a generation request to the image it produced.
+
+    Keys are a SHA-256 over (model, prompt, options); each row points at the
+    content address (sha256 + extension) of an image in the ImageStore, so
+    the bytes exist only once, in the store. Each row records the size of
+    the files it points at; once the distinct images exceed `max_bytes`,
+    the least recently used rows are forgotten and any image left with no
+    row, saved image or saved slide pointing at it is deleted from disk.
+
+    Concurrent requests for the same key are coalesced: the first caller
+    generates and stores, the rest wait for its result.
+    """
+
+    def __init__(self, root: str, max_bytes: int, store: ImageStore = None, in_use: Callable[[str], bool] = None):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.store = store or get_image_store()
+        # whether something outside the cache still points at an image
+        self.in_use = in_use or ImageService().is_referenced
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()  # guards the connection
+        self._inflight: Dict[str, _Flight] = {}
+        self._inflight_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+        self._conn = sqlite3.connect(str(self.root / "index.db"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS image_refs ("
+            "key TEXT PRIMARY KEY, sha256 TEXT NOT NULL, extension TEXT NOT NULL, "
+            "size INTEGER NOT NULL, created_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_image_refs_last_used ON image_refs(last_used)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_image_refs_sha256 ON image_refs(sha256)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, prompt: str, options: Optional[Dict[str, Any]] = None) -> str:
+        raw = json.dumps([model, prompt, options or {}], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    # ---------- get / set ----------
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        """The stored image record for `key`, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT sha256, extension FROM image_refs WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            sha256, extension = row
+            if not self.store.path(sha256, extension).exists():
+                # image removed from the store; drop the stale row
+                self._conn.execute("DELETE FROM image_refs WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE image_refs SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return self.store.record(sha256, extension)
+
+    def set(self, key: str, stored: Dict[str, str]):
+        now = time.time()
+        sha256, extension = stored["sha256"], stored["extension"]
+        size = self.store.size(sha256, extension)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO image_refs (key, sha256, extension, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, sha256, extension, size, now, now),
+            )
+            orphans = self._evict(keep=key)
+            self._conn.commit()
+            # still under the lock, so no new row can point at an image while it is removed
+            for sha, ext in orphans:
+                self._delete_image(sha, ext)
+
+    def total_bytes(self) -> int:
+        """Disk used by the distinct images the cache points at."""
+        return self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT MAX(size) AS size FROM image_refs GROUP BY sha256)"
+        ).fetchone()[0]
+
+    def _evict(self, keep: str):
+        """Forget LRU rows until under budget; returns images no row points at any more."""
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return []
+        orphans = []
+        rows = self._conn.execute(
+            "SELECT key, sha256, extension, size FROM image_refs WHERE key != ? ORDER BY last_used", (keep,)
+        ).fetchall()
+        for key, sha256, extension, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM image_refs WHERE key = ?", (key,))
+            left = self._conn.execute("SELECT 1 FROM image_refs WHERE sha256 = ? LIMIT 1", (sha256,)).fetchone()
+            if left is None:
+                total -= size
+                orphans.append((sha256, extension))
+        return orphans
+
+    def _delete_image(self, sha256: str, extension: str):
+        try:
+            if not self.in_use(sha256):
+                self.store.delete(sha256, extension)
+        except Exception as e:
+            logger.warning(f"[ImageCache] could not delete {sha256[:12]}: {e}")
+
+    # ---------- coalesced generation ----------
+    def get_or_generate(self, key: str, generate: Callable[[], bytes]) -> Dict[str, str]:
+        """
+        Return the stored image for `key`, or call `generate()` and store its
+        bytes, once no matter how many threads ask for the same key at the
+        same time. Errors are propagated to every waiter and nothing is cached.
+        """
+        stored = self._safe_get(key)
+        if stored is not None:
+            self._count("hits")
+            return stored
+
+        with self._inflight_lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+
+        if not leader:
+            self._count("coalesced")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            self._count("misses")
+            stored = self.store.put(generate())
+            self._safe_set(key, stored)
+            flight.result = stored
+            return stored
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM image_refs").fetchone()[0]
+            size = self.total_bytes()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+        }
+
+    def _count(self, name: str):
+        with self._inflight_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _safe_get(self, key):
+        try:
+            return self.get(key)
+        except Exception as e:
+            logger.warning(f"[ImageCache] read failed: {e}")
+            return None
+
+    def _safe_set(self, key, stored):
+        try:
+            self.set(key, stored)
+        except Exception as e:
+            logger.warning(f"[ImageCache] write failed: {e}")
+
+
+_image_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_image_cache() -> Optional[ImageCache]:
+    """Shared cache built from settings; None when caching is disabled."""
+    global _image_cache
+    if not settings.IMAGE_CACHE_ENABLED:
+        return None
+    if _image_cache is None:
+        with _cache_lock:
+            if _image_cache is None:
+                _image_cache = ImageCache(settings.IMAGE_CACHE_DIR, settings.IMAGE_CACHE_MAX_BYTES)
+    return _image_cache
+
+
+def cached_image(model: str, prompt: str, options: Optional[Dict[str, Any]], generate: Callable[[], bytes]) -> Dict[str, str]:
+    """
+    Generate and store an image, or return the stored record of an earlier
+    identical request. The result is what ImageStore.put returns.
+    """
+    cache = get_image_cache()
+    if cache is None:
+        return get_image_store().put(generate())
+    return cache.get_or_generate(ImageCache.make_key(model, prompt, options), generate)
@@ -0,0 +1,230 @@
+# ai/llms/response_cache.py
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional
+
+from app.core.config import settings
+from app.core.logger import logger
+
+
+class MemoryCacheBackend:
+    """In-process LRU with optional TTL."""
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            stored_at, value = item
+            if self.ttl_seconds and time.time() - stored_at > self.ttl_seconds:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._data[key] = (time.time(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SQLiteCacheBackend:
+    """
+    On-disk tier. Entries expire after `ttl_seconds`; once the table grows
+    past `max_entries` the least recently used rows are evicted.
+    """
+
+    EVICT_EVERY = 50  # writes between eviction sweeps
+    blocking = True  # disk I/O: async callers run it in a worker thread
+
+    def __init__(self, path: str, max_entries: int = 20000, ttl_seconds: Optional[float] = None):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_last_used ON llm_cache(last_used)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return value
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._writes += 1
+            if self._writes % self.EVICT_EVERY == 0:
+                self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        if self.ttl_seconds:
+            self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        self._conn.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            "SELECT key FROM llm_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+
+class ResponseCache:
+    """
+    Content-addressed LLM response cache.
+
+    Keys are a SHA-256 over (model, temperature, system prompt, user prompt).
+    Backends are checked in order (fastest first); a hit in a slower tier is
+    promoted into the faster ones. Backend errors never fail the LLM call.
+    """
+
+    def __init__(self, backends: List):
+        self.backends = backends
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model: str, temperature: float, system_prompt: str, user_prompt: str) -> str:
+        raw = json.dumps([model, temperature, system_prompt, user_prompt], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        for i, backend in enumerate(self.backends):
+            value = self._safe_get(backend, key)
+            if value is not None:
+                return self._hit(i, key, value)
+
+        self._count(hit=False)
+        return None
+
+    async def aget(self, key: str) -> Optional[str]:
+        """`get` for event-loop callers: blocking tiers run in a worker thread."""
+        for i, backend in enumerate(self.backends):
+            if getattr(backend, "blocking", False):
+                value = await asyncio.to_thread(self._safe_get, backend, key)
+            else:
+                value = self._safe_get(backend, key)
+            if value is not None:
+                return self._hit(i, key, value)
+
+        self._count(hit=False)
+        return None
+
+    def set(self, key: str, value: str):
+        for backend in self.backends:
+            self._safe_set(backend, key, value)
+
+    async def aset(self, key: str, value: str):
+        for backend in self.backends:
+            if getattr(backend, "blocking", False):
+                await asyncio.to_thread(self._safe_set, backend, key, value)
+            else:
+                self._safe_set(backend, key, value)
+
+    def clear(self):
+        for backend in self.backends:
+            backend.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _hit(self, tier: int, key: str, value: str) -> str:
+        # promote into the faster tiers
+        for faster in self.backends[:tier]:
+            self._safe_set(faster, key, value)
+        self._count(hit=True)
+        return value
+
+    def _safe_get(self, backend, key):
+        try:
+            return backend.get(key)
+        except Exception as e:
+            logger.warning(f"[LLMCache] {type(backend).__name__} read failed: {e}")
+            return None
+
+    def _safe_set(self, backend, key, value):
+        try:
+            backend.set(key, value)
+        except Exception as e:
+            logger.warning(f"[LLMCache] {type(backend).__name__} write failed: {e}")
+
+
+_response_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Shared cache built from settings; None when caching is disabled."""
+    global _response_cache
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    if _response_cache is None:
+        with _cache_lock:
+            if _response_cache is None:
+                ttl = settings.LLM_CACHE_TTL_SECONDS or None
+                backends = [MemoryCacheBackend(settings.LLM_CACHE_MEMORY_ENTRIES, ttl)]
+                try:
+                    backends.append(SQLiteCacheBackend(settings.LLM_CACHE_DB, settings.LLM_CACHE_MAX_ENTRIES, ttl))
+                except Exception as e:
+                    logger.warning(f"[LLMCache] Disk tier unavailable, using memory only: {e}")
+                _response_cache = ResponseCache(backends)
+    return _response_cache
@@ -0,0 +1,99 @@
+# ai/loaders/base.py
+import re
+from functools import cached_property
+from typing import Iterator, List, Tuple
+
+_INLINE_SPACE = re.compile(r"[^\S\n]+")
+_LINE_EDGE = re.compile(r" ?\n ?")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def tidy_text(text: str) -> str:
+    """
+    Collapse runs of spaces and tabs, but keep line breaks, with any run of
+    blank lines reduced to one "\n\n". The chunker prefers to cut at those
+    paragraph breaks, so loaders must not flatten them away.
+    """
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = _LINE_EDGE.sub("\n", _INLINE_SPACE.sub(" ", text))
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+class LoadedDocument:
+    """
+    What a loader returns. Only `raw_text` is materialised up front;
+    `chunks`, `summary` and `topics` are computed on first access and then
+    cached, so callers that just need the text pay nothing for the rest.
+
+    Dict-style access (`doc["raw_text"]`, `doc.get("summary")`) still works
+    for code written against the old dict results.
+    """
+
+    KEYS = ("raw_text", "chunks", "summary", "topics")
+
+    def __init__(self, raw_text: str, loader: "BaseLoader", source: str = None):
+        self.raw_text = raw_text
+        self.source = source
+        self._loader = loader
+
+    @cached_property
+    def chunks(self) -> List[str]:
+        return self._loader.chunk_text(self.raw_text)
+
+    @cached_property
+    def summary(self) -> str:
+        return self._loader.create_summary(self.raw_text)
+
+    @cached_property
+    def topics(self) -> List[str]:
+        return self._loader.extract_topics(self.raw_text)
+
+    # ---------- dict compatibility ----------
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return self[key] if key in self.KEYS else default
+
+    def keys(self):
+        return self.KEYS
+
+    def to_dict(self):
+        return {key: self[key] for key in self.KEYS}
+
+
+class BaseLoader:
+    """
+    Shared loader interface.
+
+    Subclasses implement `load_text`. Formats with natural pages override
+    `iter_pages` so ingestion can stream; everything else is served as a
+    single page. The derived-data helpers can be overridden per format.
+    """
+
+    # True when iter_pages yields real pages, so ingestion should stream
+    paged = False
+
+    def load_text(self, file_path) -> str:
+        raise NotImplementedError
+
+    def iter_pages(self, file_path, on_page=None) -> Iterator[Tuple[int, str]]:
+        text = self.load_text(file_path)
+        if on_page:
+            on_page(1, 1)
+        yield 1, text
+
+    def load(self, file_path) -> LoadedDocument:
+        return LoadedDocument(self.load_text(file_path), self, source=str(file_path))
+
+    def chunk_text(self, text, chunk_size=1200):
+        return [text[i:i+chunk_size] for i in range(0, len(text), chunk_size)]
+
+    def create_summary(self, text):
+        return text[:800] + "..."
+
+    def extract_topics(self, text):
+        words = text.split()[:40]
+        return [w for w in words if w.istitle()]
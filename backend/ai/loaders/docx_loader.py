@@ -1,23 +1,13 @@
 import docx
 
-class DOCXLoader:
-    def load(self, file_path):
-        doc = docx.Document(file_path)
-        text = ""
-
-        for p in doc.paragraphs:
-            txt = p.text.strip()
-            if txt:
-                text += txt + " "
+from ai.loaders.base import BaseLoader, tidy_text
 
-        text = text.strip()
 
-        return {
-            "raw_text": text,
-            "chunks": self.chunk_text(text),
-            "summary": self.create_summary(text),
-            "topics": self.extract_topics(text)
-        }
+class DOCXLoader(BaseLoader):
+    def load_text(self, file_path):
+        doc = docx.Document(file_path)
+        parts = [tidy_text(p.text) for p in doc.paragraphs]
+        return "\n\n".join(p for p in parts if p)
 
     def chunk_text(self, text, chunk_size=1200):
         return [text[i:i+chunk_size] for i in range(0, len(text), chunk_size)]
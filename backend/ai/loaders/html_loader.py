@@ -0,0 +1,60 @@
+import re
+from html.parser import HTMLParser
+
+from ai.loaders.base import BaseLoader, tidy_text
+
+_SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "head"}
+# tags that start a new paragraph, and ones that only start a new line
+_BLOCK_TAGS = {
+    "p", "div", "section", "article", "aside", "header", "footer", "main", "nav",
+    "h1", "h2", "h3", "h4", "h5", "h6", "ul", "ol", "table", "blockquote", "pre",
+    "figure", "hr", "dl",
+}
+_LINE_TAGS = {"br", "li", "tr", "dt", "dd"}
+_CELL_TAGS = {"td", "th"}
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        self._break(tag, start=True)
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS and self._skip:
+            self._skip -= 1
+        self._break(tag, start=False)
+
+    def handle_data(self, data):
+        if not self._skip:
+            # whitespace in the source is not layout; only tags make breaks
+            self.parts.append(re.sub(r"\s+", " ", data))
+
+    def _break(self, tag, start):
+        if self._skip:
+            return
+        if tag in _BLOCK_TAGS:
+            self.parts.append("\n\n")
+        elif tag in _LINE_TAGS and start:
+            self.parts.append("\n")
+        elif tag in _CELL_TAGS and not start:
+            self.parts.append(" ")
+
+
+class HTMLLoader(BaseLoader):
+    """
+    Visible text of an HTML page; scripts, styles and <head> are dropped.
+    Block elements become paragraph breaks; <br>, list items and table rows line breaks.
+    """
+
+    def load_text(self, file_path):
+        with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+            parser = _TextExtractor()
+            parser.feed(f.read())
+            parser.close()
+        return tidy_text("".join(parser.parts))
@@ -0,0 +1,25 @@
+import re
+
+from ai.loaders.base import tidy_text
+from ai.loaders.txt_loader import TXTLoader
+
+_MARKUP = [
+    (re.compile(r"^```.*$", re.M), ""),                   # code fences
+    (re.compile(r"!\[([^\]]*)\]\([^)]*\)"), r"\1"),       # images -> alt text
+    (re.compile(r"\[([^\]]+)\]\([^)]*\)"), r"\1"),        # links -> label
+    (re.compile(r"^[ \t]{0,3}(#{1,6}|>|[-*+]|\d+\.)[ \t]+", re.M), ""),  # headings, quotes, bullets
+    (re.compile(r"(\*\*|__|\*|_|`)(\S(?:.*?\S)?)\1"), r"\2"),    # emphasis, inline code
+]
+
+
+class MarkdownLoader(TXTLoader):
+    """Markdown read as plain text with the markup stripped."""
+
+    def load_text(self, file_path):
+        with open(file_path, "r", encoding="utf-8") as f:
+            text = f.read()
+
+        for pattern, repl in _MARKUP:
+            text = pattern.sub(repl, text)
+
+        return tidy_text(text)
@@ -1,26 +1,163 @@
+import multiprocessing as mp
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
 import pdfplumber
 
-class PDFLoader:
-    def load(self, file_path):
-        text = ""
-        
+from ai.llms.embedding_worker import embedding_worker_count
+from ai.loaders.base import BaseLoader, LoadedDocument
+from app.core.config import settings
+from app.core.logger import logger
+
+
+# ---------------------------------------------------------
+# Extraction backends
+# ---------------------------------------------------------
+class PDFPlumberBackend:
+    """Layout-aware: rebuilds lines from character positions. Accurate, slow."""
+    name = "layout"
+
+    def available(self) -> bool:
+        return True
+
+    def page_count(self, file_path) -> int:
+        with pdfplumber.open(file_path) as pdf:
+            return len(pdf.pages)
+
+    def iter_texts(self, file_path, start=0, end=None):
+        with pdfplumber.open(file_path) as pdf:
+            end = len(pdf.pages) if end is None else end
+            for i in range(start, end):
+                page = pdf.pages[i]
+                yield page.extract_text() or ""
+                # drop pdfplumber's cached layout objects for this page
+                page.flush_cache()
+
+
+class PyPDFBackend:
+    """Text-only: reads content streams without layout analysis. Fast; plenty for RAG."""
+    name = "fast"
+
+    def available(self) -> bool:
+        try:
+            import pypdf  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def page_count(self, file_path) -> int:
+        from pypdf import PdfReader
+        return len(PdfReader(file_path).pages)
+
+    def iter_texts(self, file_path, start=0, end=None):
+        from pypdf import PdfReader
+        reader = PdfReader(file_path)
+        end = len(reader.pages) if end is None else end
+        for i in range(start, end):
+            yield reader.pages[i].extract_text() or ""
+
+
+PDF_BACKENDS = {
+    PyPDFBackend.name: PyPDFBackend(),
+    PDFPlumberBackend.name: PDFPlumberBackend(),
+}
+
+
+def get_pdf_backend(name=None):
+    """Backend by name (default settings.PDF_BACKEND); layout if the fast one is not installed."""
+    name = name or settings.PDF_BACKEND
+    if name not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend: {name}. Available: {', '.join(PDF_BACKENDS)}")
+    backend = PDF_BACKENDS[name]
+    if not backend.available():
+        logger.warning(f"[PDF] Backend '{name}' unavailable, using 'layout'")
+        return PDF_BACKENDS["layout"]
+    return backend
+
+
+def _extract_range(backend_name, file_path, start, end):
+    """Worker: plain text of pages [start, end) (0-based)."""
+    return list(PDF_BACKENDS[backend_name].iter_texts(file_path, start, end))
+
+
+# one pool for the process: paying spawn + import cost per upload would
+# eat most of the gain on mid-sized files
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn"))
+    return _pool
+
+
+class PDFLoader(BaseLoader):
+    paged = True
+
+    def __init__(self, backend=None, workers=None, min_parallel_pages=None, pages_per_task=None):
+        self.backend = get_pdf_backend(backend)
+        workers = settings.PDF_EXTRACT_WORKERS if workers is None else workers
+        # by default take the cores the embedding workers leave free
+        self.workers = workers or max(1, (os.cpu_count() or 1) - embedding_worker_count())
+        self.min_parallel_pages = min_parallel_pages or settings.PDF_PARALLEL_MIN_PAGES
+        self.pages_per_task = pages_per_task or settings.PDF_PAGES_PER_TASK
+
+    def iter_pages(self, file_path, on_page=None):
+        """
+        Yield (page_number, text) one page at a time, 1-based.
+        Only the current page is held in memory; `on_page(pages_parsed,
+        pages_total)` is called after each page.
+
+        Files with at least `min_parallel_pages` pages are split into page
+        ranges extracted by a process pool and yielded back in order;
+        smaller ones are read serially, where pool overhead would dominate.
+        """
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + " "
+            total = self.backend.page_count(file_path)
+            if self.workers <= 1 or total < self.min_parallel_pages:
+                texts = self.backend.iter_texts(file_path)
+            else:
+                texts = self._parallel(file_path, total)
+
+            for number, page_text in enumerate(texts, start=1):
+                if on_page:
+                    on_page(number, total)
+                yield number, page_text
         except Exception as e:
             raise Exception(f"Failed to load PDF: {e}")
 
-        text = text.strip()
+    def _parallel(self, file_path, total):
+        pool = _get_pool(self.workers)
+        ranges = deque(
+            (start, min(start + self.pages_per_task, total))
+            for start in range(0, total, self.pages_per_task)
+        )
+        # bounded window of in-flight ranges keeps memory flat on huge files
+        window = deque()
+        max_in_flight = self.workers * 2
+        try:
+            while ranges or window:
+                while ranges and len(window) < max_in_flight:
+                    start, end = ranges.popleft()
+                    window.append(pool.submit(_extract_range, self.backend.name, file_path, start, end))
+                yield from window.popleft().result()
+        finally:
+            for fut in window:
+                fut.cancel()
+
+    def load_text(self, file_path, on_page=None) -> str:
+        """Whole-document text, for callers that really need all of it."""
+        parts = [t for _, t in self.iter_pages(file_path, on_page=on_page) if t]
+        return " ".join(parts).strip()
 
-        return {
-            "raw_text": text,
-            "chunks": self.chunk_text(text),
-            "summary": self.create_summary(text),
-            "topics": self.extract_topics(text)
-        }
+    def load(self, file_path, on_page=None):
+        return LoadedDocument(self.load_text(file_path, on_page=on_page), self, source=str(file_path))
 
     def chunk_text(self, text, chunk_size=1200):
         words = text.split()
@@ -0,0 +1,29 @@
+from pptx import Presentation
+
+from ai.loaders.base import BaseLoader, tidy_text
+
+
+class PPTXLoader(BaseLoader):
+    """
+    Text from every shape on every slide; each slide is one page.
+    Shapes are separated by paragraph breaks, lines within a shape by newlines.
+    """
+
+    paged = True
+
+    def iter_pages(self, file_path, on_page=None):
+        slides = Presentation(file_path).slides
+        total = len(slides)
+        for number, slide in enumerate(slides, start=1):
+            parts = []
+            for shape in slide.shapes:
+                if shape.has_text_frame:
+                    parts.append("\n".join(p.text for p in shape.text_frame.paragraphs))
+                elif getattr(shape, "has_table", False) and shape.has_table:
+                    parts.append("\n".join(cell.text for row in shape.table.rows for cell in row.cells))
+            if on_page:
+                on_page(number, total)
+            yield number, tidy_text("\n\n".join(parts))
+
+    def load_text(self, file_path):
+        return "\n\n".join(t for _, t in self.iter_pages(file_path) if t)
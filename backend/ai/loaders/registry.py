@@ -0,0 +1,170 @@
+# ai/loaders/registry.py
+import threading
+import zipfile
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ai.loaders.base import BaseLoader, LoadedDocument
+
+SNIFF_BYTES = 2048
+
+
+class UnsupportedDocument(ValueError):
+    """No registered loader can read this file."""
+
+
+# ---------------------------------------------------------
+# Content sniffing
+# ---------------------------------------------------------
+def _is_pdf(head: bytes, path: Path) -> bool:
+    return head.startswith(b"%PDF-")
+
+
+def _zip_with(member: str) -> Callable[[bytes, Path], bool]:
+    # docx / pptx are both zip containers; the main part tells them apart
+    def check(head: bytes, path: Path) -> bool:
+        if not head.startswith(b"PK\x03\x04"):
+            return False
+        try:
+            with zipfile.ZipFile(path) as zf:
+                return member in zf.namelist()
+        except zipfile.BadZipFile:
+            return False
+    return check
+
+
+def _is_html(head: bytes, path: Path) -> bool:
+    start = head.lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+    return start.startswith(b"<!doctype html") or start.startswith(b"<html")
+
+
+class LoaderFormat:
+    __slots__ = ("name", "factory", "extensions", "signature", "binary")
+
+    def __init__(self, name, factory, extensions, signature=None, binary=False):
+        self.name = name
+        self.factory = factory
+        self.extensions = tuple(extensions)
+        self.signature = signature
+        # binary formats must match their signature; a .pdf that isn't one is rejected
+        self.binary = binary
+
+
+class LoaderRegistry:
+    """
+    Maps files to loaders.
+
+    The format is decided by content first (magic bytes), then by
+    extension, so a PDF uploaded as `notes.txt` still gets the PDF loader.
+    Loader instances are created once per (format, options) and reused.
+    """
+
+    def __init__(self):
+        self._formats: Dict[str, LoaderFormat] = {}
+        self._by_ext: Dict[str, str] = {}
+        self._instances: Dict[Tuple, BaseLoader] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: str,
+        factory: Callable[..., BaseLoader],
+        extensions: List[str],
+        signature: Optional[Callable[[bytes, Path], bool]] = None,
+        binary: bool = False,
+    ):
+        self._formats[name] = LoaderFormat(name, factory, extensions, signature, binary)
+        for ext in extensions:
+            self._by_ext[ext.lower()] = name
+
+    def extensions(self) -> List[str]:
+        return sorted(self._by_ext)
+
+    def detect(self, path, filename: Optional[str] = None) -> str:
+        path = Path(path)
+        with open(path, "rb") as f:
+            head = f.read(SNIFF_BYTES)
+
+        for fmt in self._formats.values():
+            if fmt.signature and fmt.signature(head, path):
+                return fmt.name
+
+        ext = Path(filename or path.name).suffix.lower()
+        name = self._by_ext.get(ext)
+        if name is None:
+            raise UnsupportedDocument(f"Unsupported file type: {ext or 'unknown'}")
+        if self._formats[name].binary:
+            raise UnsupportedDocument(f"File content does not match its {ext} extension")
+        return name
+
+    def get(self, name: str, **options) -> BaseLoader:
+        key = (name, tuple(sorted(options.items())))
+        loader = self._instances.get(key)
+        if loader is None:
+            with self._lock:
+                loader = self._instances.get(key)
+                if loader is None:
+                    loader = self._formats[name].factory(**options)
+                    self._instances[key] = loader
+        return loader
+
+
+# ---------------------------------------------------------
+# Built-in formats (imports are lazy so optional parsers load on first use)
+# ---------------------------------------------------------
+def _pdf(backend=None):
+    from ai.loaders.pdf_loader import PDFLoader
+    return PDFLoader(backend=backend)
+
+
+def _docx():
+    from ai.loaders.docx_loader import DOCXLoader
+    return DOCXLoader()
+
+
+def _pptx():
+    from ai.loaders.pptx_loader import PPTXLoader
+    return PPTXLoader()
+
+
+def _html():
+    from ai.loaders.html_loader import HTMLLoader
+    return HTMLLoader()
+
+
+def _markdown():
+    from ai.loaders.markdown_loader import MarkdownLoader
+    return MarkdownLoader()
+
+
+def _txt():
+    from ai.loaders.txt_loader import TXTLoader
+    return TXTLoader()
+
+
+registry = LoaderRegistry()
+registry.register("pdf", _pdf, [".pdf"], signature=_is_pdf, binary=True)
+registry.register("docx", _docx, [".docx"], signature=_zip_with("word/document.xml"), binary=True)
+registry.register("pptx", _pptx, [".pptx"], signature=_zip_with("ppt/presentation.xml"), binary=True)
+registry.register("html", _html, [".html", ".htm"], signature=_is_html)
+registry.register("markdown", _markdown, [".md", ".markdown"])
+registry.register("txt", _txt, [".txt"])
+
+
+def supported_extensions() -> List[str]:
+    return registry.extensions()
+
+
+def get_loader(path, filename: Optional[str] = None, pdf_backend: Optional[str] = None) -> BaseLoader:
+    """
+    Shared loader for a file on disk; raises UnsupportedDocument.
+    `filename` is the original upload name when `path` was renamed.
+    """
+    name = registry.detect(path, filename)
+    if name == "pdf":
+        return registry.get(name, backend=pdf_backend)
+    return registry.get(name)
+
+
+def load_document(path, filename: Optional[str] = None, pdf_backend: Optional[str] = None) -> LoadedDocument:
+    return get_loader(path, filename, pdf_backend).load(str(path))
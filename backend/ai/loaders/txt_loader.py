@@ -1,16 +1,10 @@
-class TXTLoader:
-    def load(self, file_path):
-        with open(file_path, "r", encoding="utf-8") as f:
-            text = f.read().replace("\n", " ")
+from ai.loaders.base import BaseLoader, tidy_text
 
-        text = text.strip()
 
-        return {
-            "raw_text": text,
-            "chunks": self.chunk_text(text),
-            "summary": self.create_summary(text),
-            "topics": self.extract_topics(text)
-        }
+class TXTLoader(BaseLoader):
+    def load_text(self, file_path):
+        with open(file_path, "r", encoding="utf-8") as f:
+            return tidy_text(f.read())
 
     def chunk_text(self, text, size=1200):
         return [text[i:i+size] for i in range(0, len(text), size)]
@@ -1,63 +1,210 @@
 # ai/rag/chunker.py
-from typing import List
+from collections import deque
+import threading
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 import re
+import zlib
+
+_WORD = re.compile(r"\S+")
+_SPACE = re.compile(r"\s")
+TOKENIZE_BLOCK_CHARS = 4000  # text handed to the tokenizer per item
+TOKENIZE_BATCH = 32  # blocks tokenized per call
+_CLOSERS = "\"')]\u201d\u2019"
+
+Span = Tuple[int, int]
+
+
+class _TextBuffer:
+    """Growing text addressed by absolute offsets; the consumed prefix is dropped."""
+
+    def __init__(self):
+        self.text = ""
+        self.base = 0
+
+    def append(self, text: str) -> int:
+        start = self.base + len(self.text)
+        self.text += text
+        return start
+
+    def slice(self, start: int, end: int) -> str:
+        return self.text[start - self.base:end - self.base]
+
+    def trim(self, upto: int):
+        if upto > self.base:
+            self.text = self.text[upto - self.base:]
+            self.base = upto
+
 
 class Chunker:
-    def __init__(self, chunk_size: int = 800, chunk_overlap: int = 100, max_text_length: int = 500000):
+    def __init__(self, chunk_size: int = 800, chunk_overlap: int = 100, tokenizer=None):
         """
         chunk_size: approx number of words per chunk
         chunk_overlap: number of overlapping words between chunks
-        max_text_length: maximum characters to process (to prevent memory issues)
+        tokenizer: optional Hugging Face fast tokenizer; chunk_size and
+            chunk_overlap then count its tokens instead of words
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
-        self.max_text_length = max_text_length
+        self.tokenizer = tokenizer
+        # transformers reconfigures the Rust tokenizer per call; ingest jobs share it
+        self._tokenizer_lock = threading.Lock()
 
     def chunk_text(self, text: str) -> List[str]:
+        """All chunks of `text` as a list; prefer `iter_chunks` for large documents."""
+        return list(self.iter_chunks(text))
+
+    def iter_chunks(self, text: str) -> Iterator[str]:
+        """
+        Yield chunks of `text` (slices of the original string) one at a time,
+        so a consumer can embed and store each batch before the next is cut.
+        """
+        for start, end in self.iter_spans(text):
+            yield text[start:end]
+
+    def iter_spans(self, text: str) -> Iterator[Span]:
+        """
+        Yield (start, end) character offsets of each chunk in `text`.
+
+        Words are located with a compiled regex iterator and only the current
+        window of word offsets is kept, so memory does not grow with the
+        number of words and nothing is copied until a caller slices.
+        """
+        return self._cut(self._units(text), lambda start, end: text[start:end])
+
+    def chunk_stream(self, pages: Iterable[Tuple[Optional[int], str]]) -> Iterator[Tuple[str, Optional[int]]]:
+        """
+        Streaming counterpart of `chunk_text` for (page_number, text) pieces.
+
+        Yields (chunk, page_number_of_first_word) as soon as enough words have
+        arrived. Only the text from the current chunk onwards is buffered.
+        """
+        buf = _TextBuffer()
+        marks = deque()  # (offset, page_number) where each buffered page starts
+
+        def words():
+            for page_number, text in pages:
+                if not text:
+                    continue
+                # the newline keeps words on adjacent pages apart
+                start = buf.append(text + "\n")
+                marks.append((start, page_number))
+                yield from self._units(text, start)
+
+        for start, end in self._cut(words(), buf.slice):
+            while len(marks) > 1 and marks[1][0] <= start:
+                marks.popleft()
+            yield buf.slice(start, end), marks[0][1]
+            buf.trim(start)
+
+    # ---------- units ----------
+    def _units(self, text: str, base: int = 0) -> Iterator[Span]:
+        """Offsets of the units chunk sizes are counted in: words, or tokens."""
+        if self.tokenizer is None:
+            for m in _WORD.finditer(text):
+                yield base + m.start(), base + m.end()
+            return
+
+        batch: List[Tuple[int, str]] = []
+        for block in self._blocks(text):
+            batch.append(block)
+            if len(batch) == TOKENIZE_BATCH:
+                yield from self._token_spans(batch, base)
+                batch = []
+        if batch:
+            yield from self._token_spans(batch, base)
+
+    @staticmethod
+    def _blocks(text: str) -> Iterator[Tuple[int, str]]:
+        # split at whitespace so no token straddles two blocks
+        pos, n = 0, len(text)
+        while pos < n:
+            end = min(n, pos + TOKENIZE_BLOCK_CHARS)
+            if end < n:
+                last = None
+                for last in _SPACE.finditer(text, end - TOKENIZE_BLOCK_CHARS // 4, end):
+                    pass
+                if last is not None:
+                    end = last.start() + 1
+            yield pos, text[pos:end]
+            pos = end
+
+    def _token_spans(self, blocks: List[Tuple[int, str]], base: int) -> Iterator[Span]:
+        with self._tokenizer_lock:
+            enc = self.tokenizer(
+                [block for _, block in blocks],
+                add_special_tokens=False,
+                return_offsets_mapping=True,
+                return_attention_mask=False,
+                return_token_type_ids=False,
+            )
+        for (offset, _), offsets in zip(blocks, enc["offset_mapping"]):
+            for start, end in offsets:
+                if end > start:
+                    yield base + offset + start, base + offset + end
+
+    # ---------- boundaries ----------
+    def _cut(self, words: Iterator[Span], text_at: Callable[[int, int], str]) -> Iterator[Span]:
         """
-        Memory-efficient chunking that processes text in smaller batches
-        """
-        if not text or not text.strip():
-            return []
-        
-        # Limit text length to prevent memory issues
-        if len(text) > self.max_text_length:
-            text = text[:self.max_text_length]
-            # Try to cut at a sentence boundary
-            last_period = text.rfind('.')
-            last_newline = text.rfind('\n')
-            cut_point = max(last_period, last_newline)
-            if cut_point > self.max_text_length * 0.9:  # Only if we find a good break point
-                text = text[:cut_point + 1]
-        
-        # Use regex to split on whitespace more efficiently
-        # This is more memory-efficient than split() for very large texts
-        words = re.findall(r'\S+', text)
-        
-        if not words:
-            return []
-
-        # Process in batches to avoid memory issues
-        chunks = []
-        start = 0
-        n = len(words)
-        
-        # Limit total chunks to prevent memory issues
-        max_chunks = 1000
-        chunk_count = 0
-
-        while start < n and chunk_count < max_chunks:
-            end = min(start + self.chunk_size, n)
-            # Use join on slice directly - more memory efficient
-            chunk = " ".join(words[start:end]).strip()
-            if chunk:  # Only add non-empty chunks
-                chunks.append(chunk)
-                chunk_count += 1
-            # advance with overlap
-            start = end - self.chunk_overlap
-            if start < 0:
-                start = 0
-            if start >= n:
-                break
-
-        return chunks
+        Group word spans into chunks of at most `chunk_size` words with
+        `chunk_overlap` words shared between neighbours. Each full window is
+        cut in its second half, at a paragraph break if there is one, else a
+        sentence end, else a word boundary (see `_best_cut`).
+        """
+        window: List[Span] = []
+        covered = -1  # end offset of the last emitted chunk
+        min_words = max(1, self.chunk_size // 2)
+
+        for span in words:
+            window.append(span)
+            if len(window) < self.chunk_size:
+                continue
+            k = self._best_cut(window, min_words, text_at, whole_words=self.tokenizer is None)
+            yield window[0][0], window[k - 1][1]
+            covered = window[k - 1][1]
+            drop = max(1, k - self.chunk_overlap)
+            if self.tokenizer is not None:
+                # start the next chunk on a word, not inside one
+                while drop < len(window) and not text_at(window[drop - 1][1], window[drop][0]):
+                    drop += 1
+            del window[:drop]
+
+        # tail: only if it holds words the last chunk did not cover
+        if window and window[-1][1] > covered:
+            yield window[0][0], window[-1][1]
+
+    @staticmethod
+    def _best_cut(window: List[Span], min_words: int, text_at: Callable[[int, int], str], whole_words: bool = True) -> int:
+        """
+        Number of units from `window` to put in the next chunk.
+
+        Within the best tier of boundary found (paragraph, sentence, word),
+        the cut goes after the candidate whose last two units hash lowest.
+        Cut points then depend on the nearby text, not on where the window
+        started, so after an edit chunking falls back into step with the
+        previous cuts and unchanged text yields identical chunks (which
+        re-ingestion does not embed again).
+        """
+        best = [None, None, None]  # (hash, k) per tier: paragraph, sentence, word
+        for k in range(len(window), min_words - 1, -1):
+            word_start, word_end = window[k - 1]
+            # text between this unit and the next; None at the window edge
+            gap = text_at(word_end, window[k][0]) if k < len(window) else None
+            if gap and "\n\n" in gap:
+                tier = 0
+            elif gap != "" and text_at(max(word_start, word_end - 3), word_end).rstrip(_CLOSERS)[-1:] in (".", "!", "?"):
+                tier = 1
+            elif gap or (gap is None and whole_words):
+                tier = 2
+            else:
+                continue  # inside a word (token mode)
+            if any(best[:tier]):
+                continue  # a better kind of boundary is already available
+
+            anchor = zlib.crc32(text_at(window[max(0, k - 2)][0], word_end).encode("utf-8"))
+            if best[tier] is None or anchor < best[tier][0]:
+                best[tier] = (anchor, k)
+
+        for candidate in best:
+            if candidate is not None:
+                return candidate[1]
+        return len(window)
@@ -114,90 +114,258 @@
 
 
 # ai/rag/rag_pipeline.py
+import threading
+from ai.llms.embedding_cache import content_hash
 from ai.rag.chunker import Chunker
+from ai.utils.concurrency import prefetch
+from app.core.config import settings
+from app.core.logger import logger
 from typing import List, Dict, Any
 
-# Lazy globals
+BATCH_SIZE = 40  # chunks per embed + vector store write
+PAGE_PREFETCH = 8  # pages parsed ahead of embedding when streaming
+
+
+
+class PartialUpdate(RuntimeError):
+    """An update failed and could not be rolled back: old and new chunks are mixed."""
+
+
+# Lazy globals (guarded: slides are generated from several threads)
 _embeddings_client = None
 _vector_store = None
 _retriever = None
+_chunker = None
+_init_lock = threading.RLock()
 
 def get_embeddings_client():
     global _embeddings_client
     if _embeddings_client is None:
-        from ai.llms.embeddings_client import EmbeddingsClient
-        _embeddings_client = EmbeddingsClient()
+        with _init_lock:
+            if _embeddings_client is None:
+                from ai.llms.embeddings_client import EmbeddingsClient
+                _embeddings_client = EmbeddingsClient()
     return _embeddings_client
 
 def get_vector_store(persist_dir=None):
     global _vector_store
     if _vector_store is None:
-        from ai.rag.vector_store import VectorStore
-        _vector_store = VectorStore(persist_directory=persist_dir)
+        with _init_lock:
+            if _vector_store is None:
+                from ai.rag.vector_store import VectorStore
+                _vector_store = VectorStore(persist_directory=persist_dir)
     return _vector_store
 
 def get_retriever():
     global _retriever
     if _retriever is None:
-        from ai.rag.retriever import Retriever
-        _retriever = Retriever(
-            vs=get_vector_store(),
-            embed_client=get_embeddings_client()
-        )
+        with _init_lock:
+            if _retriever is None:
+                from ai.rag.retriever import Retriever
+                _retriever = Retriever(
+                    vs=get_vector_store(),
+                    embed_client=get_embeddings_client()
+                )
     return _retriever
 
 
+def get_chunker():
+    global _chunker
+    if _chunker is None:
+        with _init_lock:
+            if _chunker is None:
+                _chunker = _build_chunker()
+    return _chunker
+
+def _build_chunker():
+    if settings.CHUNKING_MODE == "tokens":
+        try:
+            tokenizer, max_tokens = get_embeddings_client().get_tokenizer()
+            logger.info(f"[Chunker] Token chunks of {max_tokens} tokens")
+            return Chunker(chunk_size=max_tokens, chunk_overlap=settings.CHUNK_TOKEN_OVERLAP, tokenizer=tokenizer)
+        except Exception as e:
+            logger.warning(f"[Chunker] Tokenizer unavailable, using word chunks: {e}")
+    return Chunker()
+
+
 class RAGPipeline:
     def __init__(self, persist_dir: str = None):
-        self.chunker = Chunker()
+        self._chunker = None
         self.persist_dir = persist_dir
 
-    def ingest_document(self, document_id: str, text: str, metadata: Dict = None):
-        metadata = metadata or {}
-        chunks = self.chunker.chunk_text(text)
-        if not chunks:
-            return []
+    @property
+    def chunker(self) -> Chunker:
+        # resolved on first use: token mode loads the model's tokenizer
+        if self._chunker is None:
+            self._chunker = get_chunker()
+        return self._chunker
+
+    def ingest_document(self, document_id: str, text: str, metadata: Dict = None, on_progress=None) -> Dict[str, Any]:
+        """
+        Chunk -> embed batch -> write batch, streamed: at most one batch of
+        chunks exists at a time, whatever the document size.
+        `on_progress(chunks_done, None)` is called after every batch.
+
+        Re-ingesting an existing `document_id` is an update: see `_sync_chunks`.
+        """
+        chunks = ((chunk, None) for chunk in self.chunker.iter_chunks(text))
+        return self._sync_chunks(document_id, chunks, metadata, on_progress)
+
+    def ingest_pages(self, document_id: str, pages, metadata: Dict = None, on_progress=None) -> Dict[str, Any]:
+        """
+        Streaming ingest from an iterable of (page_number, text).
+
+        Pages are parsed on a background thread a few pages ahead while
+        earlier chunks are embedded, so neither the full text nor the full
+        chunk list is ever held in memory. Chunks carry the page they start
+        on. `on_progress` gets (chunks_done, None) since the total is
+        unknown until the last page.
+        """
+        chunks = self.chunker.chunk_stream(prefetch(pages, size=PAGE_PREFETCH))
+        return self._sync_chunks(document_id, chunks, metadata, on_progress)
+
+    def _sync_chunks(self, document_id: str, chunks, metadata: Dict = None, on_progress=None) -> Dict[str, Any]:
+        """
+        Make the stored chunks of `document_id` match `chunks`.
+
+        Chunk ids are derived from content, so a chunk whose text is already
+        stored for the document keeps its id and embedding (only its position
+        metadata is refreshed); new text is embedded and written; chunks no
+        longer present are deleted at the end. Editing one page of a long
+        document therefore costs a few embeddings. For a new document this is
+        a plain ingest, and a failure removes the batches already written; a
+        failed update is rolled back to the previous version, and raises
+        PartialUpdate if even that fails.
+
+        Returns {"chunk_ids", "added", "kept", "removed"}.
+        """
+        vector_store = get_vector_store(self.persist_dir)
+        existing = vector_store.get_document_chunks(document_id)
 
+        try:
+            chunk_ids, added = self._ingest_chunks(document_id, chunks, metadata, on_progress, existing=existing)
+        except Exception as e:
+            if not existing:
+                self.delete_document(document_id)
+            else:
+                self._rollback(document_id, existing, e)
+            raise
+
+        current = set(chunk_ids)
+        stale = [cid for cid in existing if cid not in current]
+        if stale:
+            vector_store.delete_ids(stale)
+
+        return {
+            "chunk_ids": chunk_ids,
+            "added": added,
+            "kept": len(chunk_ids) - added,
+            "removed": len(stale),
+        }
+
+    def _rollback(self, document_id: str, existing: Dict[str, Dict], error: Exception):
+        """Drop chunks a failed update added and restore the old positions."""
+        vector_store = get_vector_store(self.persist_dir)
+        try:
+            added = [cid for cid in vector_store.get_document_chunks(document_id) if cid not in existing]
+            vector_store.delete_ids(added)
+            vector_store.update_metadatas(list(existing), list(existing.values()))
+            logger.warning(f"[RAG] Update of {document_id} failed; rolled back {len(added)} new chunks")
+        except Exception as rollback_error:
+            logger.error(f"[RAG] Rollback of {document_id} failed: {rollback_error}")
+            raise PartialUpdate(
+                f"Update failed ({error}) and could not be rolled back: document {document_id} "
+                f"holds chunks from both versions. Upload the file again to repair it."
+            ) from error
+
+    def _ingest_chunks(self, document_id: str, chunks, metadata: Dict = None, on_progress=None, existing: Dict[str, Dict] = None):
+        """Write (text, page) chunks in batches; returns (all chunk ids, number newly embedded)."""
+        metadata = metadata or {}
+        existing = existing or {}
         embed_client = get_embeddings_client()
         vector_store = get_vector_store(self.persist_dir)
 
-        BATCH_SIZE = 40
-        all_ids = []
-
-        for start in range(0, len(chunks), BATCH_SIZE):
-            end = min(start + BATCH_SIZE, len(chunks))
-            batch = chunks[start:end]
+        if on_progress:
+            on_progress(0, None)
 
-            embeddings = embed_client.embed_texts(batch)
-
-            ids = []
-            metas = []
-            for i in range(start, end):
-                cid = f"{document_id}__chunk__{i}"
-                ids.append(cid)
+        all_ids = []
+        occurrences: Dict[str, int] = {}  # chunk hash -> times seen, for repeated text
+        added = 0
+
+        def chunk_id(text):
+            digest = content_hash(text)[:16]
+            n = occurrences.get(digest, 0)
+            occurrences[digest] = n + 1
+            return f"{document_id}__{digest}" if n == 0 else f"{document_id}__{digest}_{n}"
+
+        def flush(batch):
+            nonlocal added
+            batch_ids = []
+            new_ids, new_texts, new_metas = [], [], []
+            moved_ids, moved_metas = [], []
+
+            for offset, (text, page) in enumerate(batch):
+                i = len(all_ids) + offset
+                cid = chunk_id(text)
+                batch_ids.append(cid)
                 meta = {"document_id": document_id, "chunk_index": i}
+                if page is not None:
+                    meta["page"] = page
                 meta.update(metadata)
-                metas.append(meta)
-
-            vector_store.add_documents(
-                ids=ids,
-                texts=batch,
-                embeddings=embeddings,
-                metadatas=metas
-            )
 
-            all_ids.extend(ids)
-
-        return all_ids
+                if cid not in existing:
+                    new_ids.append(cid)
+                    new_texts.append(text)
+                    new_metas.append(meta)
+                elif existing[cid] != meta:
+                    moved_ids.append(cid)
+                    moved_metas.append(meta)
+
+            if new_ids:
+                vector_store.add_documents(
+                    ids=new_ids,
+                    texts=new_texts,
+                    embeddings=embed_client.embed_texts(new_texts),
+                    metadatas=new_metas
+                )
+                added += len(new_ids)
+            vector_store.update_metadatas(moved_ids, moved_metas)
+
+            all_ids.extend(batch_ids)
+            if on_progress:
+                on_progress(len(all_ids), None)
+
+        batch = []
+        for chunk in chunks:
+            batch.append(chunk)
+            if len(batch) == BATCH_SIZE:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+
+        return all_ids, added
 
     def retrieve_for_topic(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
         retriever = get_retriever()
         return retriever.retrieve(query, top_k=top_k)
 
+    def retrieve_for_topics(self, queries: List[str], top_k: int = 5) -> List[List[Dict[str, Any]]]:
+        retriever = get_retriever()
+        return retriever.retrieve_many(queries, top_k=top_k)
+
     def retrieve_for_document(self, document_id: str, query: str, top_k: int = 5):
         retriever = get_retriever()
         return retriever.retrieve_by_document(document_id=document_id, query=query, top_k=top_k)
 
+    def has_document(self, document_id: str) -> bool:
+        try:
+            col = get_vector_store(self.persist_dir).get_collection()
+            results = col.get(where={"document_id": document_id}, limit=1, include=[])
+            return bool(results and results.get("ids"))
+        except:
+            return False
+
     def delete_document(self, document_id: str) -> bool:
         try:
             vs = get_vector_store(self.persist_dir)
@@ -33,6 +33,7 @@
 
 # ai/rag/retriever.py
 from typing import List, Dict, Any
+from ai.rag.vector_store import as_query
 
 class Retriever:
     def __init__(self, vs=None, embed_client=None):
@@ -43,12 +44,25 @@ class Retriever:
         q_vec = self.embed.embed_text(query)
         return self.vs.similarity_search(q_vec, n_results=top_k)
 
+    def retrieve_many(self, queries: List[str], top_k: int = 5) -> List[List[Dict[str, Any]]]:
+        """
+        Hits for several queries at once: one encode batch and one
+        multi-vector index query. Duplicate queries are only searched once.
+        """
+        unique = list(dict.fromkeys(queries))
+        if not unique:
+            return []
+        # queries are one-off; keep them out of the chunk cache
+        vectors = self.embed.embed_texts(unique, use_cache=False)
+        hits = dict(zip(unique, self.vs.similarity_search_many(vectors, n_results=top_k)))
+        return [hits[q] for q in queries]
+
     def retrieve_by_document(self, document_id: str, query: str, top_k: int = 5):
         q_vec = self.embed.embed_text(query)
 
         col = self.vs.get_collection()
         results = col.query(
-            query_embeddings=[q_vec],
+            query_embeddings=[as_query(q_vec)],
             n_results=top_k,
             where={"document_id": document_id},
             include=["documents", "metadatas", "distances"]
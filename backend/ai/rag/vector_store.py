@@ -80,8 +80,22 @@
 
 # ai/rag/vector_store.py
 import os
+import threading
+import numpy as np
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
+
+Embeddings = Union[np.ndarray, List[List[float]]]
+
+
+def as_matrix(embeddings: Embeddings) -> np.ndarray:
+    """Contiguous float32 matrix, the form Chroma stores; no copy if already one."""
+    return np.ascontiguousarray(embeddings, dtype=np.float32)
+
+
+def as_query(embedding) -> List[float]:
+    """Single query vector as a plain list (the query API boundary)."""
+    return np.asarray(embedding, dtype=np.float32).ravel().tolist()
 
 class VectorStore:
     def __init__(self, persist_directory: Optional[str] = None, collection_name: str = "slides"):
@@ -91,24 +105,32 @@ class VectorStore:
         self.collection_name = collection_name
         self.client = None
         self.collection = None
+        self._lock = threading.Lock()
 
     def get_collection(self):
-        if self.client is None:
-            import chromadb
-            try:
-                self.client = chromadb.PersistentClient(path=self.persist_directory)
-            except:
-                from chromadb.config import Settings
-                self.client = chromadb.Client(Settings(
-                    chroma_db_impl="duckdb+parquet",
-                    persist_directory=self.persist_directory
-                ))
-
-            self.collection = self.client.get_or_create_collection(name=self.collection_name)
+        if self.collection is None:
+            with self._lock:
+                if self.collection is None:
+                    self._connect()
         return self.collection
 
-    def add_documents(self, ids: List[str], texts: List[str], embeddings: List[List[float]], metadatas: List[Dict]):
+    def _connect(self):
+        import chromadb
+        try:
+            self.client = chromadb.PersistentClient(path=self.persist_directory)
+        except:
+            from chromadb.config import Settings
+            self.client = chromadb.Client(Settings(
+                chroma_db_impl="duckdb+parquet",
+                persist_directory=self.persist_directory
+            ))
+
+        self.collection = self.client.get_or_create_collection(name=self.collection_name)
+
+    def add_documents(self, ids: List[str], texts: List[str], embeddings: Embeddings, metadatas: List[Dict]):
         col = self.get_collection()
+        # hand Chroma the ndarray itself rather than nested lists
+        embeddings = as_matrix(embeddings)
         try:
             col.add(
                 ids=ids,
@@ -124,28 +146,58 @@ class VectorStore:
                 metadatas=metadatas
             )
 
+        self._persist()
+
+    def get_document_chunks(self, document_id: str) -> Dict[str, Dict]:
+        """Chunk id -> metadata for everything stored under `document_id` (no embeddings)."""
+        col = self.get_collection()
+        results = col.get(where={"document_id": document_id}, include=["metadatas"])
+        if not results:
+            return {}
+        return dict(zip(results.get("ids") or [], results.get("metadatas") or []))
+
+    def update_metadatas(self, ids: List[str], metadatas: List[Dict]):
+        if not ids:
+            return
+        self.get_collection().update(ids=ids, metadatas=metadatas)
+        self._persist()
+
+    def delete_ids(self, ids: List[str], batch_size: int = 1000):
+        col = self.get_collection()
+        for start in range(0, len(ids), batch_size):
+            col.delete(ids=ids[start:start + batch_size])
+        self._persist()
+
+    def _persist(self):
         if hasattr(self.client, "persist"):
             try:
                 self.client.persist()
             except:
                 pass
 
-    def similarity_search(self, query_embedding: List[float], n_results: int = 5):
+    def similarity_search(self, query_embedding, n_results: int = 5):
+        return self.similarity_search_many([as_query(query_embedding)], n_results=n_results)[0]
+
+    def similarity_search_many(self, query_embeddings: Embeddings, n_results: int = 5) -> List[List[Dict]]:
+        """One index query for several vectors; a list of hits per query, in order."""
+        queries = as_matrix(query_embeddings)
+        if not len(queries):
+            return []
+
         col = self.get_collection()
         results = col.query(
-            query_embeddings=[query_embedding],
+            query_embeddings=queries,
             n_results=n_results,
             include=["documents", "metadatas", "distances"]
         )
 
         if not results or "documents" not in results:
-            return []
-
-        docs = results["documents"][0]
-        metas = results["metadatas"][0]
-        distances = results["distances"][0]
+            return [[] for _ in range(len(queries))]
 
         out = []
-        for doc, meta, dist in zip(docs, metas, distances):
-            out.append({"text": doc, "metadata": meta, "distance": dist})
+        for docs, metas, distances in zip(results["documents"], results["metadatas"], results["distances"]):
+            out.append([
+                {"text": doc, "metadata": meta, "distance": dist}
+                for doc, meta, dist in zip(docs, metas, distances)
+            ])
         return out
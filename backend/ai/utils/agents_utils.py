@@ -1,15 +1,39 @@
+import json
+import re
+from typing import Callable, Optional
+
 from ai.llms.groq_client import GroqLLM
+from ai.llms.response_cache import ResponseCache, get_response_cache
+
+
+def is_json(text: str) -> bool:
+    """True when the whole of `text` is JSON."""
+    try:
+        json.loads(text)
+        return True
+    except (json.JSONDecodeError, ValueError, TypeError):
+        return False
+
+
+def has_json(text: str) -> bool:
+    """True when `text` is JSON, or holds a JSON object amid other output."""
+    if is_json(text):
+        return True
+    match = re.search(r"\{[\s\S]*\}", text or "")
+    return bool(match) and is_json(match.group(0))
+
 
 class BaseAgent:
-    def __init__(self, system_prompt: str):
+    def __init__(self, system_prompt: str, temperature: float = 0.2):
         self.llm = GroqLLM()
         self.system_prompt = system_prompt
+        self.temperature = temperature
 
-    def run(self, user_prompt: str):
-        prompt = f"""
+    def build_prompt(self, user_prompt: str, system_prompt: str = None) -> str:
+        return f"""
         You are an autonomous AI agent.
 
-        {self.system_prompt}
+        {system_prompt or self.system_prompt}
 
         USER REQUEST:
         {user_prompt}
@@ -17,4 +41,57 @@ class BaseAgent:
         Return STRICTLY in valid JSON only.
         """
 
-        return self.llm.generate(prompt)
+    def _cache_key(self, user_prompt: str, system_prompt: str = None) -> str:
+        return ResponseCache.make_key(self.llm.model, self.temperature, system_prompt or self.system_prompt, user_prompt)
+
+    def run(
+        self,
+        user_prompt: str,
+        use_cache: bool = True,
+        system_prompt: str = None,
+        validate: Optional[Callable[[str], bool]] = None,
+    ):
+        """
+        Call the LLM. Identical requests are served from the response cache
+        unless `use_cache=False`. `system_prompt` replaces the agent's own for
+        this call, for requests that need a different output schema.
+
+        Only replies that pass `validate` (default: parseable JSON) are
+        cached, and a cached reply that no longer passes is ignored, so a
+        malformed completion is never replayed.
+        """
+        validate = validate or has_json
+        cache = get_response_cache() if use_cache else None
+        if cache:
+            key = self._cache_key(user_prompt, system_prompt)
+            cached = cache.get(key)
+            if cached is not None and validate(cached):
+                return cached
+
+        result = self.llm.generate(self.build_prompt(user_prompt, system_prompt), temperature=self.temperature)
+
+        if cache and result and validate(result):
+            cache.set(key, result)
+        return result
+
+    async def arun(
+        self,
+        user_prompt: str,
+        use_cache: bool = True,
+        system_prompt: str = None,
+        validate: Optional[Callable[[str], bool]] = None,
+    ):
+        """Async counterpart of `run`; the disk cache tier runs off the event loop."""
+        validate = validate or has_json
+        cache = get_response_cache() if use_cache else None
+        if cache:
+            key = self._cache_key(user_prompt, system_prompt)
+            cached = await cache.aget(key)
+            if cached is not None and validate(cached):
+                return cached
+
+        result = await self.llm.agenerate(self.build_prompt(user_prompt, system_prompt), temperature=self.temperature)
+
+        if cache and result and validate(result):
+            await cache.aset(key, result)
+        return result
@@ -0,0 +1,181 @@
+# ai/utils/concurrency.py
+import asyncio
+import collections
+import queue
+import threading
+from contextlib import contextmanager, asynccontextmanager
+from app.core.config import settings
+
+
+class _SharedSemaphore:
+    """
+    Counting semaphore usable from threads and from any event loop at once.
+
+    Waiters queue FIFO whatever kind they are, and a release hands its
+    permit straight to the oldest waiter: a thread is woken through an
+    Event, a coroutine through its loop (call_soon_threadsafe), so async
+    callers wait without polling and without blocking their loop.
+    """
+
+    def __init__(self, value: int):
+        self._value = value
+        self._lock = threading.Lock()
+        self._waiters = collections.deque()  # callables that hand over one permit
+
+    def acquire(self):
+        with self._lock:
+            if self._value > 0 and not self._waiters:
+                self._value -= 1
+                return
+            event = threading.Event()
+            self._waiters.append(event.set)
+        event.wait()
+
+    async def aacquire(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._value > 0 and not self._waiters:
+                self._value -= 1
+                return
+            fut = loop.create_future()
+
+            def handoff():
+                # runs on the waiter's loop; a cancelled waiter passes the permit on
+                if fut.cancelled():
+                    self.release()
+                else:
+                    fut.set_result(None)
+
+            def grant():
+                try:
+                    loop.call_soon_threadsafe(handoff)
+                except RuntimeError:  # loop already closed
+                    self.release()
+
+            self._waiters.append(grant)
+
+        try:
+            await fut
+        except asyncio.CancelledError:
+            with self._lock:
+                queued = grant in self._waiters
+                if queued:
+                    self._waiters.remove(grant)
+            # granted, but cancelled before we resumed: give the permit back
+            if not queued and fut.done() and not fut.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        with self._lock:
+            if not self._waiters:
+                self._value += 1
+                return
+            grant = self._waiters.popleft()
+        grant()
+
+
+class ProviderLimiter:
+    """
+    Caps the number of in-flight calls per upstream provider.
+    Providers without a configured limit are not throttled.
+    """
+
+    def __init__(self, limits: dict):
+        self._semaphores = {
+            name: _SharedSemaphore(max(1, int(limit)))
+            for name, limit in limits.items()
+        }
+
+    @contextmanager
+    def slot(self, provider: str):
+        sem = self._semaphores.get(provider)
+        if sem is None:
+            yield
+            return
+
+        sem.acquire()
+        try:
+            yield
+        finally:
+            sem.release()
+
+    @asynccontextmanager
+    async def aslot(self, provider: str):
+        """
+        Event-loop friendly variant of `slot`. Shares the same budget and
+        queue as the threaded callers but never blocks the loop while waiting.
+        """
+        sem = self._semaphores.get(provider)
+        if sem is None:
+            yield
+            return
+
+        await sem.aacquire()
+        try:
+            yield
+        finally:
+            sem.release()
+
+
+limiter = ProviderLimiter({
+    "groq": settings.GROQ_MAX_CONCURRENCY,
+    "tavily": settings.TAVILY_MAX_CONCURRENCY,
+    "huggingface": settings.HF_MAX_CONCURRENCY,
+    "rag": settings.RAG_MAX_CONCURRENCY,
+})
+
+
+def provider_slot(provider: str):
+    """Usage: `with provider_slot("groq"): ...`"""
+    return limiter.slot(provider)
+
+
+def provider_aslot(provider: str):
+    """Usage: `async with provider_aslot("groq"): ...`"""
+    return limiter.aslot(provider)
+
+
+_DONE = object()
+
+
+def prefetch(iterable, size: int = 8):
+    """
+    Iterate `iterable` on a background thread, at most `size` items ahead.
+    Lets a slow producer (e.g. PDF parsing) overlap with a slow consumer
+    (embedding) while memory stays bounded by the window.
+    """
+    buf = queue.Queue(maxsize=max(1, size))
+    stop = threading.Event()
+
+    def put(entry) -> bool:
+        # give up once the consumer has gone away
+        while not stop.is_set():
+            try:
+                buf.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+        except BaseException as e:
+            put((_DONE, e))
+            return
+        put((_DONE, None))
+
+    threading.Thread(target=produce, name="prefetch", daemon=True).start()
+    try:
+        while True:
+            item, error = buf.get()
+            if item is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
@@ -0,0 +1,139 @@
+# ai/utils/task_graph.py
+import asyncio
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Iterable
+
+
+class TaskGraph:
+    """
+    Small dependency graph runner.
+
+    Each node is a callable that receives the results of its dependencies
+    (in declaration order). A node starts as soon as all of its dependencies
+    are finished, so the wall time is the longest chain rather than the sum
+    of every step. Per-node timings are recorded in `self.timings`.
+
+    `run()` uses a thread pool; `arun()` runs on the event loop, awaiting
+    coroutine nodes directly and pushing plain callables to a thread.
+    Both accept an `on_done(name, result)` callback fired as each node finishes.
+    """
+
+    def __init__(self):
+        self._nodes: Dict[str, tuple] = {}
+        self.results: Dict[str, Any] = {}
+        self.timings: Dict[str, Dict[str, float]] = {}
+
+    def add(self, name: str, fn: Callable, deps: Iterable[str] = ()):
+        if name in self._nodes:
+            raise ValueError(f"Duplicate task: {name}")
+        self._nodes[name] = (fn, tuple(deps))
+        return self
+
+    def _validate(self):
+        for name, (_, deps) in self._nodes.items():
+            for d in deps:
+                if d not in self._nodes:
+                    raise ValueError(f"Task '{name}' depends on unknown task '{d}'")
+
+        # Kahn's algorithm: every node must be reachable in topological order
+        remaining = {name: set(deps) for name, (_, deps) in self._nodes.items()}
+        while remaining:
+            ready = [n for n, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Cycle detected between tasks: {sorted(remaining)}")
+            for n in ready:
+                del remaining[n]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def run(self, on_done: Callable = None) -> Dict[str, Any]:
+        """Execute all nodes with maximum overlap. Re-raises the first failure."""
+        self._validate()
+        if not self._nodes:
+            return self.results
+
+        started = time.perf_counter()
+        pending = dict(self._nodes)
+        running = {}
+
+        def timed(name, fn, args):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                self._record(name, started, t0)
+
+        with ThreadPoolExecutor(max_workers=len(self._nodes), thread_name_prefix="task") as pool:
+            while pending or running:
+                for name, fn, args in self._pop_ready(pending):
+                    running[pool.submit(timed, name, fn, args)] = name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name = running.pop(fut)
+                    try:
+                        self.results[name] = fut.result()
+                    except Exception:
+                        for other in running:
+                            other.cancel()
+                        raise
+                    if on_done:
+                        on_done(name, self.results[name])
+
+        self._record("total", started, started)
+        return self.results
+
+    async def arun(self, on_done: Callable = None) -> Dict[str, Any]:
+        """Async counterpart of `run`."""
+        self._validate()
+        if not self._nodes:
+            return self.results
+
+        started = time.perf_counter()
+        pending = dict(self._nodes)
+        running = {}
+
+        async def timed(name, fn, args):
+            t0 = time.perf_counter()
+            try:
+                if inspect.iscoroutinefunction(fn):
+                    return await fn(*args)
+                return await asyncio.to_thread(fn, *args)
+            finally:
+                self._record(name, started, t0)
+
+        while pending or running:
+            for name, fn, args in self._pop_ready(pending):
+                running[asyncio.create_task(timed(name, fn, args))] = name
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = running.pop(task)
+                try:
+                    self.results[name] = task.result()
+                except Exception:
+                    for other in running:
+                        other.cancel()
+                    raise
+                if on_done:
+                    on_done(name, self.results[name])
+
+        self._record("total", started, started)
+        return self.results
+
+    def _pop_ready(self, pending: dict):
+        """Remove and return (name, fn, dep_results) for every node whose deps are done."""
+        ready = [n for n, (_, deps) in pending.items() if all(d in self.results for d in deps)]
+        out = []
+        for name in ready:
+            fn, deps = pending.pop(name)
+            out.append((name, fn, [self.results[d] for d in deps]))
+        return out
+
+    def _record(self, name: str, started: float, t0: float):
+        self.timings[name] = {
+            "start_ms": round((t0 - started) * 1000, 1),
+            "duration_ms": round((time.perf_counter() - t0) * 1000, 1),
+        }
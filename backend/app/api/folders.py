@@ -176,17 +176,16 @@
 
 
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
-import time
-from app.api.slides import PRESENTATIONS
+from app.services.folder_service import FolderService
 
 router = APIRouter()
 
 # --------------------------
-# In-memory folder database
+# Persistent folder store
 # --------------------------
-FOLDERS_DB = {}
+folder_service = FolderService()
 
 class FolderCreate(BaseModel):
     name: str
@@ -197,24 +196,15 @@ class FolderCreate(BaseModel):
 # ---------------------------------------------------------
 @router.post("/create")
 def create_folder(payload: FolderCreate):
-    folder_id = str(int(time.time() * 1000))
-
-    FOLDERS_DB[folder_id] = {
-        "id": folder_id,
-        "name": payload.name,
-        "created_at": int(time.time()),
-        "presentations": []   # store IDs only
-    }
-
-    return FOLDERS_DB[folder_id]
+    return folder_service.create(payload.name)
 
 
 # ---------------------------------------------------------
 # GET ALL FOLDERS
 # ---------------------------------------------------------
 @router.get("/all")
-def get_all_folders():
-    return list(FOLDERS_DB.values())
+def get_all_folders(limit: int = Query(100, ge=1, le=500), offset: int = Query(0, ge=0)):
+    return folder_service.list_folders(limit=limit, offset=offset)
 
 
 # ---------------------------------------------------------
@@ -225,17 +215,14 @@ def add_presentation_to_folder(folder_id: str, payload: dict):
 
     presentation_id = payload.get("presentation_id")
 
-    if folder_id not in FOLDERS_DB:
+    if not folder_service.exists(folder_id):
         raise HTTPException(status_code=404, detail="Folder not found")
 
     if presentation_id is None:
         raise HTTPException(400, "presentation_id missing")
 
-    if "presentations" not in FOLDERS_DB[folder_id]:
-        FOLDERS_DB[folder_id]["presentations"] = []
-
-    if presentation_id not in FOLDERS_DB[folder_id]["presentations"]:
-        FOLDERS_DB[folder_id]["presentations"].append(presentation_id)
+    if not folder_service.add_presentation(folder_id, presentation_id):
+        raise HTTPException(404, "Presentation not found")
 
     return {"success": True}
 
@@ -247,23 +234,11 @@ def add_presentation_to_folder(folder_id: str, payload: dict):
 # ---------------------------------------------------------
 @router.get("/{folder_id}/presentations")
 def get_folder_presentations(folder_id: str):
-    if folder_id not in FOLDERS_DB:
+    ids = folder_service.presentation_ids(folder_id)
+    if ids is None:
         raise HTTPException(404, "Folder not found")
 
-    valid = []
-    invalid = []
-
-    for pid in FOLDERS_DB[folder_id]["presentations"]:
-        if pid in PRESENTATIONS:
-            valid.append(pid)
-        else:
-            invalid.append(pid)
-
-    # auto cleanup invalid IDs
-    if invalid:
-        FOLDERS_DB[folder_id]["presentations"] = valid
-
-    return {"presentation_ids": valid}
+    return {"presentation_ids": ids}
 
 
 # ---------------------------------------------------------
@@ -271,8 +246,7 @@ def get_folder_presentations(folder_id: str):
 # ---------------------------------------------------------
 @router.delete("/{folder_id}")
 def delete_folder(folder_id: str):
-    if folder_id not in FOLDERS_DB:
+    if not folder_service.delete(folder_id):
         raise HTTPException(status_code=404, detail="Folder not found")
 
-    del FOLDERS_DB[folder_id]
     return {"success": True}
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse
 from pydantic import BaseModel
 from typing import Optional
 import requests
 import os
-import base64
-import time
+from ai.llms.image_cache import ImageGenerationError, cached_image
+from ai.utils.concurrency import provider_slot
+from app.services.image_service import ImageService
+from app.services.image_store import get_image_store, media_type
 
 router = APIRouter()
 
@@ -13,19 +16,9 @@ MODEL_ID = "stabilityai/stable-diffusion-xl-base-1.0"
 HF_API_URL = f"https://router.huggingface.co/hf-inference/models/{MODEL_ID}"
 
 # ------------------------------
-# SIMPLE IN-MEMORY IMAGE STORAGE
+# PERSISTENT IMAGE STORAGE (SQL)
 # ------------------------------
-IMAGES_DB = {}  
-"""
-IMAGES_DB = {
-   "id1234": { 
-       "id": "id1234",
-       "url": "data:image/png;base64,...",
-       "prompt": "sunset mountain",
-       "created_at": 123456789
-   }
-}
-"""
+image_service = ImageService()
 
 class ImageGenRequest(BaseModel):
     prompt: str
@@ -52,44 +45,78 @@ def generate_image(payload: ImageGenRequest):
         "options": {"wait_for_model": True}
     }
 
-    resp = requests.post(url, headers=headers, json=req)
+    def fetch():
+        # shares the Hugging Face limit with slide images
+        with provider_slot("huggingface"):
+            resp = requests.post(url, headers=headers, json=req)
+        if resp.status_code != 200:
+            raise ImageGenerationError(resp.text)
+        return resp.content
 
-    if resp.status_code != 200:
-        raise HTTPException(status_code=500, detail=f"HF API error: {resp.text}")
-
-    # Convert to base64
-    img_b64 = base64.b64encode(resp.content).decode()
-    final_url = f"data:image/png;base64,{img_b64}"
+    # Bytes are stored on disk (deduped by content hash) and only the URL is kept;
+    # same (model, prompt, options) -> the stored image, concurrent duplicates share one call
+    try:
+        stored = cached_image(payload.model or MODEL_ID, payload.prompt, req["options"], fetch)
+    except ImageGenerationError as e:
+        raise HTTPException(status_code=500, detail=f"HF API error: {e}")
 
     # SAVE IMAGE AUTOMATICALLY
-    img_id = str(int(time.time() * 1000))
-    IMAGES_DB[img_id] = {
-        "id": img_id,
-        "url": final_url,
-        "prompt": payload.prompt,
-        "created_at": img_id,
-    }
+    return image_service.create(
+        url=stored["url"],
+        prompt=payload.prompt,
+        sha256=stored["sha256"],
+        thumbnail_url=stored["thumbnail_url"],
+    )
+
+# -----------------------
+# SERVE IMAGE FILES
+# -----------------------
+# Content-addressed files never change, so the hash is a strong ETag
+# and clients may cache them forever.
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+
+
+def _serve(request: Request, path, sha256: str, media: str):
+    etag = f'"{sha256}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": IMMUTABLE_CACHE})
+
+    # FileResponse streams from disk and honours Range requests
+    return FileResponse(path, media_type=media, headers={"ETag": etag, "Cache-Control": IMMUTABLE_CACHE})
+
+
+@router.get("/files/{name}")
+def get_image_file(name: str, request: Request):
+    store = get_image_store()
+    path = store.locate(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    sha256, extension = store.parse_name(name)
+    return _serve(request, path, sha256, media_type(extension))
+
+
+@router.get("/thumbs/{name}")
+def get_image_thumbnail(name: str, request: Request):
+    path = get_image_store().locate_thumbnail(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Thumbnail not found")
+
+    return _serve(request, path, name.partition(".")[0], "image/jpeg")
 
-    return {
-        "id": img_id,
-        "url": final_url,
-        "prompt": payload.prompt,
-        "created_at": img_id,
-    }
 
 # -----------------------
 # FETCH ALL IMAGES
 # -----------------------
 @router.get("/all")
-def get_all_images():
-    return list(IMAGES_DB.values())
+def get_all_images(limit: int = Query(100, ge=1, le=500), offset: int = Query(0, ge=0)):
+    return image_service.list_images(limit=limit, offset=offset)
 
 # -----------------------
 # DELETE AN IMAGE
 # -----------------------
 @router.delete("/{image_id}")
 def delete_image(image_id: str):
-    if image_id not in IMAGES_DB:
+    if not image_service.delete(image_id):
         raise HTTPException(status_code=404, detail="Image not found")
-    del IMAGES_DB[image_id]
     return {"success": True}
@@ -1,10 +1,12 @@
 # app/api/slides.py
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Literal, Optional
 from pathlib import Path
+import json
 
 # Orchestrator (FULL MULTI-AGENT PIPELINE)
 from ai.agents.orchestrator import SlideOrchestrator
@@ -12,14 +14,15 @@ from ai.agents.orchestrator import SlideOrchestrator
 # Export Service
 from app.services.export_service import ExportService
 
+# Persistent presentation store
+from app.services.presentation_service import PresentationService
+
 router = APIRouter()
 
 # Initialize Orchestrator + Export Service
 orchestrator = SlideOrchestrator()
 export_service = ExportService()
-
-# In-memory DB (temporary)
-PRESENTATIONS = {}
+presentations = PresentationService()
 
 # -------------------------------------------------------
 # Request Models
@@ -57,16 +60,21 @@ class UpdateSlideRequest(BaseModel):
 # -------------------------------------------------------
 
 @router.get("/all")
-def get_all_presentations():
-    return [
-        {
-            "presentation_id": pid,
-            "title": PRESENTATIONS[pid][0].get("title", f"Presentation {pid}"),
-            "num_slides": len(PRESENTATIONS[pid]),
-            "edited_at": pid,
-        }
-        for pid in PRESENTATIONS
-    ]
+def get_all_presentations(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    folder_id: Optional[str] = None,
+    sort: Literal["edited_desc", "edited_asc"] = "edited_desc",
+):
+    try:
+        return presentations.list_summaries(
+            limit=limit,
+            cursor=cursor,
+            folder_id=folder_id,
+            newest_first=sort == "edited_desc",
+        )
+    except ValueError as e:
+        raise HTTPException(400, str(e))
 
 
 # -------------------------------------------------------
@@ -74,22 +82,19 @@ def get_all_presentations():
 # -------------------------------------------------------
 
 @router.post("/generate")
-def generate_slides(payload: SlideRequest):
+async def generate_slides(payload: SlideRequest):
     try:
-        result = orchestrator.generate_presentation(
+        result = await orchestrator.agenerate_presentation(
             topic=payload.topic,
             document_id=payload.document_id,
             detail=payload.detail,
             style=payload.style,
         )
 
-        from time import time
-        presentation_id = str(int(time() * 1000))
-
         # Save slides
-        PRESENTATIONS[presentation_id] = result["slides"]
-
-        print("\nSAVED PRESENTATIONS NOW:", PRESENTATIONS.keys(), "\n")
+        presentation_id = await run_in_threadpool(
+            presentations.create, result["slides"], payload.topic, payload.style
+        )
 
         return {
             "presentation_id": presentation_id,
@@ -101,6 +106,50 @@ def generate_slides(payload: SlideRequest):
         raise HTTPException(500, f"Slide generation failed: {str(e)}")
 
 
+# -------------------------------------------------------
+# 1b) GENERATE SLIDES (STREAMING, SERVER-SENT EVENTS)
+# -------------------------------------------------------
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/generate/stream")
+async def generate_slides_stream(payload: SlideRequest):
+    """
+    Same pipeline as /generate, streamed as SSE events:
+    `outline`, then `slide` per finished slide, `image` per finished image,
+    and finally `done` (with presentation_id) or `error`.
+    """
+
+    async def events():
+        try:
+            async for event, data in orchestrator.astream_presentation(
+                topic=payload.topic,
+                document_id=payload.document_id,
+                detail=payload.detail,
+                style=payload.style,
+            ):
+                if event == "done":
+                    presentation_id = await run_in_threadpool(
+                        presentations.create, data["slides"], payload.topic, payload.style
+                    )
+                    data = {
+                        "presentation_id": presentation_id,
+                        "topic": payload.topic,
+                        "slides": data["slides"],
+                    }
+                yield _sse(event, data)
+        except Exception as e:
+            yield _sse("error", {"detail": f"Slide generation failed: {str(e)}"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # -------------------------------------------------------
 # 2) EXPORT SLIDES
 # -------------------------------------------------------
@@ -141,13 +190,9 @@ def export_slides(payload: ExportRequest):
 @router.put("/presentation/{presentation_id}")
 def update_presentation(presentation_id: str, payload: UpdatePresentationRequest):
 
-    if presentation_id not in PRESENTATIONS:
+    if not presentations.replace_slides(presentation_id, payload.slides, title=payload.title, style=payload.theme):
         raise HTTPException(404, "Presentation not found")
 
-    PRESENTATIONS[presentation_id] = payload.slides
-
-    print("UPDATED PRESENTATION:", presentation_id)
-
     return {"success": True, "presentation_id": presentation_id}
 
 
@@ -157,12 +202,13 @@ def update_presentation(presentation_id: str, payload: UpdatePresentationRequest
 
 @router.get("/presentation/{presentation_id}")
 def get_presentation(presentation_id: str):
-    if presentation_id not in PRESENTATIONS:
+    slides = presentations.get_slides(presentation_id)
+    if slides is None:
         raise HTTPException(404, "Presentation not found")
 
     return {
         "presentation_id": presentation_id,
-        "slides": PRESENTATIONS[presentation_id],
+        "slides": slides,
     }
 
 
@@ -194,10 +240,8 @@ def get_slide(slide_id: str):
 # DELETE Presentation
 @router.delete("/presentation/{presentation_id}")
 def delete_presentation(presentation_id: str):
-    if presentation_id not in PRESENTATIONS:
+    if not presentations.delete(presentation_id):
         raise HTTPException(404, "Presentation not found")
 
-    # remove from "DB"
-    del PRESENTATIONS[presentation_id]
     return {"success": True}
 
@@ -1,108 +1,167 @@
 # app/api/upload.py
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from app.services.rag_services import RAGService
-from ai.loaders.pdf_loader import PDFLoader
-from ai.loaders.docx_loader import DOCXLoader
-from ai.loaders.txt_loader import TXTLoader
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi.responses import JSONResponse
+from app.services.rag_services import RAGService, is_document_id
+from app.services.ingest_job_service import DocumentBusy, IngestJobService, IngestQueueFull
+from ai.loaders.pdf_loader import PDF_BACKENDS
+from ai.loaders.registry import UnsupportedDocument, get_loader, supported_extensions
+from typing import Optional, Tuple
 from app.core.logger import logger
+from uuid import uuid4
+import hashlib
 import os
+import tempfile
 from pathlib import Path
 
 router = APIRouter()
 rag_service = RAGService()
+ingest_jobs = IngestJobService(rag_service)
 
 UPLOAD_DIR = Path("storage/uploads")
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 # File size limits (in bytes)
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
-MAX_TEXT_LENGTH = 500000  # ~500K characters to prevent memory issues
 
-def save_upload(file: UploadFile) -> str:
-    dest = UPLOAD_DIR / file.filename
-    with open(dest, "wb") as f:
-        f.write(file.file.read())
-    return str(dest)
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # bytes copied per read while saving
+
+
+class UploadTooLarge(Exception):
+    """The upload passed MAX_FILE_SIZE while it was being saved."""
+
+
+def save_upload(file: UploadFile) -> Tuple[str, int, str]:
+    """
+    Stream the upload to disk in UPLOAD_CHUNK_SIZE pieces, so memory per
+    upload stays constant. Returns (path, size, sha256). The data goes to
+    a temp file that is only renamed into place once complete; anything
+    over MAX_FILE_SIZE is abandoned as soon as the limit is crossed.
+    """
+    # prefix so a queued job never reads a file overwritten by a newer upload
+    dest = UPLOAD_DIR / f"{uuid4().hex[:8]}_{Path(file.filename).name}"
+    fd, tmp = tempfile.mkstemp(dir=UPLOAD_DIR, suffix=".part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as f:
+            while True:
+                chunk = file.file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > MAX_FILE_SIZE:
+                    raise UploadTooLarge(f"more than {MAX_FILE_SIZE} bytes")
+                digest.update(chunk)
+                f.write(chunk)
+        os.replace(tmp, dest)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return str(dest), size, digest.hexdigest()
 
 @router.post("/upload")
-def upload_file(file: UploadFile = File(...)):
+def upload_file(
+    file: UploadFile = File(...),
+    # "fast" (text only, default) or "layout" (pdfplumber) for PDFs
+    pdf_backend: Optional[str] = Form(None),
+):
+    return _accept_upload(file, pdf_backend)
+
+
+@router.put("/documents/{document_id}")
+def update_document(
+    document_id: str,
+    file: UploadFile = File(...),
+    pdf_backend: Optional[str] = Form(None),
+):
+    """
+    Replace an ingested document with an edited version of the file. Only
+    chunks whose text changed are embedded; unchanged ones are kept and
+    removed ones deleted. Returns a job to poll like /upload.
+
+    Responds 409 while the document is still being ingested or updated.
+    """
+    if not is_document_id(document_id):
+        raise HTTPException(status_code=404, detail="Document not found")
+    busy = ingest_jobs.active_job(document_id)
+    if busy:
+        raise HTTPException(status_code=409, detail=f"Document is still being processed (job {busy['job_id']})")
+    if not rag_service.pipeline.has_document(document_id):
+        raise HTTPException(status_code=404, detail="Document not found")
+    return _accept_upload(file, pdf_backend, document_id=document_id)
+
+
+def _accept_upload(file: UploadFile, pdf_backend: Optional[str], document_id: Optional[str] = None):
+    path = None
+    queued = False  # once a job owns the saved file it must stay
     try:
-        # File type validation
-        ext = os.path.splitext(file.filename)[1].lower()
-        supported = [".pdf", ".docx", ".txt"]
-        if ext not in supported:
-            raise HTTPException(status_code=400, detail=f"Unsupported file type: {ext}. Supported: PDF, DOCX, TXT")
-
-        # Read file size
-        file.file.seek(0, 2)  # Seek to end
-        file_size = file.file.tell()
-        file.file.seek(0)  # Reset to beginning
-        
-        if file_size > MAX_FILE_SIZE:
+        if pdf_backend and pdf_backend not in PDF_BACKENDS:
+            raise HTTPException(status_code=400, detail=f"Unknown pdf_backend: {pdf_backend}. Options: {', '.join(PDF_BACKENDS)}")
+
+        try:
+            path, file_size, sha256 = save_upload(file)
+        except UploadTooLarge:
             raise HTTPException(
-                status_code=400, 
-                detail=f"File too large: {file_size / 1024 / 1024:.2f}MB. Maximum size: {MAX_FILE_SIZE / 1024 / 1024}MB"
+                status_code=400,
+                detail=f"File too large. Maximum size: {MAX_FILE_SIZE / 1024 / 1024}MB"
             )
 
-        logger.info(f"Uploading file: {file.filename} ({file_size / 1024:.2f}KB)")
-
-        path = save_upload(file)
-
-        # choose loader
-        if ext == ".pdf":
-            loader = PDFLoader()
-        elif ext == ".docx":
-            loader = DOCXLoader()
-        else:
-            loader = TXTLoader()
-
-        logger.info(f"Loading document: {path}")
-        data = loader.load(path)
-        
-        # data expected to include 'raw_text'
-        text = data.get("raw_text", "")
-        if not text:
-            raise HTTPException(status_code=400, detail="No text extracted from document")
-
-        # Check text length and truncate if needed
-        original_length = len(text)
-        if len(text) > MAX_TEXT_LENGTH:
-            logger.warning(f"Text too long ({len(text)} chars), truncating to {MAX_TEXT_LENGTH} chars")
-            text = text[:MAX_TEXT_LENGTH]
-            # Try to cut at sentence boundary
-            last_period = text.rfind('.')
-            if last_period > MAX_TEXT_LENGTH * 0.9:
-                text = text[:last_period + 1]
-
-        logger.info(f"Processing text: {len(text)} characters (original: {original_length})")
-        
-        result = rag_service.ingest_file_text(
-            filename=file.filename, 
-            text=text, 
-            extra_meta={"source_path": path, "original_length": original_length}
+        logger.info(f"Uploaded file: {file.filename} ({file_size / 1024:.2f}KB, sha256 {sha256[:12]})")
+
+        # File type validation: content is sniffed, so mislabeled files still resolve
+        try:
+            get_loader(path, filename=file.filename, pdf_backend=pdf_backend)
+        except UnsupportedDocument as e:
+            os.remove(path)
+            raise HTTPException(status_code=400, detail=f"{e}. Supported: {', '.join(supported_extensions())}")
+
+        # parse / chunk / embed run in the background; poll /jobs/{job_id}
+        job = ingest_jobs.enqueue(
+            filename=file.filename,
+            source_path=path,
+            pdf_backend=pdf_backend,
+            document_id=document_id,
         )
-        
-        logger.info(f"Successfully ingested document: {result.get('document_id')}")
-        
-        return {
-            "status": "success",
-            "ingest": result,
-            "document_id": result.get("document_id"),
+        queued = True
+
+        return JSONResponse(status_code=202, content={
+            "status": "queued",
+            "job_id": job["job_id"],
+            "document_id": document_id,
             "filename": file.filename,
-            "text_length": len(text),
-            "original_length": original_length
-        }
+            "size": file_size,
+            "sha256": sha256,
+        })
     except HTTPException:
         raise
-    except MemoryError as e:
-        logger.error(f"Memory error processing file {file.filename}: {e}")
+    except DocumentBusy as e:
+        # lost a race with another PUT for the same document
+        if path:
+            os.remove(path)
+        raise HTTPException(status_code=409, detail=str(e))
+    except IngestQueueFull as e:
+        logger.warning(f"Ingestion backlog full, rejecting {file.filename}: {e}")
+        if path:
+            os.remove(path)
         raise HTTPException(
-            status_code=413, 
-            detail="File is too large to process. Please try a smaller file or split the document."
+            status_code=503,
+            detail="Server is busy processing other documents. Please retry shortly.",
+            headers={"Retry-After": "10"},
         )
     except Exception as e:
         logger.error(f"Error uploading file {file.filename}: {e}", exc_info=True)
+        if path and not queued and os.path.exists(path):
+            os.remove(path)
         raise HTTPException(
             status_code=500, 
             detail=f"Error processing file: {str(e)}"
         )
+
+
+@router.get("/jobs/{job_id}")
+def get_upload_job(job_id: str):
+    job = ingest_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -32,6 +32,10 @@ class Settings(BaseSettings):
     GROQ_MODEL_TEXT: str = "mixtral-8x7b"
     GROQ_MODEL_VISION: str = "llama-3.2-90b-vision"
 
+    # one pooled HTTP client is shared by every agent
+    GROQ_HTTP2: bool = True
+    GROQ_HTTP_MAX_CONNECTIONS: int = 20
+
     TAVILY_API_KEY: Optional[str] = None
     HF_API_KEY: Optional[str] = None
 
@@ -41,10 +45,29 @@ class Settings(BaseSettings):
     EMBEDDINGS_MODEL: str = "sentence-transformers/all-mpnet-base-v2"
     CHROMA_DB_DIR: str = "./vector_store"
     CHROMA_COLLECTION: str = "documents"
+    EMBEDDINGS_DTYPE: str = "float32"  # "float16" halves in-flight embedding memory
+
+    # embedding worker processes (0 = encode inside the API process);
+    # capped at CPU cores - 1
+    EMBEDDINGS_WORKERS: int = 2
+    EMBEDDINGS_MAX_BATCH: int = 64  # texts merged into one model call
+    EMBEDDINGS_MAX_WAIT_MS: int = 5  # how long to wait for more texts to batch
+    EMBEDDINGS_QUEUE_SIZE: int = 256  # pending requests before callers block
+    EMBEDDINGS_SUBMIT_TIMEOUT: float = 30.0  # seconds blocked on a full queue before erroring
+    EMBEDDINGS_RESULT_TIMEOUT: float = 300.0  # seconds to wait for a batch before encoding in-process
+
+    # chunk embeddings cached by content hash, per model
+    EMBEDDINGS_CACHE_ENABLED: bool = True
+    EMBEDDINGS_CACHE_DIR: str = "storage/cache/embeddings"
 
     CHUNK_SIZE: int = 500
     CHUNK_OVERLAP: int = 100
 
+    # "words" (800-word chunks) or "tokens": chunks sized to the embedding
+    # model's max sequence length using its tokenizer, so nothing is truncated
+    CHUNKING_MODE: str = "words"
+    CHUNK_TOKEN_OVERLAP: int = 32
+
     #########################################
     # FILE UPLOADS
     #########################################
@@ -78,10 +101,52 @@ class Settings(BaseSettings):
     WRITER_TONE: str = "professional"
     SLIDE_DESIGN_STYLE: str = "corporate-modern"
 
+    # batched writer: several slides per LLM call
+    WRITER_BATCH_ENABLED: bool = False
+    WRITER_BATCH_MAX_SLIDES: int = 6
+    WRITER_BATCH_MAX_CHARS: int = 24000  # ~6k tokens of title + research per call
+
+    # LLM response cache (memory LRU + SQLite tier)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MEMORY_ENTRIES: int = 1000
+    LLM_CACHE_DB: str = "storage/cache/llm_responses.db"
+    LLM_CACHE_MAX_ENTRIES: int = 20000
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600  # 0 = never expire
+
+    #########################################
+    # CONCURRENCY
+    #########################################
+    ORCHESTRATOR_MAX_WORKERS: int = 4  # slides built in parallel (1 = sequential)
+
+    # max in-flight calls per upstream provider
+    GROQ_MAX_CONCURRENCY: int = 4
+    TAVILY_MAX_CONCURRENCY: int = 4
+    HF_MAX_CONCURRENCY: int = 2
+    RAG_MAX_CONCURRENCY: int = 2
+
+    #########################################
+    # INGESTION
+    #########################################
+    INGEST_MAX_CONCURRENCY: int = 2  # documents ingested at once
+    INGEST_QUEUE_SIZE: int = 32  # queued jobs before uploads get 503
+    INGEST_LEASE_SECONDS: int = 60  # a job whose owner stops renewing this long is taken over
+
+    # PDF text extraction (1 worker = always serial)
+    PDF_BACKEND: str = "fast"  # "fast" (pypdf, text only) | "layout" (pdfplumber)
+    PDF_EXTRACT_WORKERS: int = 0  # 0 = CPU cores minus EMBEDDINGS_WORKERS (at least 1)
+    PDF_PARALLEL_MIN_PAGES: int = 24  # smaller files are parsed serially
+    PDF_PAGES_PER_TASK: int = 8  # pages per worker task
+
     #########################################
     # IMAGES
     #########################################
-    GENERATED_IMAGES_DIR: str = "./generated_images"
+    GENERATED_IMAGES_DIR: str = "./generated_images"  # content-addressed store root
+    IMAGE_THUMBNAIL_SIZE: int = 320  # longest edge of list-view thumbnails (px)
+
+    # generated image cache: (model, prompt, options) -> stored image sha256
+    IMAGE_CACHE_ENABLED: bool = True
+    IMAGE_CACHE_DIR: str = "storage/cache/images"
+    IMAGE_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # cached images on disk; unreferenced ones are deleted past this
     IMAGE_STYLE: str = "flat-illustration"
 
     class Config:
@@ -2,10 +2,15 @@
 from sqlmodel import SQLModel, Field
 from datetime import datetime
 from typing import Optional, Dict, Any
-from sqlalchemy import Column
+from sqlalchemy import Column, BigInteger, Index, Text, text
 from sqlalchemy.types import JSON
+import time
 import uuid
 
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
 class UserTable(SQLModel, table=True):
     __tablename__ = "users"
 
@@ -40,4 +45,103 @@ class TemplateTable(SQLModel, table=True):
     thumbnail_url: Optional[str] = None
 
     is_public: bool = True
-    created_at: datetime = Field(default_factory=datetime.utcnow)
\ No newline at end of file
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+
+class FolderTable(SQLModel, table=True):
+    __tablename__ = "folders"
+
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex, primary_key=True, index=True)
+    name: str = Field(nullable=False)
+    created_at: int = Field(default_factory=lambda: int(time.time()), index=True)  # seconds
+
+
+class PresentationTable(SQLModel, table=True):
+    """
+    One row per deck. title / num_slides / edited_at are kept in sync on
+    every write so listings never have to load slide bodies.
+    """
+    __tablename__ = "presentations"
+    # keyset pagination for the dashboard walks (edited_at, id)
+    __table_args__ = (Index("ix_presentations_edited_at_id", "edited_at", "id"),)
+
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex, primary_key=True, index=True)
+    title: str = Field(default="Untitled presentation")
+    topic: Optional[str] = None
+    style: Optional[str] = None
+    num_slides: int = 0
+
+    # epoch milliseconds (what the frontend expects)
+    created_at: int = Field(default_factory=now_ms, sa_type=BigInteger)
+    edited_at: int = Field(default_factory=now_ms, sa_type=BigInteger)
+
+
+class SlideTable(SQLModel, table=True):
+    __tablename__ = "slides"
+    __table_args__ = (Index("ix_slides_presentation_position", "presentation_id", "position"),)
+
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex, primary_key=True)
+    presentation_id: str = Field(foreign_key="presentations.id", nullable=False)
+    position: int = Field(nullable=False)
+
+    # full slide JSON as produced by the orchestrator / editor
+    data: Dict[str, Any] = Field(sa_column=Column(JSON, nullable=False))
+
+
+class FolderPresentationTable(SQLModel, table=True):
+    __tablename__ = "folder_presentations"
+
+    folder_id: str = Field(foreign_key="folders.id", primary_key=True)
+    presentation_id: str = Field(foreign_key="presentations.id", primary_key=True, index=True)
+    added_at: int = Field(default_factory=now_ms, sa_type=BigInteger)
+
+
+class ImageTable(SQLModel, table=True):
+    __tablename__ = "images"
+
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex, primary_key=True, index=True)
+    url: str = Field(sa_column=Column(Text, nullable=False))
+    prompt: str = Field(sa_column=Column(Text, nullable=False))
+    # content address in the on-disk image store
+    sha256: Optional[str] = Field(default=None, index=True)
+    thumbnail_url: Optional[str] = None
+    created_at: int = Field(default_factory=now_ms, index=True, sa_type=BigInteger)
+
+
+class IngestJobTable(SQLModel, table=True):
+    """Background document ingestion; progress is written as the job runs."""
+    __tablename__ = "ingest_jobs"
+    # one unfinished job per document: concurrent writers would interleave chunks
+    __table_args__ = (
+        Index(
+            "ux_ingest_jobs_active_document",
+            "document_id",
+            unique=True,
+            sqlite_where=text("status IN ('queued', 'running')"),
+        ),
+    )
+
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex, primary_key=True, index=True)
+    filename: str
+    source_path: str
+    document_id: str
+    pdf_backend: Optional[str] = None  # None = settings.PDF_BACKEND
+
+    # queued -> running -> done | failed
+    status: str = Field(default="queued", index=True)
+    stage: str = "queued"  # queued | parsing | embedding | streaming | done
+    pages_parsed: int = 0
+    pages_total: Optional[int] = None
+    chunks_embedded: int = 0
+    chunks_total: Optional[int] = None
+    text_length: Optional[int] = None
+    error: Optional[str] = Field(default=None, sa_column=Column(Text))
+
+    # the process working on the job renews lease_until while it holds it;
+    # an expired lease means that process died and another may take over
+    owner: Optional[str] = None
+    lease_until: Optional[int] = Field(default=None, sa_type=BigInteger)
+
+    created_at: int = Field(default_factory=now_ms, sa_type=BigInteger)
+    updated_at: int = Field(default_factory=now_ms, sa_type=BigInteger)
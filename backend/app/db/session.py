@@ -1,5 +1,6 @@
 # app/db/session.py
 from sqlmodel import SQLModel, create_engine, Session
+from sqlalchemy import event, inspect, text
 from pathlib import Path
 from app.core.config import settings
 from app.core.logger import logger
@@ -11,12 +12,44 @@ SQLITE_URL = f"sqlite:///{DB_FILE}"
 # echo=True during dev can be helpful; disable in prod.
 engine = create_engine(SQLITE_URL, echo=False, connect_args={"check_same_thread": False})
 
+
+@event.listens_for(engine, "connect")
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets several uvicorn workers read while one writes;
+    # busy_timeout makes concurrent writers wait instead of failing.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+def _upgrade_existing_tables():
+    """
+    create_all never alters existing tables; add nullable columns and
+    indexes that were introduced after a table was first created.
+    """
+    existing = inspect(engine)
+    with engine.begin() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            if not existing.has_table(table.name):
+                continue
+            have = {c["name"] for c in existing.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in have or not column.nullable:
+                    continue
+                ddl = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {ddl}'))
+                logger.info(f"[DB] Added column {table.name}.{column.name}")
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
 def create_db_and_tables():
     """
     Call this on app startup to ensure tables exist.
     """
     try:
         SQLModel.metadata.create_all(engine)
+        _upgrade_existing_tables()
         logger.info("Database & tables created/verified.")
     except Exception as e:
         logger.exception("Failed to create DB tables: %s", e)
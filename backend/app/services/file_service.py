@@ -4,9 +4,7 @@ import shutil
 import uuid
 from pathlib import Path
 from fastapi import UploadFile
-from ai.loaders.pdf_loader import PDFLoader
-from ai.loaders.docx_loader import DOCXLoader
-from ai.loaders.txt_loader import TXTLoader
+from ai.loaders.registry import get_loader
 from app.core.logger import logger
 
 
@@ -36,22 +34,11 @@ class FileService:
         """Identifies file type and loads text via correct loader."""
 
         path = self._save_temp_file(file)
-        ext = path.suffix.lower()
-
-        if ext == ".pdf":
-            loader = PDFLoader()
-        elif ext == ".docx":
-            loader = DOCXLoader()
-        elif ext in [".txt", ".md"]:
-            loader = TXTLoader()
-        else:
-            raise ValueError("Unsupported document type")
-        
-        result = loader.load(str(path))
-        # Return raw_text if it's a dict, otherwise return the result
-        if isinstance(result, dict):
-            return result.get("raw_text", "")
-        return result
+        # raises UnsupportedDocument (a ValueError) for unknown types
+        loader = get_loader(path, filename=file.filename)
+
+        # only the text is needed; chunks/summary/topics are never computed
+        return loader.load_text(str(path))
 
     def cleanup(self, path: Path):
         if path.exists():
@@ -0,0 +1,73 @@
+# app/services/folder_service.py
+from typing import Any, Dict, List, Optional
+from sqlmodel import select, delete
+from app.db.session import get_session
+from app.db.models import FolderTable, FolderPresentationTable, PresentationTable
+
+
+class FolderService:
+    """Folders and their presentation membership, persisted in SQL."""
+
+    def _out(self, folder: FolderTable, presentation_ids: List[str]) -> Dict[str, Any]:
+        return {
+            "id": folder.id,
+            "name": folder.name,
+            "created_at": folder.created_at,
+            "presentations": presentation_ids,
+        }
+
+    def _presentation_ids(self, session, folder_id: str) -> List[str]:
+        # join so links to deleted decks never leak out
+        stmt = (
+            select(FolderPresentationTable.presentation_id)
+            .join(PresentationTable, PresentationTable.id == FolderPresentationTable.presentation_id)
+            .where(FolderPresentationTable.folder_id == folder_id)
+            .order_by(FolderPresentationTable.added_at)
+        )
+        return list(session.exec(stmt).all())
+
+    def create(self, name: str) -> Dict[str, Any]:
+        with get_session() as session:
+            folder = FolderTable(name=name)
+            session.add(folder)
+            session.commit()
+            session.refresh(folder)
+            return self._out(folder, [])
+
+    def exists(self, folder_id: str) -> bool:
+        with get_session() as session:
+            return session.get(FolderTable, folder_id) is not None
+
+    def list_folders(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        with get_session() as session:
+            stmt = select(FolderTable).order_by(FolderTable.created_at).offset(offset).limit(limit)
+            folders = session.exec(stmt).all()
+            return [self._out(f, self._presentation_ids(session, f.id)) for f in folders]
+
+    def add_presentation(self, folder_id: str, presentation_id: str) -> bool:
+        """False when the folder or presentation does not exist."""
+        with get_session() as session:
+            if session.get(FolderTable, folder_id) is None:
+                return False
+            if session.get(PresentationTable, presentation_id) is None:
+                return False
+            if session.get(FolderPresentationTable, (folder_id, presentation_id)) is None:
+                session.add(FolderPresentationTable(folder_id=folder_id, presentation_id=presentation_id))
+                session.commit()
+            return True
+
+    def presentation_ids(self, folder_id: str) -> Optional[List[str]]:
+        with get_session() as session:
+            if session.get(FolderTable, folder_id) is None:
+                return None
+            return self._presentation_ids(session, folder_id)
+
+    def delete(self, folder_id: str) -> bool:
+        with get_session() as session:
+            folder = session.get(FolderTable, folder_id)
+            if folder is None:
+                return False
+            session.exec(delete(FolderPresentationTable).where(FolderPresentationTable.folder_id == folder_id))
+            session.delete(folder)
+            session.commit()
+            return True
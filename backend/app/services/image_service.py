@@ -0,0 +1,56 @@
+# app/services/image_service.py
+from typing import Any, Dict, List, Optional
+from sqlalchemy import String, cast
+from sqlmodel import select
+from app.db.session import get_session
+from app.db.models import ImageTable, SlideTable
+
+
+class ImageService:
+    """Saved generated images, persisted in SQL."""
+
+    def _out(self, img: ImageTable) -> Dict[str, Any]:
+        return {
+            "id": img.id,
+            "url": img.url,
+            "thumbnail_url": img.thumbnail_url,
+            "prompt": img.prompt,
+            "created_at": img.created_at,
+        }
+
+    def create(
+        self,
+        url: str,
+        prompt: str,
+        sha256: Optional[str] = None,
+        thumbnail_url: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        with get_session() as session:
+            img = ImageTable(url=url, prompt=prompt, sha256=sha256, thumbnail_url=thumbnail_url)
+            session.add(img)
+            session.commit()
+            session.refresh(img)
+            return self._out(img)
+
+    def list_images(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        with get_session() as session:
+            stmt = select(ImageTable).order_by(ImageTable.created_at.desc()).offset(offset).limit(limit)
+            return [self._out(i) for i in session.exec(stmt).all()]
+
+    def delete(self, image_id: str) -> bool:
+        with get_session() as session:
+            img = session.get(ImageTable, image_id)
+            if img is None:
+                return False
+            session.delete(img)
+            session.commit()
+            return True
+
+    def is_referenced(self, sha256: str) -> bool:
+        """True if a saved image or any saved slide still points at this stored image."""
+        with get_session() as session:
+            if session.exec(select(ImageTable.id).where(ImageTable.sha256 == sha256).limit(1)).first():
+                return True
+            # slide JSON carries image URLs, which embed the content address
+            stmt = select(SlideTable.id).where(cast(SlideTable.data, String).contains(sha256)).limit(1)
+            return session.exec(stmt).first() is not None
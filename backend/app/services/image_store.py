@@ -0,0 +1,168 @@
+# app/services/image_store.py
+import hashlib
+import io
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.core.logger import logger
+
+_SHA_RE = re.compile(r"^[0-9a-f]{64}$")
+
+_MEDIA_TYPES = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "webp": "image/webp",
+    "gif": "image/gif",
+}
+
+
+def sniff_extension(data: bytes) -> str:
+    """Pick a file extension from the image magic bytes (defaults to png)."""
+    if data.startswith(b"\xff\xd8\xff"):
+        return "jpg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    return "png"
+
+
+def media_type(extension: str) -> str:
+    return _MEDIA_TYPES.get(extension, "application/octet-stream")
+
+
+class ImageStore:
+    """
+    Content-addressed image files on disk.
+
+    Files are named by the SHA-256 of their bytes and sharded by the first
+    two hex characters, so saving the same image twice is a no-op. A small
+    JPEG thumbnail is written next to every original for list views.
+    """
+
+    def __init__(self, root: str = None, thumb_size: int = None):
+        self.root = Path(root or settings.GENERATED_IMAGES_DIR)
+        self.thumb_size = thumb_size or settings.IMAGE_THUMBNAIL_SIZE
+
+    # ---------- paths ----------
+    def path(self, sha256: str, extension: str) -> Path:
+        return self.root / "originals" / sha256[:2] / f"{sha256}.{extension}"
+
+    def thumb_path(self, sha256: str) -> Path:
+        return self.root / "thumbs" / sha256[:2] / f"{sha256}.jpg"
+
+    @staticmethod
+    def parse_name(name: str):
+        """
+        Split a public file name like `<sha256>.png` into (sha256, extension).
+        Returns None for anything that is not a valid content address, which
+        also keeps user input from escaping the store directory.
+        """
+        sha256, _, extension = name.partition(".")
+        if not _SHA_RE.match(sha256) or extension not in _MEDIA_TYPES:
+            return None
+        return sha256, extension
+
+    # ---------- write ----------
+    def put(self, data: bytes) -> Dict[str, str]:
+        sha256 = hashlib.sha256(data).hexdigest()
+        extension = sniff_extension(data)
+        target = self.path(sha256, extension)
+
+        if not target.exists():
+            self._atomic_write(target, data)
+        else:
+            logger.info(f"[ImageStore] Dedup hit {sha256[:12]}")
+
+        if not self.thumb_path(sha256).exists():
+            self._write_thumbnail(sha256, data)
+
+        return self.record(sha256, extension)
+
+    def record(self, sha256: str, extension: str) -> Dict[str, str]:
+        """Public description of a stored image, as returned by `put`."""
+        return {
+            "sha256": sha256,
+            "extension": extension,
+            "url": f"/api/image/files/{sha256}.{extension}",
+            "thumbnail_url": f"/api/image/thumbs/{sha256}.jpg" if self.thumb_path(sha256).exists() else None,
+        }
+
+    def _atomic_write(self, target: Path, data: bytes):
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, target)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def _write_thumbnail(self, sha256: str, data: bytes) -> bool:
+        try:
+            from PIL import Image
+
+            with Image.open(io.BytesIO(data)) as img:
+                img.thumbnail((self.thumb_size, self.thumb_size))
+                buf = io.BytesIO()
+                img.convert("RGB").save(buf, format="JPEG", quality=80, optimize=True)
+            self._atomic_write(self.thumb_path(sha256), buf.getvalue())
+            return True
+        except Exception as e:
+            logger.warning(f"[ImageStore] Thumbnail failed for {sha256[:12]}: {e}")
+            return False
+
+    # ---------- delete ----------
+    def size(self, sha256: str, extension: str) -> int:
+        """Bytes on disk for an image and its thumbnail (0 if missing)."""
+        total = 0
+        for p in (self.path(sha256, extension), self.thumb_path(sha256)):
+            try:
+                total += p.stat().st_size
+            except FileNotFoundError:
+                pass
+        return total
+
+    def delete(self, sha256: str, extension: str):
+        """Remove an image and its thumbnail; callers check it is unreferenced."""
+        for p in (self.path(sha256, extension), self.thumb_path(sha256)):
+            try:
+                p.unlink()
+            except FileNotFoundError:
+                pass
+        logger.info(f"[ImageStore] Deleted {sha256[:12]}")
+
+    # ---------- read ----------
+    def locate(self, name: str) -> Optional[Path]:
+        parsed = self.parse_name(name)
+        if parsed is None:
+            return None
+        p = self.path(*parsed)
+        return p if p.exists() else None
+
+    def locate_thumbnail(self, name: str) -> Optional[Path]:
+        sha256, _, extension = name.partition(".")
+        if not _SHA_RE.match(sha256) or extension != "jpg":
+            return None
+        p = self.thumb_path(sha256)
+        return p if p.exists() else None
+
+
+_image_store = None
+_store_lock = threading.Lock()
+
+
+def get_image_store() -> ImageStore:
+    global _image_store
+    if _image_store is None:
+        with _store_lock:
+            if _image_store is None:
+                _image_store = ImageStore()
+    return _image_store
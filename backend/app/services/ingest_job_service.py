@@ -0,0 +1,345 @@
+# app/services/ingest_job_service.py
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+
+from ai.loaders.registry import get_loader
+from app.core.config import settings
+from app.core.logger import logger
+from app.db.models import IngestJobTable, now_ms
+from app.db.session import get_session
+from app.services.rag_services import RAGService, new_document_id
+
+PROGRESS_INTERVAL = 0.25  # seconds between progress writes
+ACTIVE = ("queued", "running")
+
+
+class IngestQueueFull(Exception):
+    """Too many ingestion jobs are already waiting."""
+
+
+class DocumentBusy(Exception):
+    """The document already has an unfinished ingestion job."""
+
+
+def _measure_pages(pages, counter: Dict[str, int]):
+    """Pass pages through, adding their length to counter["text_length"]."""
+    for number, text in pages:
+        counter["text_length"] += len(text)
+        yield number, text
+
+
+class IngestJobService:
+    """
+    Runs document ingestion (parse -> chunk -> embed -> store) in the
+    background. Job rows are persisted so status survives restarts, and
+    at most INGEST_MAX_CONCURRENCY jobs run at once.
+
+    Several processes share the jobs table, so every job carries a lease:
+    the owning process renews it while the job is queued or running, and
+    a job is only taken over (claimed with a conditional UPDATE) once its
+    lease has expired.
+    """
+
+    def __init__(self, rag_service: RAGService, max_workers: int = None, max_pending: int = None):
+        self.rag_service = rag_service
+        self.max_pending = max_pending or settings.INGEST_QUEUE_SIZE
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.INGEST_MAX_CONCURRENCY,
+            thread_name_prefix="ingest",
+        )
+        self._pending = 0
+        self._lock = threading.Lock()
+
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lease_seconds = settings.INGEST_LEASE_SECONDS
+        self._heartbeat: Optional[threading.Thread] = None
+
+    def _out(self, job: IngestJobTable) -> Dict[str, Any]:
+        return {
+            "job_id": job.id,
+            "status": job.status,
+            "stage": job.stage,
+            "filename": job.filename,
+            "document_id": job.document_id if job.status == "done" else None,
+            "pages_parsed": job.pages_parsed,
+            "pages_total": job.pages_total,
+            "chunks_embedded": job.chunks_embedded,
+            "chunks_total": job.chunks_total,
+            "text_length": job.text_length,
+            "error": job.error,
+            "created_at": job.created_at,
+            "updated_at": job.updated_at,
+        }
+
+    # ---------- persistence ----------
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with get_session() as session:
+            job = session.get(IngestJobTable, job_id)
+            return self._out(job) if job else None
+
+    def active_job(self, document_id: str) -> Optional[Dict[str, Any]]:
+        """The unfinished job writing `document_id`, if any."""
+        with get_session() as session:
+            stmt = select(IngestJobTable).where(
+                IngestJobTable.document_id == document_id,
+                IngestJobTable.status.in_(ACTIVE),
+            )
+            job = session.exec(stmt).first()
+            return self._out(job) if job else None
+
+    def _update(self, job_id: str, **fields):
+        with get_session() as session:
+            job = session.get(IngestJobTable, job_id)
+            if job is None:
+                return
+            for key, value in fields.items():
+                setattr(job, key, value)
+            job.updated_at = now_ms()
+            session.add(job)
+            session.commit()
+
+    def _lease(self) -> int:
+        return now_ms() + self.lease_seconds * 1000
+
+    def _claim(self, job_id: str, where, **fields) -> bool:
+        """Conditional UPDATE; True when this process now owns the job."""
+        stmt = (
+            update(IngestJobTable)
+            .where(IngestJobTable.id == job_id, where)
+            .values(owner=self.owner, lease_until=self._lease(), updated_at=now_ms(), **fields)
+        )
+        with get_session() as session:
+            claimed = session.execute(stmt).rowcount == 1
+            session.commit()
+        return claimed
+
+    def _expired(self):
+        return or_(IngestJobTable.lease_until.is_(None), IngestJobTable.lease_until < now_ms())
+
+    def _renew_leases(self):
+        stmt = (
+            update(IngestJobTable)
+            .where(IngestJobTable.owner == self.owner, IngestJobTable.status.in_(ACTIVE))
+            .values(lease_until=self._lease())
+        )
+        with get_session() as session:
+            session.execute(stmt)
+            session.commit()
+
+    def _start_heartbeat(self):
+        with self._lock:
+            if self._heartbeat is not None:
+                return
+            self._heartbeat = threading.Thread(target=self._beat, name="ingest-lease", daemon=True)
+            self._heartbeat.start()
+
+    def _beat(self):
+        # renew well inside the lease, and pick up jobs orphaned by a dead worker
+        while True:
+            time.sleep(max(1.0, self.lease_seconds / 3))
+            try:
+                self._renew_leases()
+                self.resume_pending()
+            except Exception as e:
+                logger.warning(f"[Ingest] Lease renewal failed: {e}")
+
+    def _progress(self, job_id: str, done_field: str, total_field: str):
+        """Callback writing (done, total) to the job row, throttled."""
+        last = [0.0]
+
+        def report(done: int, total: Optional[int]):
+            now = time.monotonic()
+            final = total is not None and done >= total
+            if not final and now - last[0] < PROGRESS_INTERVAL:
+                return
+            last[0] = now
+            fields = {done_field: done}
+            if total is not None:
+                fields[total_field] = total
+            self._update(job_id, **fields)
+
+        return report
+
+    # ---------- queue ----------
+    def enqueue(
+        self,
+        filename: str,
+        source_path: str,
+        pdf_backend: Optional[str] = None,
+        document_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Create a job and schedule it; raises IngestQueueFull when the backlog
+        is full. With `document_id`, the job updates that document in place,
+        and DocumentBusy is raised while another job for it is unfinished
+        (enforced by a unique index, so it holds across processes).
+        """
+        self._reserve()
+        try:
+            with get_session() as session:
+                job = IngestJobTable(
+                    filename=filename,
+                    source_path=source_path,
+                    document_id=document_id or new_document_id(),
+                    pdf_backend=pdf_backend,
+                    owner=self.owner,
+                    lease_until=self._lease(),
+                )
+                session.add(job)
+                try:
+                    session.commit()
+                except IntegrityError:
+                    raise DocumentBusy(f"Document {document_id} is already being processed")
+                session.refresh(job)
+                out = self._out(job)
+        except Exception:
+            self._release()
+            raise
+
+        self._start_heartbeat()
+        self._executor.submit(self._run, out["job_id"])
+        logger.info(f"[Ingest] Queued job {out['job_id']} for {filename}")
+        return out
+
+    def resume_pending(self):
+        """
+        Take over queued/running jobs whose lease has expired, i.e. whose
+        process died. Jobs another live worker holds are left alone, and
+        claiming stops once this process's queue is full; the rest stay
+        expired for another worker or the next heartbeat.
+        """
+        self._start_heartbeat()
+        with get_session() as session:
+            stmt = select(IngestJobTable).where(IngestJobTable.status.in_(ACTIVE), self._expired())
+            jobs = session.exec(stmt).all()
+
+        resumed = 0
+        for i, job in enumerate(jobs):
+            try:
+                self._reserve()
+            except IngestQueueFull:
+                logger.info(f"[Ingest] Queue full; leaving {len(jobs) - i} expired job(s) for later")
+                break
+            # another process may claim the same job between our select and update
+            if not self._claim(
+                job.id,
+                IngestJobTable.status.in_(ACTIVE) & self._expired(),
+                status="queued",
+                stage="queued",
+                pages_parsed=0,
+                chunks_embedded=0,
+            ):
+                self._release()
+                continue
+            if not Path(job.source_path).exists():
+                self._update(job.id, status="failed", error="Upload missing after restart")
+                self._release()
+                continue
+            self._executor.submit(self._run, job.id)
+            resumed += 1
+
+        if resumed:
+            logger.info(f"[Ingest] Resumed {resumed} interrupted job(s)")
+
+    def _reserve(self):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise IngestQueueFull(f"{self._pending} ingestion jobs already pending")
+            self._pending += 1
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+
+    # ---------- worker ----------
+    def _run(self, job_id: str):
+        try:
+            # lost the lease while waiting in the queue: the new owner runs it
+            if not self._claim(
+                job_id,
+                (IngestJobTable.owner == self.owner) & (IngestJobTable.status == "queued"),
+                status="running",
+                stage="parsing",
+            ):
+                logger.warning(f"[Ingest] Job {job_id} was taken over by another worker")
+                return
+
+            with get_session() as session:
+                job = session.get(IngestJobTable, job_id)
+                filename, path, document_id = job.filename, job.source_path, job.document_id
+                pdf_backend = job.pdf_backend
+
+            loader = get_loader(path, filename=filename, pdf_backend=pdf_backend)
+
+            logger.info(f"Loading document: {path}")
+            if loader.paged:
+                self._run_streaming(job_id, loader, filename, path, document_id)
+                return
+
+            text = loader.load_text(path)
+            if not text:
+                raise ValueError("No text extracted from document")
+
+            logger.info(f"Processing text: {len(text)} characters")
+            self._update(job_id, stage="embedding", text_length=len(text))
+
+            # the upload path stays on the job row: it is new on every upload, so
+            # as chunk metadata it would make every unchanged chunk look moved
+            result = self.rag_service.ingest_file_text(
+                filename=filename,
+                text=text,
+                document_id=document_id,
+                on_progress=self._progress(job_id, "chunks_embedded", "chunks_total"),
+            )
+
+            self._update(
+                job_id,
+                status="done",
+                stage="done",
+                chunks_total=result["chunks_total"],
+                chunks_embedded=result["chunks_total"],
+            )
+            logger.info(f"Successfully ingested document: {result.get('document_id')}")
+
+        except MemoryError:
+            logger.error(f"[Ingest] Memory error in job {job_id}")
+            self._update(job_id, status="failed", error="File is too large to process. Please try a smaller file or split the document.")
+        except Exception as e:
+            logger.error(f"[Ingest] Job {job_id} failed: {e}", exc_info=True)
+            self._update(job_id, status="failed", error=str(e))
+        finally:
+            self._release()
+
+    def _run_streaming(self, job_id: str, loader, filename: str, path: str, document_id: str):
+        # pages are chunked and embedded while later pages are still parsing
+        self._update(job_id, stage="streaming")
+        counter = {"text_length": 0}
+        pages = loader.iter_pages(path, on_page=self._progress(job_id, "pages_parsed", "pages_total"))
+
+        result = self.rag_service.ingest_file_pages(
+            filename=filename,
+            pages=_measure_pages(pages, counter),
+            document_id=document_id,
+            on_progress=self._progress(job_id, "chunks_embedded", "chunks_total"),
+        )
+
+        logger.info(f"Processed text: {counter['text_length']} characters")
+        self._update(
+            job_id,
+            status="done",
+            stage="done",
+            text_length=counter["text_length"],
+            chunks_total=result["chunks_total"],
+            chunks_embedded=result["chunks_total"],
+        )
+        logger.info(f"Successfully ingested document: {result.get('document_id')}")
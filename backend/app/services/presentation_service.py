@@ -0,0 +1,173 @@
+# app/services/presentation_service.py
+import base64
+from typing import Any, Dict, List, Optional, Tuple
+from sqlmodel import select, delete, and_, or_
+from app.db.session import get_session
+from app.db.models import PresentationTable, SlideTable, FolderPresentationTable, now_ms
+
+
+def _deck_title(slides: List[Dict[str, Any]], title: Optional[str] = None) -> str:
+    if title:
+        return title
+    first = slides[0] if slides and isinstance(slides[0], dict) else {}
+    return first.get("title") or "Untitled presentation"
+
+
+def encode_cursor(edited_at: int, presentation_id: str) -> str:
+    raw = f"{edited_at}:{presentation_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, str]:
+    """Inverse of `encode_cursor`; raises ValueError on anything malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        edited_at, presentation_id = base64.urlsafe_b64decode(padded).decode("utf-8").split(":", 1)
+        return int(edited_at), presentation_id
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+class PresentationService:
+    """
+    Persistent store for presentations and their slides.
+    Slide bodies live in `slides`; the deck row keeps a summary
+    (title, num_slides, edited_at) refreshed on every write.
+    """
+
+    def _summary(self, p) -> Dict[str, Any]:
+        # accepts a PresentationTable or a projected row with the same columns
+        return {
+            "presentation_id": p.id,
+            "title": p.title,
+            "num_slides": p.num_slides,
+            "edited_at": p.edited_at,
+        }
+
+    def _write_slides(self, session, presentation_id: str, slides: List[Dict[str, Any]]):
+        session.exec(delete(SlideTable).where(SlideTable.presentation_id == presentation_id))
+        for position, slide in enumerate(slides):
+            session.add(SlideTable(presentation_id=presentation_id, position=position, data=slide))
+
+    def create(self, slides: List[Dict[str, Any]], topic: Optional[str] = None, style: Optional[str] = None) -> str:
+        with get_session() as session:
+            p = PresentationTable(
+                title=_deck_title(slides),
+                topic=topic,
+                style=style,
+                num_slides=len(slides),
+            )
+            session.add(p)
+            session.flush()
+            self._write_slides(session, p.id, slides)
+            session.commit()
+            return p.id
+
+    def exists(self, presentation_id: str) -> bool:
+        with get_session() as session:
+            return session.get(PresentationTable, presentation_id) is not None
+
+    def get_slides(self, presentation_id: str) -> Optional[List[Dict[str, Any]]]:
+        with get_session() as session:
+            if session.get(PresentationTable, presentation_id) is None:
+                return None
+            stmt = (
+                select(SlideTable.data)
+                .where(SlideTable.presentation_id == presentation_id)
+                .order_by(SlideTable.position)
+            )
+            return list(session.exec(stmt).all())
+
+    def replace_slides(
+        self,
+        presentation_id: str,
+        slides: List[Dict[str, Any]],
+        title: Optional[str] = None,
+        style: Optional[str] = None,
+    ) -> bool:
+        with get_session() as session:
+            p = session.get(PresentationTable, presentation_id)
+            if p is None:
+                return False
+            self._write_slides(session, presentation_id, slides)
+            p.title = _deck_title(slides, title)
+            p.num_slides = len(slides)
+            p.edited_at = now_ms()
+            if style:
+                p.style = style
+            session.add(p)
+            session.commit()
+            return True
+
+    def delete(self, presentation_id: str) -> bool:
+        with get_session() as session:
+            p = session.get(PresentationTable, presentation_id)
+            if p is None:
+                return False
+            session.exec(delete(SlideTable).where(SlideTable.presentation_id == presentation_id))
+            session.exec(delete(FolderPresentationTable).where(FolderPresentationTable.presentation_id == presentation_id))
+            session.delete(p)
+            session.commit()
+            return True
+
+    def list_summaries(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        folder_id: Optional[str] = None,
+        newest_first: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        One page of deck summaries ordered by edit time.
+
+        Keyset-paginated on (edited_at, id): each page is a single index range
+        scan no matter how many decks exist. Pass the returned `next_cursor`
+        back to get the following page; it is None on the last page.
+        """
+        columns = (
+            PresentationTable.id,
+            PresentationTable.title,
+            PresentationTable.num_slides,
+            PresentationTable.edited_at,
+        )
+        stmt = select(*columns)
+
+        if folder_id:
+            stmt = stmt.join(
+                FolderPresentationTable,
+                FolderPresentationTable.presentation_id == PresentationTable.id,
+            ).where(FolderPresentationTable.folder_id == folder_id)
+
+        if cursor:
+            edited_at, last_id = decode_cursor(cursor)
+            if newest_first:
+                after = or_(
+                    PresentationTable.edited_at < edited_at,
+                    and_(PresentationTable.edited_at == edited_at, PresentationTable.id < last_id),
+                )
+            else:
+                after = or_(
+                    PresentationTable.edited_at > edited_at,
+                    and_(PresentationTable.edited_at == edited_at, PresentationTable.id > last_id),
+                )
+            stmt = stmt.where(after)
+
+        if newest_first:
+            stmt = stmt.order_by(PresentationTable.edited_at.desc(), PresentationTable.id.desc())
+        else:
+            stmt = stmt.order_by(PresentationTable.edited_at.asc(), PresentationTable.id.asc())
+
+        # fetch one extra row to know whether another page exists
+        with get_session() as session:
+            rows = session.exec(stmt.limit(limit + 1)).all()
+
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = page[-1]
+            next_cursor = encode_cursor(last.edited_at, last.id)
+
+        return {
+            "items": [self._summary(r) for r in page],
+            "next_cursor": next_cursor,
+        }
@@ -1,11 +1,34 @@
 # app/services/rag_service.py
 
+import re
 from uuid import uuid4
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple
 from ai.rag.rag_pipeline import RAGPipeline
 from app.core.logger import logger
 
 
+_DOCUMENT_ID = re.compile(r"^doc__[0-9a-f]{12}$")
+
+
+def new_document_id() -> str:
+    return f"doc__{uuid4().hex[:12]}"
+
+
+def is_document_id(value: str) -> bool:
+    return bool(value and _DOCUMENT_ID.match(value))
+
+
+def _result(doc_id: str, sync: Dict[str, Any], metadata: Dict) -> Dict[str, Any]:
+    return {
+        "document_id": doc_id,
+        "chunks_total": len(sync["chunk_ids"]),
+        "chunks_added": sync["added"],
+        "chunks_kept": sync["kept"],
+        "chunks_removed": sync["removed"],
+        "metadata": metadata
+    }
+
+
 class RAGService:
     """
     High-level service for:
@@ -29,13 +52,15 @@ class RAGService:
         self, 
         filename: str, 
         text: str, 
-        extra_meta: Dict = None
+        extra_meta: Dict = None,
+        document_id: Optional[str] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
     ) -> Dict[str, Any]:
         
         if not text or len(text.strip()) == 0:
             raise ValueError("Cannot ingest empty text")
 
-        doc_id = f"doc__{uuid4().hex[:12]}"
+        doc_id = document_id or new_document_id()
         metadata = {"filename": filename}
 
         if extra_meta:
@@ -44,11 +69,12 @@ class RAGService:
         logger.info(f"[RAG] Ingesting document: {filename} ({doc_id}), text length: {len(text)}")
 
         try:
-            # Process in batches to avoid memory issues
-            chunk_ids = self.pipeline.ingest_document(
+            # Process in batches to avoid memory issues; an existing doc_id is updated in place
+            sync = self.pipeline.ingest_document(
                 document_id=doc_id,
                 text=text,
-                metadata=metadata
+                metadata=metadata,
+                on_progress=on_progress,
             )
         except MemoryError as e:
             logger.error(f"[RAG] Memory error ingesting {filename}: {e}")
@@ -57,13 +83,55 @@ class RAGService:
             logger.error(f"[RAG] Ingestion failed for {filename}: {e}", exc_info=True)
             raise
 
-        logger.info(f"[RAG] Document {doc_id} ingested with {len(chunk_ids)} chunks")
+        self._log_sync(doc_id, sync)
+        return _result(doc_id, sync, metadata)
+
+    # ---------------------------------------
+    # INGEST PAGE STREAM
+    # ---------------------------------------
+    def ingest_file_pages(
+        self,
+        filename: str,
+        pages: Iterable[Tuple[int, str]],
+        extra_meta: Dict = None,
+        document_id: Optional[str] = None,
+        on_progress: Optional[Callable[[int, Optional[int]], None]] = None,
+    ) -> Dict[str, Any]:
+        """Like `ingest_file_text`, but chunks and embeds while `pages` is still being parsed."""
+        doc_id = document_id or new_document_id()
+        metadata = {"filename": filename}
+        if extra_meta:
+            metadata.update(extra_meta)
+
+        logger.info(f"[RAG] Streaming ingest: {filename} ({doc_id})")
+
+        try:
+            sync = self.pipeline.ingest_pages(
+                document_id=doc_id,
+                pages=pages,
+                metadata=metadata,
+                on_progress=on_progress,
+            )
+        except Exception as e:
+            # a new document's partial batches are dropped by the pipeline
+            logger.error(f"[RAG] Ingestion failed for {filename}: {e}", exc_info=True)
+            raise
+
+        if not sync["chunk_ids"]:
+            raise ValueError("No text extracted from document")
 
-        return {
-            "document_id": doc_id,
-            "chunks_added": len(chunk_ids),
-            "metadata": metadata
-        }
+        self._log_sync(doc_id, sync)
+        return _result(doc_id, sync, metadata)
+
+    @staticmethod
+    def _log_sync(doc_id: str, sync: Dict[str, Any]):
+        if sync["kept"] or sync["removed"]:
+            logger.info(
+                f"[RAG] Document {doc_id} updated: {sync['added']} new, "
+                f"{sync['kept']} unchanged, {sync['removed']} removed chunks"
+            )
+        else:
+            logger.info(f"[RAG] Document {doc_id} ingested with {sync['added']} chunks")
 
     # ---------------------------------------
     # GLOBAL QUERY
@@ -82,6 +150,20 @@ class RAGService:
             logger.error(f"[RAG] Error in global query: {e}")
             raise
 
+    def query_global_many(
+        self,
+        queries: List[str],
+        top_k: int = 5
+    ) -> List[List[Dict]]:
+        """`query_global` for several queries in one embedding batch and one index query."""
+        logger.info(f"[RAG] Global query batch: {len(queries)} queries (top_k={top_k})")
+
+        try:
+            return self.pipeline.retrieve_for_topics(queries, top_k=top_k)
+        except Exception as e:
+            logger.error(f"[RAG] Error in global query batch: {e}")
+            raise
+
     # ---------------------------------------
     # DOCUMENT-SPECIFIC QUERY
     # ---------------------------------------
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark word chunking against tokenizer-aware chunking.
+
+Both chunkers run over the same text of every document. For each one it
+reports:
+  - chunks produced, and the share of chunk tokens beyond the model's max
+    sequence length (dropped silently when the chunk is embedded)
+  - ingest throughput: chunk + embed, in characters/sec
+  - retrieval recall@k: sentences sampled from the document are used as
+    queries; a query is a hit when one of the top-k chunks contains it
+
+Usage:
+    python bench_chunking.py                      # documents under ./storage/uploads
+    python bench_chunking.py a.pdf notes/ -k 3
+    python bench_chunking.py --model sentence-transformers/all-mpnet-base-v2 docs/
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(BASE_DIR)
+
+from ai.loaders.registry import get_loader, supported_extensions  # noqa: E402
+from ai.rag.chunker import Chunker  # noqa: E402
+from app.core.config import settings  # noqa: E402
+
+SENTENCE = re.compile(r"[^.!?\n]{40,400}[.!?]")
+
+
+def collect(paths):
+    extensions = tuple(supported_extensions())
+    files = []
+    for p in paths:
+        if os.path.isdir(p):
+            for root, _, names in os.walk(p):
+                files.extend(os.path.join(root, n) for n in sorted(names) if n.lower().endswith(extensions))
+        elif os.path.isfile(p):
+            files.append(p)
+    return files
+
+
+def sample_queries(text, n, rng):
+    """Character spans of up to `n` sentences to use as queries."""
+    sentences = [(m.start(), m.end()) for m in SENTENCE.finditer(text)]
+    return rng.sample(sentences, min(n, len(sentences)))
+
+
+def run(model, chunker, text, queries, k):
+    t0 = time.perf_counter()
+    spans = list(chunker.iter_spans(text))
+    chunks = [text[s:e] for s, e in spans]
+    vectors = model.encode(chunks, batch_size=32, convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False)
+    seconds = time.perf_counter() - t0
+
+    lengths = [len(ids) for ids in model.tokenizer(chunks, add_special_tokens=True)["input_ids"]]
+    truncated = sum(max(0, n - model.max_seq_length) for n in lengths) / max(1, sum(lengths))
+
+    hits = 0
+    if queries:
+        q = model.encode([text[s:e] for s, e in queries], convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False)
+        top = np.argsort(-(q @ vectors.T), axis=1)[:, :k]
+        for (qs, qe), row in zip(queries, top):
+            if any(spans[i][0] <= qs and qe <= spans[i][1] for i in row):
+                hits += 1
+
+    return {"chunks": len(chunks), "truncated": truncated, "seconds": seconds, "hits": hits}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", default=[os.path.join(BASE_DIR, "storage", "uploads")])
+    parser.add_argument("--model", default="sentence-transformers/all-MiniLM-L6-v2")
+    parser.add_argument("--queries", type=int, default=30, help="sampled sentences per document")
+    parser.add_argument("-k", type=int, default=5, help="chunks retrieved per query")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    files = collect(args.paths)
+    if not files:
+        print("No documents found.")
+        return 1
+
+    from sentence_transformers import SentenceTransformer
+    model = SentenceTransformer(args.model)
+    max_tokens = model.max_seq_length - model.tokenizer.num_special_tokens_to_add(pair=False)
+    chunkers = {
+        "words": Chunker(),
+        "tokens": Chunker(chunk_size=max_tokens, chunk_overlap=settings.CHUNK_TOKEN_OVERLAP, tokenizer=model.tokenizer),
+    }
+    print(f"model {args.model}: max_seq_length {model.max_seq_length}, token chunks of {max_tokens}")
+
+    rng = random.Random(args.seed)
+    totals = {name: {"chars": 0, "seconds": 0.0, "hits": 0, "queries": 0, "chunks": 0} for name in chunkers}
+
+    header = f"{'file':32} {'mode':6} {'chunks':>6} {'trunc%':>7} {'chars/s':>10} {'recall@' + str(args.k):>9}"
+    print(header)
+    print("-" * len(header))
+
+    for path in files:
+        try:
+            text = get_loader(path).load_text(path)
+        except Exception as e:
+            print(f"{os.path.basename(path)[:32]:32} skipped: {e}")
+            continue
+        if not text.strip():
+            continue
+
+        queries = sample_queries(text, args.queries, rng)
+        for name, chunker in chunkers.items():
+            r = run(model, chunker, text, queries, args.k)
+            recall = r["hits"] / len(queries) if queries else float("nan")
+            t = totals[name]
+            t["chars"] += len(text)
+            t["seconds"] += r["seconds"]
+            t["hits"] += r["hits"]
+            t["queries"] += len(queries)
+            t["chunks"] += r["chunks"]
+            print(f"{os.path.basename(path)[:32]:32} {name:6} {r['chunks']:>6} {r['truncated'] * 100:>6.1f}% "
+                  f"{len(text) / max(r['seconds'], 1e-9):>10.0f} {recall:>9.3f}")
+
+    print("-" * len(header))
+    for name, t in totals.items():
+        if t["seconds"]:
+            recall = t["hits"] / t["queries"] if t["queries"] else float("nan")
+            print(f"{name:8} {t['chunks']} chunks, {t['chars'] / t['seconds']:.0f} chars/s, "
+                  f"recall@{args.k} {recall:.3f} over {t['queries']} queries")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
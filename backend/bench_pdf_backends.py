@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark the PDF text extraction backends against each other.
+
+For every PDF it times each backend (serial, single process) and reports
+pages/sec, plus how closely the fast backend's text matches the layout
+backend's (word recall / precision against pdfplumber as the reference).
+
+Usage:
+    python bench_pdf_backends.py                 # PDFs under ./exports
+    python bench_pdf_backends.py a.pdf docs/     # files and/or directories
+    python bench_pdf_backends.py --repeat 3 docs/
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from collections import Counter
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(BASE_DIR)
+
+from ai.loaders.pdf_loader import PDF_BACKENDS  # noqa: E402
+
+
+def collect(paths):
+    files = []
+    for p in paths:
+        if os.path.isdir(p):
+            files.extend(sorted(glob.glob(os.path.join(p, "**", "*.pdf"), recursive=True)))
+        elif p.lower().endswith(".pdf"):
+            files.append(p)
+    return files
+
+
+def extract(backend, path, repeat):
+    best, texts = None, None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        texts = list(backend.iter_texts(path))
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return texts, best
+
+
+def word_parity(reference: str, candidate: str):
+    """(recall, precision) of candidate words against reference words, as multisets."""
+    ref, cand = Counter(reference.split()), Counter(candidate.split())
+    overlap = sum((ref & cand).values())
+    recall = overlap / max(1, sum(ref.values()))
+    precision = overlap / max(1, sum(cand.values()))
+    return recall, precision
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", default=[os.path.join(BASE_DIR, "exports")])
+    parser.add_argument("--repeat", type=int, default=1, help="runs per file; the fastest is kept")
+    args = parser.parse_args()
+
+    files = collect(args.paths)
+    if not files:
+        print("No PDFs found.")
+        return 1
+
+    backends = {name: b for name, b in PDF_BACKENDS.items() if b.available()}
+    missing = set(PDF_BACKENDS) - set(backends)
+    if missing:
+        print(f"Skipping unavailable backends: {', '.join(sorted(missing))}")
+
+    totals = {name: [0, 0.0] for name in backends}  # pages, seconds
+    parity = []
+
+    header = f"{'file':40} {'pages':>5} " + " ".join(f"{name + ' p/s':>12}" for name in backends)
+    if "fast" in backends and "layout" in backends:
+        header += f" {'recall':>7} {'precis.':>7}"
+    print(header)
+    print("-" * len(header))
+
+    for path in files:
+        results = {}
+        for name, backend in backends.items():
+            try:
+                results[name] = extract(backend, path, args.repeat)
+            except Exception as e:
+                print(f"{os.path.basename(path)[:40]:40} {name} failed: {e}")
+        if not results:
+            continue
+
+        pages = len(next(iter(results.values()))[0])
+        row = f"{os.path.basename(path)[:40]:40} {pages:>5} "
+        cells = []
+        for name in backends:
+            if name not in results:
+                cells.append(f"{'-':>12}")
+                continue
+            texts, seconds = results[name]
+            totals[name][0] += len(texts)
+            totals[name][1] += seconds
+            cells.append(f"{len(texts) / max(seconds, 1e-9):>12.1f}")
+        row += " ".join(cells)
+
+        if "fast" in results and "layout" in results:
+            recall, precision = word_parity(" ".join(results["layout"][0]), " ".join(results["fast"][0]))
+            parity.append((recall, precision))
+            row += f" {recall:>7.3f} {precision:>7.3f}"
+        print(row)
+
+    print("-" * len(header))
+    for name, (pages, seconds) in totals.items():
+        if seconds:
+            print(f"{name:8} {pages} pages in {seconds:.2f}s -> {pages / seconds:.1f} pages/s")
+    if totals.get("fast", [0, 0])[1] and totals.get("layout", [0, 0])[1]:
+        fast_rate = totals["fast"][0] / totals["fast"][1]
+        layout_rate = totals["layout"][0] / totals["layout"][1]
+        print(f"speedup  fast vs layout: {fast_rate / layout_rate:.1f}x")
+    if parity:
+        print(f"parity   mean word recall {sum(r for r, _ in parity) / len(parity):.3f}, "
+              f"precision {sum(p for _, p in parity) / len(parity):.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,7 +13,7 @@ import os
 
 # Routers
 from app.api.slides import router as slides_router
-from app.api.upload import router as upload_router
+from app.api.upload import router as upload_router, ingest_jobs
 from app.api.user import router as user_router
 from app.api.image import router as image_router
 from app.api.folders import router as folders_router
@@ -92,6 +92,7 @@ app = create_application()
 def on_startup():
     logger.info("Application Starting Up...")
     create_db_and_tables()
+    ingest_jobs.resume_pending()
     logger.info("DB Ready, AI Slide Generator Online!")
 
 
@@ -0,0 +1,9 @@
+# tests/conftest.py
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# settings require a key at import time; tests never reach the API
+os.environ.setdefault("GROQ_API_KEY", "test")
@@ -0,0 +1,90 @@
+# tests/test_agent_cache.py
+import asyncio
+import threading
+
+import pytest
+
+from ai.llms.response_cache import MemoryCacheBackend, ResponseCache
+from ai.utils import agents_utils
+from ai.utils.agents_utils import BaseAgent
+
+
+class ScriptedLLM:
+    """Returns the queued replies in order."""
+
+    model = "fake"
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.calls = 0
+
+    def generate(self, prompt, temperature=0.2):
+        self.calls += 1
+        return self.replies.pop(0)
+
+    async def agenerate(self, prompt, temperature=0.2):
+        return self.generate(prompt, temperature)
+
+
+class BlockingBackend(MemoryCacheBackend):
+    """Stands in for the SQLite tier; records the thread each call ran on."""
+
+    blocking = True
+
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+
+    def get(self, key):
+        self.threads.append(threading.current_thread())
+        return super().get(key)
+
+    def set(self, key, value):
+        self.threads.append(threading.current_thread())
+        super().set(key, value)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = ResponseCache([MemoryCacheBackend(), BlockingBackend()])
+    monkeypatch.setattr(agents_utils, "get_response_cache", lambda: cache)
+    return cache
+
+
+def make_agent(*replies):
+    agent = BaseAgent("system")
+    agent.llm = ScriptedLLM(*replies)
+    return agent
+
+
+def test_invalid_reply_is_not_cached(cache):
+    agent = make_agent("not json at all", '{"ok": true}', '{"ok": false}')
+
+    assert agent.run("prompt") == "not json at all"
+    assert agent.run("prompt") == '{"ok": true}'
+    assert agent.run("prompt") == '{"ok": true}'
+    assert agent.llm.calls == 2
+
+
+def test_validate_callback_decides_what_is_cached(cache):
+    agent = make_agent('{"slides": []}', '{"slides": [1]}')
+    has_slides = lambda raw: '"slides": [1]' in raw
+
+    agent.run("prompt", validate=has_slides)
+    agent.run("prompt", validate=has_slides)
+    assert agent.run("prompt", validate=has_slides) == '{"slides": [1]}'
+    assert agent.llm.calls == 2
+
+
+def test_arun_keeps_blocking_tier_off_the_event_loop(cache):
+    agent = make_agent('{"ok": true}')
+
+    async def go():
+        first = await agent.arun("prompt")
+        cache.backends[0].clear()  # force the next hit through the disk tier
+        return first, await agent.arun("prompt")
+
+    assert asyncio.run(go()) == ('{"ok": true}', '{"ok": true}')
+    assert agent.llm.calls == 1
+    disk = cache.backends[1]
+    assert disk.threads and threading.main_thread() not in disk.threads
@@ -0,0 +1,105 @@
+# tests/test_concurrency.py
+import asyncio
+import threading
+import time
+
+from ai.llms import groq_client
+from ai.utils.concurrency import ProviderLimiter
+
+
+def test_threads_and_loops_share_one_budget():
+    limiter = ProviderLimiter({"p": 2})
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def enter():
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+
+    def leave():
+        with lock:
+            active[0] -= 1
+
+    def thread_call():
+        with limiter.slot("p"):
+            enter()
+            time.sleep(0.02)
+            leave()
+
+    async def async_call():
+        async with limiter.aslot("p"):
+            enter()
+            await asyncio.sleep(0.02)
+            leave()
+
+    async def loop_calls():
+        await asyncio.gather(*(async_call() for _ in range(6)))
+
+    workers = [threading.Thread(target=thread_call) for _ in range(4)]
+    workers += [threading.Thread(target=asyncio.run, args=(loop_calls(),)) for _ in range(2)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    assert peak[0] == 2
+    assert active[0] == 0
+
+
+def test_waiters_are_served_in_order():
+    limiter = ProviderLimiter({"p": 1})
+    order = []
+
+    async def call(i):
+        async with limiter.aslot("p"):
+            order.append(i)
+            await asyncio.sleep(0.005)
+
+    async def main():
+        await asyncio.gather(*(call(i) for i in range(8)))
+
+    asyncio.run(main())
+    assert order == list(range(8))
+
+
+def test_cancelled_waiter_does_not_leak_a_permit():
+    limiter = ProviderLimiter({"p": 1})
+
+    async def main():
+        release = asyncio.Event()
+
+        async def holder():
+            async with limiter.aslot("p"):
+                await release.wait()
+
+        async def waiter():
+            async with limiter.aslot("p"):
+                pass
+
+        held = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(waiter())
+        await asyncio.sleep(0)
+        queued.cancel()
+        release.set()
+        await held
+
+        # the permit is free again
+        await asyncio.wait_for(waiter(), timeout=1)
+
+    asyncio.run(main())
+
+
+def test_async_client_is_per_loop():
+    async def client():
+        return groq_client.get_async_groq_client()
+
+    async def twice():
+        return await client(), await client()
+
+    first, again = asyncio.run(twice())
+    other = asyncio.run(client())
+
+    assert first is again
+    assert first is not other
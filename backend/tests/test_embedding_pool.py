@@ -0,0 +1,94 @@
+# tests/test_embedding_pool.py
+import threading
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pytest
+
+from ai.llms import embedding_worker
+from ai.llms.embedding_worker import EmbeddingWorkerPool
+
+
+class StuckExecutor:
+    """Accepts work and never finishes it, like a pool whose workers hang."""
+
+    def __init__(self, *args, **kwargs):
+        self.futures = []
+
+    def submit(self, fn, *args):
+        fut = Future()
+        self.futures.append(fut)
+        return fut
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        if cancel_futures:
+            for fut in self.futures:
+                fut.cancel()
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(embedding_worker, "ProcessPoolExecutor", StuckExecutor)
+    pool = EmbeddingWorkerPool("fake", workers=1, max_wait_ms=1, result_timeout=5)
+    yield pool
+    pool.shutdown()
+
+
+def _encode_in_thread(pool, texts):
+    outcome = {}
+
+    def run():
+        try:
+            outcome["value"] = pool.encode(texts)
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, outcome
+
+
+def test_shutdown_fails_in_flight_held_and_queued_requests(pool):
+    callers = [_encode_in_thread(pool, [f"text {i}"]) for i in range(3)]
+    # in flight, held by the dispatcher waiting for a slot, and still queued
+    threading.Event().wait(0.2)
+
+    pool.shutdown()
+
+    for thread, outcome in callers:
+        thread.join(timeout=2)
+        assert not thread.is_alive()
+        assert isinstance(outcome.get("error"), BrokenProcessPool)
+
+
+def test_encode_after_shutdown_raises(pool):
+    pool.shutdown()
+    with pytest.raises(BrokenProcessPool):
+        pool.encode(["late"])
+
+
+def test_encode_wait_is_bounded(pool):
+    pool.result_timeout = 0.2
+    with pytest.raises(BrokenProcessPool):
+        pool.encode(["never answered"])
+
+
+def test_client_falls_back_when_pool_is_retired(pool, monkeypatch):
+    from ai.llms import embeddings_client
+    from ai.llms.embeddings_client import EmbeddingsClient
+
+    class Model:
+        def encode(self, texts, **kwargs):
+            return np.ones((len(texts), 3), dtype=np.float32)
+
+    dropped = []
+    monkeypatch.setattr(embeddings_client, "get_embedding_pool", lambda name: pool)
+    monkeypatch.setattr(embeddings_client, "drop_embedding_pool", dropped.append)
+    client = EmbeddingsClient("fake")
+    monkeypatch.setattr(client, "get_model", lambda: Model())
+
+    pool.shutdown()
+
+    assert client._encode(["a", "b"]).shape == (2, 3)
+    assert dropped == ["fake"]
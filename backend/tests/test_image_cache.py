@@ -0,0 +1,51 @@
+# tests/test_image_cache.py
+from ai.llms.image_cache import ImageCache
+from app.services.image_store import ImageStore
+
+
+def _cache(tmp_path, max_bytes, referenced=()):
+    store = ImageStore(str(tmp_path / "store"))
+    cache = ImageCache(str(tmp_path / "cache"), max_bytes, store=store, in_use=lambda sha: sha in referenced)
+    return cache, store
+
+
+def _image(n: int) -> bytes:
+    return bytes([n]) * 100
+
+
+def test_over_budget_deletes_unreferenced_images(tmp_path):
+    cache, store = _cache(tmp_path, max_bytes=250)
+    first = cache.get_or_generate("a", lambda: _image(1))
+    cache.get_or_generate("b", lambda: _image(2))
+    cache.get_or_generate("c", lambda: _image(3))
+
+    assert cache.get("a") is None
+    assert not store.path(first["sha256"], first["extension"]).exists()
+    assert cache.get("b") is not None and cache.get("c") is not None
+    assert cache.stats()["bytes"] == 200
+
+
+def test_referenced_images_stay_on_disk(tmp_path):
+    saved = ImageStore(str(tmp_path / "store")).put(_image(1))
+    cache, store = _cache(tmp_path, max_bytes=150, referenced={saved["sha256"]})
+    cache.get_or_generate("a", lambda: _image(1))
+    cache.get_or_generate("b", lambda: _image(2))
+
+    assert cache.get("a") is None
+    assert store.path(saved["sha256"], saved["extension"]).exists()
+
+
+def test_shared_image_counts_once_and_survives_while_any_key_uses_it(tmp_path):
+    cache, store = _cache(tmp_path, max_bytes=250)
+    shared = cache.get_or_generate("a", lambda: _image(1))
+    cache.get_or_generate("a2", lambda: _image(1))
+    cache.get_or_generate("b", lambda: _image(2))
+    assert cache.stats()["bytes"] == 200
+
+    cache.get("b")
+    cache.get("a2")  # a is the oldest row, but a2 still points at the same file
+    cache.get_or_generate("c", lambda: _image(3))
+
+    assert cache.get("a") is None and cache.get("b") is None
+    assert store.path(shared["sha256"], shared["extension"]).exists()
+    assert cache.get("a2") is not None
@@ -0,0 +1,43 @@
+# tests/test_loaders_chunking.py
+import pytest
+
+from ai.loaders.registry import load_document
+from ai.rag.chunker import Chunker
+
+
+def _paragraph(n: int, wrap: str = " ") -> str:
+    # 30 words, so a 50-word window has to cut right after one paragraph
+    words = [f"p{n}w{i}" for i in range(30)]
+    return " ".join(words[:15]) + wrap + " ".join(words[15:]) + "."
+
+
+def _assert_cut_at_paragraphs(text, first):
+    chunks = Chunker(chunk_size=50, chunk_overlap=5).chunk_text(text)
+    assert len(chunks) > 1
+    assert chunks[0] == first
+    for chunk in chunks[:-1]:
+        assert chunk.endswith(".")
+
+
+def test_txt_upload_is_cut_at_paragraph_breaks(tmp_path):
+    path = tmp_path / "notes.txt"
+    # hard-wrapped paragraphs, Windows line endings, a blank line holding spaces
+    body = "\r\n  \r\n".join(_paragraph(n, wrap=" \r\n") for n in range(4))
+    path.write_text(body, encoding="utf-8", newline="")
+
+    text = load_document(path)["raw_text"]
+    assert "\r" not in text and "  " not in text
+    _assert_cut_at_paragraphs(text, _paragraph(0, wrap="\n"))
+
+
+def test_docx_upload_is_cut_at_paragraph_breaks(tmp_path):
+    docx = pytest.importorskip("docx")
+    path = tmp_path / "notes.docx"
+    doc = docx.Document()
+    for n in range(4):
+        doc.add_paragraph(_paragraph(n))
+    doc.save(str(path))
+
+    text = load_document(path)["raw_text"]
+    assert text == "\n\n".join(_paragraph(n) for n in range(4))
+    _assert_cut_at_paragraphs(text, _paragraph(0))
@@ -0,0 +1,115 @@
+# tests/test_rag_sync.py
+import pytest
+
+from ai.rag import rag_pipeline
+from ai.rag.chunker import Chunker
+from app.services.rag_services import RAGService
+
+DOC = "doc__0123456789ab"
+
+
+class FakeVectorStore:
+    """In-memory stand-in for VectorStore; records metadata rewrites."""
+
+    def __init__(self):
+        self.rows = {}  # id -> (text, metadata)
+        self.meta_updates = []
+
+    def get_document_chunks(self, document_id):
+        return {cid: dict(meta) for cid, (_, meta) in self.rows.items() if meta["document_id"] == document_id}
+
+    def add_documents(self, ids, texts, embeddings, metadatas):
+        for cid, text, meta in zip(ids, texts, metadatas):
+            self.rows[cid] = (text, dict(meta))
+
+    def update_metadatas(self, ids, metadatas):
+        self.meta_updates.extend(ids)
+        for cid, meta in zip(ids, metadatas):
+            self.rows[cid] = (self.rows[cid][0], dict(meta))
+
+    def delete_ids(self, ids):
+        for cid in ids:
+            self.rows.pop(cid, None)
+
+    def texts(self):
+        return sorted(self.rows.values(), key=lambda row: row[1]["chunk_index"])
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.embedded = []
+        self.fail_on_call = None
+
+    def embed_texts(self, texts):
+        if self.fail_on_call == len(self.embedded) + 1:
+            raise RuntimeError("embedding backend down")
+        self.embedded.append(list(texts))
+        return [[0.0] for _ in texts]
+
+
+@pytest.fixture
+def rag(monkeypatch):
+    store, embeddings = FakeVectorStore(), FakeEmbeddings()
+    monkeypatch.setattr(rag_pipeline, "get_vector_store", lambda persist_dir=None: store)
+    monkeypatch.setattr(rag_pipeline, "get_embeddings_client", lambda: embeddings)
+    monkeypatch.setattr(rag_pipeline, "BATCH_SIZE", 2)
+    service = RAGService()
+    # 15-word paragraphs and 20-word chunks: one chunk per paragraph
+    service.pipeline._chunker = Chunker(chunk_size=20, chunk_overlap=0)
+    return service, store, embeddings
+
+
+def _paragraph(n, tag="v1"):
+    return " ".join(f"{tag}p{n}w{i}" for i in range(14)) + " end."
+
+
+def _text(paragraphs):
+    return "\n\n".join(paragraphs)
+
+
+ORIGINAL = [_paragraph(n) for n in range(6)]
+
+
+def test_unchanged_upload_embeds_and_rewrites_nothing(rag):
+    service, store, embeddings = rag
+    service.ingest_file_text("notes.txt", _text(ORIGINAL), document_id=DOC)
+    before = dict(store.rows)
+    embeddings.embedded.clear()
+
+    result = service.ingest_file_text("notes.txt", _text(ORIGINAL), document_id=DOC)
+
+    assert (result["chunks_added"], result["chunks_kept"], result["chunks_removed"]) == (0, 6, 0)
+    assert embeddings.embedded == []
+    assert store.meta_updates == []
+    assert store.rows == before
+
+
+def test_edit_embeds_only_changed_chunks(rag):
+    service, store, embeddings = rag
+    service.ingest_file_text("notes.txt", _text(ORIGINAL), document_id=DOC)
+    embeddings.embedded.clear()
+
+    edited = [_paragraph(0, "v2")] + ORIGINAL[:2] + [_paragraph(2, "v2")] + ORIGINAL[3:]
+    result = service.ingest_file_text("notes.txt", _text(edited), document_id=DOC)
+
+    assert (result["chunks_added"], result["chunks_kept"], result["chunks_removed"]) == (2, 5, 1)
+    assert sorted(t for batch in embeddings.embedded for t in batch) == sorted([edited[0], edited[3]])
+    # the inserted paragraph shifts everything after it; only positions are rewritten
+    assert len(store.meta_updates) == 5
+    assert [text for text, _ in store.texts()] == edited
+
+
+def test_failed_update_rolls_back_to_previous_version(rag):
+    service, store, embeddings = rag
+    service.ingest_file_text("notes.txt", _text(ORIGINAL), document_id=DOC)
+    before = dict(store.rows)
+    embeddings.embedded.clear()
+
+    # the first edited chunk is written, then embedding the second one fails
+    embeddings.fail_on_call = 2
+    edited = [_paragraph(0, "v2")] + ORIGINAL[1:5] + [_paragraph(5, "v2")]
+    with pytest.raises(RuntimeError, match="embedding backend down"):
+        service.ingest_file_text("notes.txt", _text(edited), document_id=DOC)
+
+    assert embeddings.embedded == [[edited[0]]]
+    assert store.rows == before
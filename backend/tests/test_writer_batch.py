@@ -0,0 +1,86 @@
+# tests/test_writer_batch.py
+import asyncio
+import json
+
+import pytest
+
+from ai.agents import writer as writer_module
+from ai.agents.writer import BATCH_WRITER_SYSTEM_PROMPT, WRITER_SYSTEM_PROMPT, WriterAgent
+from ai.utils import agents_utils
+
+ITEMS = [("Intro", "context a"), ("Details", "context b"), ("Summary", "context c")]
+
+
+class FakeLLM:
+    """Answers batch prompts with a well-formed batch reply and records every call."""
+
+    model = "fake"
+
+    def __init__(self):
+        self.prompts = []
+
+    def _reply(self, prompt):
+        self.prompts.append(prompt)
+        if "Slide index" not in prompt:
+            return json.dumps({"slide": {"id": 0, "heading": "single", "bullets": ["x"], "notes": ""}})
+        return json.dumps({
+            "slides": [
+                {"index": i, "heading": title, "bullets": [f"{title} point"], "notes": f"notes {i}"}
+                for i, (title, _) in enumerate(ITEMS)
+            ]
+        })
+
+    def generate(self, prompt, temperature=0.2):
+        return self._reply(prompt)
+
+    async def agenerate(self, prompt, temperature=0.2):
+        return self._reply(prompt)
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.setattr(agents_utils, "get_response_cache", lambda: None)
+    monkeypatch.setattr(writer_module.settings, "WRITER_BATCH_MAX_SLIDES", 8)
+    monkeypatch.setattr(writer_module.settings, "WRITER_BATCH_MAX_CHARS", 10_000)
+    agent = WriterAgent()
+    agent.llm = FakeLLM()
+    return agent
+
+
+def _check(agent, slides):
+    assert [s["title"] for s in slides] == [t for t, _ in ITEMS]
+    assert [s["bullets"] for s in slides] == [[f"{t} point"] for t, _ in ITEMS]
+
+    # one batch call, no per-slide fallbacks
+    assert len(agent.llm.prompts) == 1
+    prompt = agent.llm.prompts[0]
+    assert BATCH_WRITER_SYSTEM_PROMPT.strip() in prompt
+    assert WRITER_SYSTEM_PROMPT.strip() not in prompt
+
+
+def test_write_slides_parses_batch_without_fallback(agent):
+    _check(agent, agent.write_slides(ITEMS))
+
+
+def test_awrite_slides_parses_batch_without_fallback(agent):
+    _check(agent, asyncio.run(agent.awrite_slides(ITEMS)))
+
+
+class PartlyMalformedLLM(FakeLLM):
+    """The batch reply leaves slide 1 without bullets."""
+
+    def _reply(self, prompt):
+        reply = json.loads(super()._reply(prompt))
+        if "slides" in reply:
+            reply["slides"][1]["bullets"] = []
+        return json.dumps(reply)
+
+
+def test_malformed_slide_falls_back_alone(agent):
+    agent.llm = PartlyMalformedLLM()
+
+    slides = agent.write_slides(ITEMS)
+
+    assert len(agent.llm.prompts) == 2
+    assert WRITER_SYSTEM_PROMPT.strip() in agent.llm.prompts[1]
+    assert [s["title"] for s in slides] == ["Intro", "single", "Summary"]
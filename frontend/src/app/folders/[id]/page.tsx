@@ -176,24 +176,38 @@ export default function FolderDetailPage() {
   const [folders, setFolders] = useState<FolderItem[]>([]);
   const [folderName, setFolderName] = useState("");
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  const toItem = (p: any): PresentationItem => ({
+    presentation_id: p.presentation_id,
+    title: p.title || "Untitled",
+    num_slides: p.num_slides ?? p.slides?.length ?? 0,
+    edited_at: p.edited_at || Date.now(),
+    thumbnail: p.thumbnail || null,
+  });
+
+  // one page at a time; "Load more" follows next_cursor
+  async function loadMore() {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchFolderPresentations(folderId, nextCursor);
+      setPresentations((prev) => [...prev, ...page.items.map(toItem)]);
+      setNextCursor(page.next_cursor);
+    } finally {
+      setLoadingMore(false);
+    }
+  }
 
   useEffect(() => {
     async function load() {
       setLoading(true);
 
-      // ---- 1) Load folder presentations ----
-      const data = await fetchFolderPresentations(folderId);
-
-      // backend returns array → use directly
-      setPresentations(
-        data.map((p: any) => ({
-          presentation_id: p.presentation_id,
-          title: p.title || "Untitled",
-          num_slides: p.slides?.length || 0,
-          edited_at: p.edited_at || Date.now(),
-          thumbnail: p.thumbnail || null,
-        }))
-      );
+      // ---- 1) Load first page of folder presentations ----
+      const page = await fetchFolderPresentations(folderId);
+      setPresentations(page.items.map(toItem));
+      setNextCursor(page.next_cursor);
 
       // ---- 2) Load all folders for dropdown ----
       const folderList = await fetchFolders();
@@ -323,6 +337,19 @@ export default function FolderDetailPage() {
               </Card>
             ))}
         </div>
+
+        {/* Load more */}
+        {!loading && nextCursor && (
+          <div className="flex justify-center mt-10">
+            <Button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="rounded-xl px-5 py-2 bg-[#1A1A25] border border-gray-700/40 hover:border-indigo-500/50"
+            >
+              {loadingMore ? "Loading…" : "Load more"}
+            </Button>
+          </div>
+        )}
       </div>
     </main>
   );
@@ -13,6 +13,7 @@ import { Loader2, Sparkles, Image as ImgIcon, Download, Trash2, X } from "lucide
 interface GeneratedImage {
   id: string;
   url: string;
+  thumbnail_url?: string | null;
   prompt: string;
   created_at: number;
 }
@@ -38,7 +39,8 @@ export default function ImageGalleryPage() {
     const load = async () => {
       setLoadingImages(true);
       const data = await fetchImages();
-      setImages(data.reverse());
+      // backend already returns newest first
+      setImages(data);
       setLoadingImages(false);
     };
     load();
@@ -59,6 +61,7 @@ export default function ImageGalleryPage() {
       const newImage: GeneratedImage = {
         id: res.id,
         url: res.url,
+        thumbnail_url: res.thumbnail_url,
         prompt: res.prompt,
         created_at: res.created_at,
       };
@@ -179,7 +182,7 @@ export default function ImageGalleryPage() {
               }}
             >
               <img
-                src={img.url}
+                src={img.thumbnail_url || img.url}
                 className="h-48 w-full object-cover rounded-xl"
               />
               <p className="mt-3 text-xs text-gray-400 line-clamp-2">{img.prompt}</p>
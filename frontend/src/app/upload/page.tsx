@@ -44,8 +44,8 @@ const folderId = searchParams.get("folder");
   const handleFileSelect = (file: File) => {
     // Validate file type
     const ext = file.name.split('.').pop()?.toLowerCase();
-    if (!['pdf', 'docx', 'txt'].includes(ext || '')) {
-      setError("Please upload a PDF, DOCX, or TXT file");
+    if (!['pdf', 'docx', 'pptx', 'txt', 'md', 'markdown', 'html', 'htm'].includes(ext || '')) {
+      setError("Please upload a PDF, DOCX, PPTX, TXT, Markdown or HTML file");
       return;
     }
     
@@ -109,7 +109,7 @@ const folderId = searchParams.get("folder");
           <div className="flex items-center justify-between mb-4">
             <div>
               <h1 className="text-3xl font-bold mb-2">Upload Document</h1>
-              <p className="text-gray-600">Upload a PDF, DOCX, or TXT file to generate slides</p>
+              <p className="text-gray-600">Upload a PDF, DOCX, PPTX, TXT, Markdown or HTML file to generate slides</p>
             </div>
             <Button
               variant="outline"
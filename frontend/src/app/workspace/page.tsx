@@ -2,7 +2,7 @@
 
 import { useEffect, useState } from "react";
 import { useRouter } from "next/navigation";
-import { fetchAllPresentations, deletePresentation } from "@/services/slides.services";
+import { fetchPresentationsPage, deletePresentation } from "@/services/slides.services";
 
 import { Button } from "@/components/ui/button";
 import { Card } from "@/components/ui/card";
@@ -36,13 +36,31 @@ export default function DashboardPage() {
   const [presentations, setPresentations] = useState<PresentationItem[]>([]);
   const [loading, setLoading] = useState(true);
   const [folders, setFolders] = useState<FolderItem[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  // one page at a time; "Load more" follows next_cursor
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    try {
+      setLoadingMore(true);
+      const page = await fetchPresentationsPage({ cursor: nextCursor });
+      setPresentations((prev) => [...prev, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch (err) {
+      console.error("Failed to load more presentations:", err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
 useEffect(() => {
   const load = async () => {
     try {
       setLoading(true);
-      const data = await fetchAllPresentations();
-      setPresentations(data);
+      const page = await fetchPresentationsPage();
+      setPresentations(page.items);
+      setNextCursor(page.next_cursor);
 
       const f = await fetchFolders();
       setFolders(f);
@@ -229,6 +247,20 @@ useEffect(() => {
               </Card>
             ))}
         </div>
+
+        {/* LOAD MORE */}
+        {!loading && nextCursor && (
+          <div className="flex justify-center mt-10">
+            <Button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="rounded-xl px-5 py-2.5 bg-[#1A1A25] border border-gray-700/40
+                  hover:border-indigo-500/50 text-sm"
+            >
+              {loadingMore ? "Loading..." : "Load more"}
+            </Button>
+          </div>
+        )}
       </div>
     </main>
   );
@@ -9,7 +9,7 @@ interface UploadBoxProps {
   acceptedTypes?: string;
 }
 
-export function UploadBox({ onFileSelect, uploading = false, acceptedTypes = ".pdf,.docx,.txt" }: UploadBoxProps) {
+export function UploadBox({ onFileSelect, uploading = false, acceptedTypes = ".pdf,.docx,.pptx,.txt,.md,.html,.htm" }: UploadBoxProps) {
   const [isDragging, setIsDragging] = useState(false);
   const fileInputRef = useRef<HTMLInputElement>(null);
 
@@ -86,7 +86,7 @@ export function UploadBox({ onFileSelect, uploading = false, acceptedTypes = ".p
               </p>
             </div>
             <p className="text-xs text-gray-400">
-              Supported: PDF, DOCX, TXT (Max 10MB)
+              Supported: PDF, DOCX, PPTX, TXT, Markdown, HTML (Max 10MB)
             </p>
           </>
         )}
@@ -35,6 +35,27 @@ export async function exportSlides(slides: any[], topic: string, format: "pptx"
   window.URL.revokeObjectURL(url);
 }
 
+export async function fetchUploadJob(jobId: string) {
+  const resp = await axios.get(`${API_BASE}/api/upload/jobs/${jobId}`);
+  return resp.data;
+}
+
+export async function waitForUploadJob(
+  jobId: string,
+  onProgress?: (job: any) => void,
+  intervalMs = 1000
+) {
+  while (true) {
+    const job = await fetchUploadJob(jobId);
+    onProgress?.(job);
+
+    if (job.status === "done") return job;
+    if (job.status === "failed") throw new Error(job.error || "Document processing failed");
+
+    await new Promise((r) => setTimeout(r, intervalMs));
+  }
+}
+
 export async function uploadDocument(file: File): Promise<{ document_id: string; filename: string }> {
   const formData = new FormData();
   formData.append("file", file);
@@ -45,8 +66,10 @@ export async function uploadDocument(file: File): Promise<{ document_id: string;
     },
   });
   
-  // Handle both response formats
-  const documentId = resp.data.document_id || resp.data.ingest?.document_id;
+  // Ingestion runs as a background job; wait for it to finish
+  const documentId = resp.data.job_id
+    ? (await waitForUploadJob(resp.data.job_id)).document_id
+    : resp.data.document_id || resp.data.ingest?.document_id;
   
   if (!documentId) {
     throw new Error("Document ID not found in response");
@@ -58,6 +81,24 @@ export async function uploadDocument(file: File): Promise<{ document_id: string;
   };
 }
 
+// Re-upload an edited file: only changed chunks are re-embedded
+export async function updateDocument(documentId: string, file: File): Promise<{ document_id: string; filename: string }> {
+  const formData = new FormData();
+  formData.append("file", file);
+
+  const resp = await axios.put(`${API_BASE}/api/upload/documents/${documentId}`, formData, {
+    headers: {
+      "Content-Type": "multipart/form-data",
+    },
+  });
+
+  const job = await waitForUploadJob(resp.data.job_id);
+  return {
+    document_id: job.document_id || documentId,
+    filename: file.name,
+  };
+}
+
 export async function generateSlidesFromDocument(documentId: string, theme: string = "corporate") {
   const resp = await axios.post(`${API_BASE}/api/slides/generate`, {
     document_id: documentId,
@@ -68,6 +109,20 @@ export async function generateSlidesFromDocument(documentId: string, theme: stri
   return resp.data;
 }
 
+// Stored images come back as server-relative paths (/api/image/files/...)
+export function resolveImageUrl(url?: string | null) {
+  if (!url) return url ?? null;
+  return url.startsWith("/") ? `${API_BASE}${url}` : url;
+}
+
+function withImageUrls(img: any) {
+  return {
+    ...img,
+    url: resolveImageUrl(img.url),
+    thumbnail_url: resolveImageUrl(img.thumbnail_url),
+  };
+}
+
 export async function generateImage(prompt: string) 
  {
   const res = await fetch(`${API_BASE}/api/image/generate`, {
@@ -77,13 +132,14 @@ export async function generateImage(prompt: string)
   });
 
   const data = await res.json();
-  return data;
+  return withImageUrls(data);
 }
 
 // FETCH ALL SAVED IMAGES
 export async function fetchImages() {
   const res = await fetch(`${API_BASE}/api/image/all`);
-  return res.json();
+  const data = await res.json();
+  return data.map(withImageUrls);
 }
 
 // DELETE IMAGE
@@ -190,27 +246,15 @@ export async function addPresentationToFolder(folderId: string, presentationId:
   return res.json();
 }
 
-export async function fetchFolderPresentations(folderId: string) {
-  const res = await fetch(`${API_BASE}/api/folders/${folderId}/presentations`);
-  const data = await res.json();
-
-  if (Array.isArray(data.presentation_ids)) {
-    const ids = data.presentation_ids;
-
-    const presentations = [];
-
-    for (const id of ids) {
-      const r = await fetch(`${API_BASE}/api/slides/presentation/${id}`);
+// One page of a folder; pass next_cursor back in to get the following page
+export async function fetchFolderPresentations(
+  folderId: string,
+  cursor?: string | null
+): Promise<{ items: any[]; next_cursor: string | null }> {
+  const qs = new URLSearchParams({ folder_id: folderId });
+  if (cursor) qs.set("cursor", cursor);
 
-      if (r.status === 200) {
-        presentations.push(await r.json());
-      } else {
-        console.warn("Missing presentation:", id);
-      }
-    }
-
-    return presentations;
-  }
-
-  return data;
+  const res = await fetch(`${API_BASE}/api/slides/all?${qs}`);
+  const data = await res.json();
+  return { items: data.items || [], next_cursor: data.next_cursor ?? null };
 }
@@ -70,20 +70,28 @@ export async function updatePresentation(
 // }
 
 
-export async function fetchAllPresentations(folderId?: string) {
-  if (folderId) {
-    const res = await api.get(`/api/folders/${folderId}/presentations`);
-    return res.data;
-  }
-
-  const res = await api.get(`/api/slides/all`);
-  return res.data;
+export async function fetchPresentationsPage(params: {
+  folderId?: string;
+  cursor?: string | null;
+  limit?: number;
+  sort?: "edited_desc" | "edited_asc";
+} = {}) {
+  const res = await api.get(`/api/slides/all`, {
+    params: {
+      folder_id: params.folderId,
+      cursor: params.cursor || undefined,
+      limit: params.limit,
+      sort: params.sort,
+    },
+  });
+  return res.data as { items: any[]; next_cursor: string | null };
 }
 
 
 
 
 
+
 //
 // 3) Fetch single slide
 // ----------------------------------------